@@ -0,0 +1,123 @@
+"""
+Microbenchmark: per-keyword `kw in text` loops vs the Aho-Corasick KEYWORD_MATCHER
+on the Egypt triage dataset (run generate_egypt_dataset.py first).
+
+Checks that both give the same chat routing and fallback classification for
+every row, then reports messages/s for the keyword path that serves all
+traffic while the LLM is down.
+"""
+
+import csv
+import sys
+import time
+import argparse
+
+import option_b_llm_triage as triage
+
+
+def legacy_fallback(text):
+    """Previous _fallback_classify keyword selection: (urgency, keyword)."""
+    text_lower = text.lower()
+    for urgency, keywords in (("Emergency", triage.EMERGENCY_KEYWORDS), ("High", triage.HIGH_KEYWORDS),
+                              ("Low", triage.LOW_KEYWORDS)):
+        for kw in keywords:
+            if kw in text_lower:
+                return urgency, kw
+    return "Medium", None
+
+
+def legacy_route(message):
+    """Previous TriageChatbot.chat routing, lists rebuilt per message as before."""
+    message_lower = message.lower().strip()
+    greetings = list(triage.GREETINGS)
+    if any(g in message_lower for g in greetings) or len(message_lower) < 5:
+        return "greeting"
+    casual_patterns = list(triage.CASUAL_PATTERNS)
+    positive_feelings = list(triage.POSITIVE_FEELINGS)
+    if any(f"feel {p}" in message_lower or f"feeling {p}" in message_lower or f"i am {p}" in message_lower or f"i'm {p}" in message_lower for p in positive_feelings):
+        return "positive"
+    medical_indicators = list(triage.MEDICAL_INDICATORS)
+    has_medical = any(m in message_lower for m in medical_indicators)
+    is_casual = any(p in message_lower for p in casual_patterns)
+    if is_casual and not has_medical and len(message_lower) < 50:
+        return "casual"
+    if len(message_lower) < 10 and not has_medical:
+        return "unclear"
+    return "classify"
+
+
+def matcher_fallback(text):
+    hits = triage.KEYWORD_MATCHER.scan(text.lower().strip())
+    for urgency, category in (("Emergency", "emergency"), ("High", "high"), ("Low", "low")):
+        hit = hits.first(category)
+        if hit:
+            return urgency, hit.keyword
+    return "Medium", None
+
+
+def matcher_route(message):
+    message_lower = message.lower().strip()
+    hits = triage.KEYWORD_MATCHER.scan(message_lower)
+    if hits.any("greeting") or len(message_lower) < 5:
+        return "greeting"
+    if hits.any("positive_feeling"):
+        return "positive"
+    has_medical = hits.any("medical")
+    if hits.any("casual") and not has_medical and len(message_lower) < 50:
+        return "casual"
+    if len(message_lower) < 10 and not has_medical:
+        return "unclear"
+    return "classify"
+
+
+def legacy_message(text):
+    return legacy_route(text), legacy_fallback(text)
+
+
+def matcher_message(text):
+    """What the fallback path now does per message: one scan for routing, one for the classification."""
+    return matcher_route(text), matcher_fallback(text)
+
+
+def throughput(fn, texts, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        triage.KEYWORD_MATCHER.scan.cache_clear()
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword loops vs Aho-Corasick matcher on the Egypt dataset")
+    parser.add_argument("--csv", type=str, default="triage_dataset_egypt.csv")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        with open(args.csv, newline="", encoding="utf-8") as f:
+            texts = [row["text"] for row in csv.DictReader(f)]
+    except FileNotFoundError:
+        sys.exit(f"{args.csv} not found - run generate_egypt_dataset.py first")
+
+    mismatches = sum(legacy_message(t) != matcher_message(t) for t in texts)
+    print(f"{'✅' if not mismatches else '❌'} identical routing and fallback for "
+          f"{len(texts) - mismatches:,}/{len(texts):,} messages")
+    hits = sum(len(triage.KEYWORD_MATCHER.scan(t.lower().strip()).hits) for t in texts)
+    print(f"   {hits / len(texts):.1f} keyword hits per message, avg {sum(map(len, texts)) / len(texts):.0f} chars, "
+          f"{len(set(texts)):,} unique\n")
+
+    print(f"{'path':<34}{'messages/s':>12}")
+    for name, fn in (
+        ("route + fallback (keyword loops)", legacy_message),
+        ("route + fallback (automaton)", matcher_message),
+        ("fallback only (keyword loops)", legacy_fallback),
+        ("fallback only (automaton)", matcher_fallback),
+    ):
+        print(f"{name:<34}{throughput(fn, texts, args.repeats):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+CLASSIFICATION CACHE
+====================
+Response cache in front of TriageLLM.classify for repeated symptom descriptions.
+
+Messages are keyed on a normalized form (Unicode NFKC, case, whitespace,
+Arabic-Indic digits folded to ASCII, punctuation removed), so
+"My baby has HIGH fever!!" and "my baby has high fever" share one entry.
+Only stateless first-turn classifications are cached; the caller decides that.
+"""
+
+import copy
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Arabic-Indic (U+0660-0669) and Extended/Persian (U+06F0-06F9) digits -> ASCII
+_DIGITS = {0x0660 + i: str(i) for i in range(10)}
+_DIGITS.update({0x06F0 + i: str(i) for i in range(10)})
+_DIGITS[0x066B] = "."  # Arabic decimal separator
+_DIGITS[0x0640] = None  # tatweel (kashida) only stretches letters
+
+# Punctuation/symbols become spaces, except "." and "," inside numbers (39.5 stays 39.5)
+_PUNCTUATION = re.compile(r"[^\w\s.,]|_|[.,](?!\d)|(?<!\d)[.,]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message(text: str) -> str:
+    """Canonical form of a patient message for cache lookups."""
+    text = unicodedata.normalize("NFKC", text).translate(_DIGITS).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class ClassificationCache:
+    """
+    Bounded LRU cache with a TTL, shared by all sessions in the process.
+    Results are copied in and out, so callers can modify what they get back.
+    """
+
+    def __init__(self, max_size: int = 2048, ttl_s: float = 3600.0):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (result, stored_at)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def key(self, provider: str, message: str) -> tuple:
+        return (provider, normalize_message(message))
+
+    def get(self, key: tuple) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl_s:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[0])
+
+    def put(self, key: tuple, result: Dict):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(result), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_s": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
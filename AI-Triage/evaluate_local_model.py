@@ -0,0 +1,80 @@
+"""
+OFFLINE EVALUATION: LOCAL MODEL FAST PATH
+=========================================
+Replays the held-out test split of triage_dataset_egypt.csv (same split as
+option_a_transformer.py) through the exported ONNX model and the
+accept_local_prediction gate used by TriageLLM, and reports per confidence
+threshold:
+- coverage: share of messages answered locally (no LLM call)
+- accuracy of that confident subset, and how often it under-triages
+- true Emergency cases kept local (must stay 0)
+- mean latency per message vs always calling the LLM
+
+Usage: python evaluate_local_model.py [--llm-ms 1500] [--limit 5000]
+"""
+
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from local_triage_model import LocalTriageModel
+from option_b_llm_triage import LOCAL_MODEL_DIR, LOCAL_MODEL_EMERGENCY_ESCALATION, accept_local_prediction
+
+SEVERITY = {"Emergency": 0, "High": 1, "Medium": 2, "Low": 3}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline evaluation of the local triage fast path")
+    parser.add_argument("--csv", type=str, default="triage_dataset_egypt.csv")
+    parser.add_argument("--model-dir", type=str, default=LOCAL_MODEL_DIR)
+    parser.add_argument("--limit", type=int, default=5000, help="Test messages to evaluate")
+    parser.add_argument("--llm-ms", type=float, default=1500, help="Mean remote LLM latency to compare against")
+    parser.add_argument("--latency-samples", type=int, default=300)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv)
+    labels = df['risk_level'].map({'Emergency': 0, 'High': 1, 'Medium': 2, 'Low': 3})  # option_a label_map
+    _, test_df = train_test_split(df, test_size=0.2, stratify=labels, random_state=42)
+    test_df = test_df.head(args.limit)
+    texts, truth = test_df['text'].tolist(), test_df['risk_level'].tolist()
+
+    model = LocalTriageModel(args.model_dir)
+    predictions = []
+    for start in range(0, len(texts), 64):
+        predictions.extend(model.classify_batch(texts[start:start + 64]))
+
+    # Serving latency: one message per call, as in TriageLLM.classify
+    latencies = []
+    for text in texts[:args.latency_samples]:
+        start = time.perf_counter()
+        model.classify(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    local_ms = float(np.mean(latencies))
+
+    overall = np.mean([p["urgency"] == t for p, t in zip(predictions, truth)])
+    print(f"Test messages: {len(texts):,} | overall local accuracy {overall:.1%}")
+    print(f"Local inference: p50 {np.percentile(latencies, 50):.1f} ms, p95 {np.percentile(latencies, 95):.1f} ms "
+          f"| LLM assumed {args.llm_ms:.0f} ms | emergency escalation at P>={LOCAL_MODEL_EMERGENCY_ESCALATION}\n")
+
+    print(f"{'min conf':>9}{'coverage':>10}{'accuracy':>10}{'under-triage':>14}{'emerg kept':>12}"
+          f"{'mean ms':>9}{'saved':>8}")
+    for threshold in (0.7, 0.8, 0.9, 0.95, 0.98):
+        local = [
+            (p, t) for text, p, t in zip(texts, predictions, truth)
+            if accept_local_prediction(text, p, min_confidence=threshold)
+        ]
+        coverage = len(local) / len(texts)
+        accuracy = np.mean([p["urgency"] == t for p, t in local]) if local else float("nan")
+        under = np.mean([SEVERITY[p["urgency"]] > SEVERITY[t] for p, t in local]) if local else float("nan")
+        emergencies_kept = sum(t == "Emergency" for _, t in local)
+        # Every message pays for local inference; escalated ones also pay for the LLM
+        mean_ms = local_ms + (1 - coverage) * args.llm_ms
+        print(f"{threshold:>9.2f}{coverage:>10.1%}{accuracy:>10.1%}{under:>14.1%}{emergencies_kept:>12}"
+              f"{mean_ms:>9.0f}{1 - mean_ms / args.llm_ms:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+EXPORT TRIAGE MODEL TO ONNX
+===========================
+Converts the DistilBERT model fine-tuned by option_a_transformer.py into the
+CPU-only bundle served by local_triage_model.py:
+
+    <out>/model.onnx       - logits for input_ids + attention_mask
+    <out>/tokenizer.json   - fast tokenizer (loaded with `tokenizers`, no transformers needed)
+    <out>/labels.json      - class index -> urgency level
+
+Usage: python export_triage_onnx.py [--model ./transformer_triage_model/final] [--quantize]
+"""
+
+import json
+import shutil
+import argparse
+from pathlib import Path
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+
+def export(model_dir: str, out_dir: str, quantize: bool = False, opset: int = 14):
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir).eval()
+    sample = tokenizer(["my baby has had a high fever since yesterday"], return_tensors="pt")
+
+    onnx_path = out / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            str(onnx_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=opset,
+        )
+
+    if quantize:
+        # Int8 weights: smaller file and faster CPU matmuls
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        fp32_path = out / "model.fp32.onnx"
+        shutil.move(onnx_path, fp32_path)
+        quantize_dynamic(str(fp32_path), str(onnx_path), weight_type=QuantType.QInt8)
+
+    tokenizer.backend_tokenizer.save(str(out / "tokenizer.json"))
+    labels = [model.config.id2label[i] for i in range(model.config.num_labels)]
+    (out / "labels.json").write_text(json.dumps(labels))
+    print(f"Exported {onnx_path} ({onnx_path.stat().st_size / 1e6:.1f} MB), labels {labels}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the fine-tuned triage model to ONNX")
+    parser.add_argument("--model", type=str, default="./transformer_triage_model/final")
+    parser.add_argument("--out", type=str, default="./transformer_triage_model/onnx")
+    parser.add_argument("--quantize", action="store_true", help="Dynamic int8 quantization (onnxruntime)")
+    args = parser.parse_args()
+
+    export(args.model, args.out, quantize=args.quantize)
@@ -0,0 +1,135 @@
+"""
+KEYWORD MATCHER
+===============
+Precompiled multi-pattern matcher for the triage keyword rules.
+
+All keyword lists (greetings, casual patterns, medical indicators, urgency
+keywords, ...) are compiled once into a single keyword trie; scanning a
+message walks it in one pass and reports every hit with its category, its
+index in that category's list and its position in the text.
+
+The trie is emitted as one regular expression, so the scan runs inside the
+C regex engine instead of a Python loop per character (a pure-Python
+Aho-Corasick state loop was slower than the `kw in text` loops it replaces).
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+
+class KeywordHit(NamedTuple):
+    category: str
+    keyword: str
+    index: int   # position of the keyword in its category list (list order = priority)
+    start: int
+    end: int
+
+
+class KeywordHits:
+    """Result of one scan, grouped by category. Treat as read-only (scans are cached)."""
+
+    __slots__ = ("_by_category",)
+
+    def __init__(self, by_category: Dict[str, List[tuple]]):
+        self._by_category = by_category  # category -> [(index, keyword, start), ...]
+
+    def any(self, category: str) -> bool:
+        return category in self._by_category
+
+    def in_category(self, category: str) -> List[KeywordHit]:
+        return [
+            KeywordHit(category, keyword, index, start, start + len(keyword))
+            for index, keyword, start in self._by_category.get(category, [])
+        ]
+
+    def first(self, category: str) -> Optional[KeywordHit]:
+        """
+        The hit with the lowest list index, i.e. the keyword a
+        `for kw in keywords: if kw in text` loop would have returned.
+        """
+        hits = self._by_category.get(category)
+        if not hits:
+            return None
+        index, keyword, start = min(hits)
+        return KeywordHit(category, keyword, index, start, start + len(keyword))
+
+    @property
+    def hits(self) -> List[KeywordHit]:
+        """Every hit, ordered by position in the text."""
+        return sorted((hit for category in self._by_category for hit in self.in_category(category)),
+                      key=lambda h: (h.start, h.end))
+
+
+def _trie_pattern(node: Dict) -> str:
+    """Regex for a keyword trie; greedy optional groups make it match the longest keyword first."""
+    alternatives = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alternatives:
+        return ""
+    body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    return f"(?:{body})?" if "" in node else body
+
+
+class KeywordMatcher:
+    """
+    Single-pass matcher over several categorised keyword lists.
+
+    Matching is exact substring matching (same semantics as `kw in text`,
+    including overlapping hits); callers lowercase the text first. Each regex
+    hit is the longest keyword starting at that position; every shorter
+    keyword starting there is a prefix of it, so those hits come from a table
+    built at construction time.
+    """
+
+    def __init__(self, categories: Dict[str, Sequence[str]], cache_size: int = 1024):
+        """
+        Args:
+            categories: Category name -> keyword list (list order is priority)
+            cache_size: Recent scans kept, so the routing and fallback checks
+                on the same message share one scan
+        """
+        self.categories = {name: list(keywords) for name, keywords in categories.items()}
+
+        entries: Dict[str, List[tuple]] = {}  # keyword -> [(category, index), ...]
+        for category, keywords in self.categories.items():
+            for index, keyword in enumerate(keywords):
+                if keyword:
+                    entries.setdefault(keyword, []).append((category, index))
+
+        trie: Dict = {}
+        for keyword in entries:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[""] = True
+        self._pattern = re.compile(_trie_pattern(trie)) if entries else None
+
+        # Longest keyword at a position -> (category, index, keyword) for it and all its keyword prefixes
+        self._expand = {
+            longest: tuple(
+                (category, index, keyword)
+                for keyword in entries if longest.startswith(keyword)
+                for category, index in entries[keyword]
+            )
+            for longest in entries
+        }
+        self.scan = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, text: str) -> KeywordHits:
+        """Find every keyword occurrence in `text` in a single pass."""
+        by_category: Dict[str, List[tuple]] = {}
+        if self._pattern is None:
+            return KeywordHits(by_category)
+        search, expand = self._pattern.search, self._expand
+        # Restart one character after each hit so overlapping keywords are found too
+        match = search(text)
+        while match is not None:
+            start = match.start()
+            for category, index, keyword in expand[match.group()]:
+                hits = by_category.get(category)
+                if hits is None:
+                    by_category[category] = [(index, keyword, start)]
+                else:
+                    hits.append((index, keyword, start))
+            match = search(text, start + 1)
+        return KeywordHits(by_category)
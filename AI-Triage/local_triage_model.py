@@ -0,0 +1,80 @@
+"""
+LOCAL TRIAGE MODEL
+==================
+CPU-only serving of the fine-tuned DistilBERT triage classifier
+(option_a_transformer.py -> export_triage_onnx.py) with onnxruntime.
+
+Classifies urgency locally in a few milliseconds; TriageLLM uses it as a fast
+path and only calls the remote LLM when the local model is unsure or the
+message may be an emergency.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+DEFAULT_LABELS = ["Emergency", "High", "Medium", "Low"]
+
+
+class LocalTriageModel:
+    def __init__(self, model_dir: str, max_length: int = 128, threads: int = None):
+        """
+        Load the exported ONNX bundle.
+
+        Args:
+            model_dir: Directory with model.onnx, tokenizer.json and labels.json
+            max_length: Token limit (same as training)
+            threads: onnxruntime intra-op threads (default LOCAL_MODEL_THREADS or 1,
+                so concurrent requests do not oversubscribe the CPU)
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_dir = Path(model_dir)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads or int(os.environ.get("LOCAL_MODEL_THREADS", "1"))
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_dir / "model.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length)
+        self.tokenizer.enable_padding()
+
+        labels_path = model_dir / "labels.json"
+        self.labels = json.loads(labels_path.read_text()) if labels_path.exists() else list(DEFAULT_LABELS)
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Class probabilities, one row per text (columns follow self.labels)."""
+        encodings = self.tokenizer.encode_batch(list(texts))
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+        }
+        logits = self.session.run(["logits"], {k: v for k, v in feeds.items() if k in self.input_names})[0]
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def classify(self, text: str) -> Dict:
+        """
+        Returns:
+            {"urgency": str, "confidence": float, "probabilities": {level: float}}
+        """
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts: Sequence[str]) -> List[Dict]:
+        results = []
+        for row in self.predict_proba(texts):
+            best = int(np.argmax(row))
+            results.append({
+                "urgency": self.labels[best],
+                "confidence": float(row[best]),
+                "probabilities": {label: float(p) for label, p in zip(self.labels, row)},
+            })
+        return results
@@ -201,6 +201,10 @@ if TRANSFORMER_AVAILABLE:
     print("    Training started... (this may take a while)")
     train_result = trainer.train()
     
+    # Keep the best model for serving (export with export_triage_onnx.py)
+    trainer.save_model("./transformer_triage_model/final")
+    tokenizer.save_pretrained("./transformer_triage_model/final")
+    
     # Get predictions
     predictions = trainer.predict(test_dataset)
     y_pred = np.argmax(predictions.predictions, axis=1)
@@ -9,9 +9,14 @@ This is the ACTUAL working system for production.
 
 import os
 import json
+import asyncio
 import re
+import threading
 from typing import Optional, Dict, List, Tuple
 
+from classification_cache import ClassificationCache
+from keyword_matcher import KeywordMatcher
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -123,10 +128,254 @@ You MUST respond in this exact JSON format:
 ## Current conversation:
 """
 
+# =============================================================================
+# KEYWORD RULES
+# =============================================================================
+
+# Casual greetings
+GREETINGS = [
+    "hello", "hi", "hey", "hii", "hiii", "yo", "sup", "what's up", "whats up", 
+    "good morning", "good evening", "good afternoon", "good night",
+    "marhaba", "ahlan", "salam", "salaam", "assalam", "hola", "bonjour",
+    "how are you", "how r u", "how you doing", "what up", "wazzup", "wassup"
+]
+
+# Casual/non-medical messages
+CASUAL_PATTERNS = [
+    "thank", "thanks", "bye", "goodbye", "ok", "okay", "got it", "i see",
+    "cool", "nice", "great", "awesome", "alright", "sure", "yes", "no",
+    "what can you do", "who are you", "what are you", "help me", "test",
+    "lol", "haha", "hehe", "lmao", "bruh", "bro", "dude", "man",
+    "my friend", "friend", "buddy", "mate"
+]
+
+# Positive feelings - not medical (matched as "feel X", "feeling X", "i am X", "i'm X")
+POSITIVE_FEELINGS = [
+    "happy", "good", "fine", "great", "awesome", "wonderful", "amazing",
+    "better", "well", "excited", "glad", "pleased", "content", "joyful"
+]
+
+MEDICAL_INDICATORS = [
+    "pain", "hurt", "ache", "sick", "ill", "fever", "blood", "vomit", 
+    "cough", "breath", "chest", "head", "stomach", "tired", "weak",
+    "dizzy", "nausea", "symptom", "doctor", "hospital", "emergency",
+    "baby", "child", "wound", "cut", "burn", "injection", "medicine"
+]
+
+# Fallback urgency keywords (checked Emergency -> High -> Low)
+EMERGENCY_KEYWORDS = [
+    "can't breathe", "cannot breathe", "not breathing", "chest pain", 
+    "heart attack", "unconscious", "collapsed", "seizure", "stroke",
+    "severe bleeding", "poisoning", "overdose", "suicidal"
+]
+
+HIGH_KEYWORDS = [
+    "high fever", "39", "40", "deep cut", "broken", "fracture",
+    "blood in", "difficulty breathing", "severe pain"
+]
+
+LOW_KEYWORDS = [
+    "cold", "runny nose", "tired", "minor", "small cut", "sneez"
+]
+
+# One automaton over every list: a message is scanned once for all categories
+KEYWORD_MATCHER = KeywordMatcher({
+    "greeting": GREETINGS,
+    "casual": CASUAL_PATTERNS,
+    "positive_feeling": [
+        f"{prefix} {p}" for p in POSITIVE_FEELINGS for prefix in ("feel", "feeling", "i am", "i'm")
+    ],
+    "medical": MEDICAL_INDICATORS,
+    "emergency": EMERGENCY_KEYWORDS,
+    "high": HIGH_KEYWORDS,
+    "low": LOW_KEYWORDS,
+})
+
+# Service keywords, for recommending services without the LLM
+SERVICE_MATCHER = KeywordMatcher({key: s["keywords"] for key, s in SERVICES.items()})
+
+# Built once: identical for every session
+SERVICES_LIST = "\n".join([
+    f"- {s['name']}: {s['description']}" 
+    for s in SERVICES.values()
+])
+SYSTEM_PROMPT = TRIAGE_SYSTEM_PROMPT.format(services_list=SERVICES_LIST)
+
+# Connection pool shared by every session talking to the provider
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "100"))
+LLM_KEEPALIVE_EXPIRY_S = float(os.environ.get("LLM_KEEPALIVE_EXPIRY_S", "60"))
+LLM_TIMEOUT_S = float(os.environ.get("LLM_TIMEOUT_S", "30"))
+# Upper bound on concurrent async LLM calls per process (aclassify)
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "256"))
+
+# Conversation context per session: the last CONTEXT_MAX_MESSAGES turns are
+# kept, and as many of them as fit CONTEXT_TOKEN_BUDGET are sent with each call.
+# Older turns survive only as the running list of key symptoms.
+CONTEXT_MAX_MESSAGES = int(os.environ.get("CONTEXT_MAX_MESSAGES", "8"))
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("CONTEXT_TOKEN_BUDGET", "600"))
+CONTEXT_MAX_SYMPTOMS = int(os.environ.get("CONTEXT_MAX_SYMPTOMS", "12"))
+
+
+# Local DistilBERT fast path (local_triage_model.py). Confident, clearly
+# non-emergency predictions skip the remote LLM; everything else escalates.
+# Disabled when the exported bundle is missing.
+LOCAL_MODEL_DIR = os.environ.get(
+    "LOCAL_TRIAGE_MODEL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "transformer_triage_model", "onnx")
+)
+LOCAL_MODEL_MIN_CONFIDENCE = float(os.environ.get("LOCAL_MODEL_MIN_CONFIDENCE", "0.9"))
+LOCAL_MODEL_EMERGENCY_ESCALATION = float(os.environ.get("LOCAL_MODEL_EMERGENCY_ESCALATION", "0.05"))
+
+# Advice for locally classified messages (Emergency never stays local)
+LOCAL_ADVICE = {
+    "High": ("Seek medical attention within the next few hours.", "Consider our home healthcare services."),
+    "Medium": ("Monitor your symptoms and rest.", "Consider scheduling a consultation."),
+    "Low": ("Rest and monitor symptoms at home.", "Consult a doctor if symptoms persist or worsen."),
+}
+
+# Shared cache of first-turn classifications, keyed on the normalized message
+CLASSIFICATION_CACHE = ClassificationCache(
+    max_size=int(os.environ.get("CLASSIFICATION_CACHE_SIZE", "2048")),
+    ttl_s=float(os.environ.get("CLASSIFICATION_CACHE_TTL_S", "3600"))
+)
+
+
+# The `urgency` field of the streamed JSON reply (the prompt puts it first)
+URGENCY_FIELD = re.compile(r'"urgency"\s*:\s*"(Emergency|High|Medium|Low)"')
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for budgeting prompts."""
+    return len(text) // 4 + 1
+
 # =============================================================================
 # LLM CLIENT
 # =============================================================================
 
+# Keyed by (event loop, provider, api_key, asynchronous): an async client's connection pool
+# belongs to the loop it runs on, so each loop gets its own (loop is None for sync clients)
+_clients = {}
+_clients_lock = threading.Lock()
+_llm_semaphores = {}  # event loop -> asyncio.Semaphore
+
+
+def _drop_closed_loops(per_loop: Dict, loop_of=lambda key: key):
+    """Forget entries of event loops that have been closed (tests, asyncio.run per call, reloads)."""
+    for key in [k for k in per_loop if loop_of(k) is not None and loop_of(k).is_closed()]:
+        del per_loop[key]
+
+
+def get_llm_client(provider: str, api_key: Optional[str], asynchronous: bool = False):
+    """
+    Process-wide provider client, created on first use and shared by all sessions.
+    
+    One OpenAI client means one keep-alive HTTP connection pool for the whole
+    process instead of one per chat session.
+    
+    Args:
+        asynchronous: Return the AsyncOpenAI client for the running event loop
+            (Gemini models serve both generate_content and generate_content_async)
+    
+    Returns:
+        The OpenAI/AsyncOpenAI client or Gemini GenerativeModel, or None if unavailable
+    """
+    if provider == "gemini":
+        asynchronous = False
+    loop = asyncio.get_running_loop() if asynchronous else None
+    key = (loop, provider, api_key, asynchronous)
+    with _clients_lock:
+        if key in _clients:
+            return _clients[key]
+        _drop_closed_loops(_clients, loop_of=lambda k: k[0])
+        client = None
+        if provider == "gemini":
+            try:
+                import google.generativeai as genai
+                genai.configure(api_key=api_key)
+                client = genai.GenerativeModel('gemini-1.5-flash-8b')
+                print("Gemini client initialized successfully!")
+            except ImportError:
+                print("Install google-generativeai: pip install google-generativeai")
+            except Exception as e:
+                print(f"Gemini init error: {e}")
+                
+        elif provider == "openai":
+            try:
+                import httpx
+                from openai import AsyncOpenAI, OpenAI
+                limits = httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                    keepalive_expiry=LLM_KEEPALIVE_EXPIRY_S
+                )
+                timeout = httpx.Timeout(LLM_TIMEOUT_S)
+                # Base URL comes from OPENAI_BASE_URL when set (e.g. a local mock server)
+                if asynchronous:
+                    client = AsyncOpenAI(api_key=api_key, http_client=httpx.AsyncClient(limits=limits, timeout=timeout))
+                else:
+                    client = OpenAI(api_key=api_key, http_client=httpx.Client(limits=limits, timeout=timeout))
+                print("OpenAI client initialized successfully!")
+            except ImportError:
+                print("Install openai: pip install openai")
+            except Exception as e:
+                print(f"OpenAI init error: {e}")
+        _clients[key] = client
+        return client
+
+
+def get_llm_semaphore() -> asyncio.Semaphore:
+    """Limit on in-flight async LLM calls (LLM_MAX_CONCURRENCY) on the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        semaphore = _llm_semaphores.get(loop)
+        if semaphore is None:
+            _drop_closed_loops(_llm_semaphores)
+            semaphore = _llm_semaphores[loop] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        return semaphore
+
+
+_local_model = None
+_local_model_checked = False
+
+
+def get_local_model():
+    """Process-wide LocalTriageModel, or None when the ONNX bundle or its dependencies are missing."""
+    global _local_model, _local_model_checked
+    with _clients_lock:
+        if not _local_model_checked:
+            _local_model_checked = True
+            if os.path.exists(os.path.join(LOCAL_MODEL_DIR, "model.onnx")):
+                try:
+                    from local_triage_model import LocalTriageModel
+                    _local_model = LocalTriageModel(LOCAL_MODEL_DIR)
+                    print("Local triage model loaded successfully!")
+                except ImportError:
+                    print("Install onnxruntime and tokenizers: pip install onnxruntime tokenizers")
+                except Exception as e:
+                    print(f"Local triage model error: {e}")
+        return _local_model
+
+
+def accept_local_prediction(text: str, prediction: Dict, min_confidence: float = None,
+                            emergency_escalation: float = None) -> bool:
+    """
+    Whether a local model prediction may be served without the LLM.
+    
+    Escalates when the model is unsure, predicts Emergency, gives Emergency
+    more than a small probability, or the message contains an emergency keyword.
+    """
+    if min_confidence is None:
+        min_confidence = LOCAL_MODEL_MIN_CONFIDENCE
+    if emergency_escalation is None:
+        emergency_escalation = LOCAL_MODEL_EMERGENCY_ESCALATION
+    return (
+        prediction["urgency"] != "Emergency"
+        and prediction["confidence"] >= min_confidence
+        and prediction["probabilities"].get("Emergency", 0.0) < emergency_escalation
+        and not KEYWORD_MATCHER.scan(text.lower().strip()).any("emergency")
+    )
+
+
 class TriageLLM:
     def __init__(self, api_key: str = None, provider: str = "gemini"):
         """
@@ -144,44 +393,19 @@ class TriageLLM:
         if not self.api_key:
             pass # Use fallback mode quietly
         
-        # Build services list for prompt
-        services_list = "\n".join([
-            f"- {s['name']}: {s['description']}" 
-            for s in SERVICES.values()
-        ])
-        self.system_prompt = TRIAGE_SYSTEM_PROMPT.format(services_list=services_list)
+        self.system_prompt = SYSTEM_PROMPT
         
-        # Initialize client
+        # Attach the shared client
         self._init_client()
     
     def _init_client(self):
-        """Initialize the LLM client based on provider."""
+        """Attach the process-wide client for the provider (created on first use)."""
+        client = get_llm_client(self.provider, self.api_key)
         if self.provider == "gemini":
-            try:
-                import google.generativeai as genai
-                genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel('gemini-1.5-flash-8b')
-                self.client_available = True
-                print("Gemini client initialized successfully!")
-            except ImportError:
-                print("Install google-generativeai: pip install google-generativeai")
-                self.client_available = False
-            except Exception as e:
-                print(f"Gemini init error: {e}")
-                self.client_available = False
-                
-        elif self.provider == "openai":
-            try:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=self.api_key)
-                self.client_available = True
-                print("OpenAI client initialized successfully!")
-            except ImportError:
-                print("Install openai: pip install openai")
-                self.client_available = False
-            except Exception as e:
-                print(f"OpenAI init error: {e}")
-                self.client_available = False
+            self.model = client
+        else:
+            self.client = client
+        self.client_available = client is not None
     
     def classify(self, user_message: str) -> Dict:
         """
@@ -193,45 +417,328 @@ class TriageLLM:
         Returns:
             Dictionary with urgency, confidence, reasoning, services, etc.
         """
+        cache_key = self._cache_key(user_message)
+        cached = self._cached_result(cache_key, user_message)
+        if cached is not None:
+            return cached
+        
+        model = self._local_model()
+        if model is not None:
+            local = self._local_result(user_message, model.classify(user_message))
+            if local is not None:
+                return local
+        
         if not self.client_available:
             print("[USING FALLBACK - No API client]")
             return self._fallback_classify(user_message)
         
         # Add to conversation history
-        self.conversation_history.append({"role": "user", "content": user_message})
-        
-        # Build full prompt
-        full_prompt = self.system_prompt + "\n\nPatient says: " + user_message
+        self._remember("user", user_message)
         
         try:
             if self.provider == "gemini":
-                response = self.model.generate_content(full_prompt)
+                response = self.model.generate_content(self._gemini_prompt(user_message))
                 response_text = response.text
             else:  # openai
                 response = self.client.chat.completions.create(
                     model="gpt-4o-mini",  # Cheap and fast
-                    messages=[
-                        {"role": "system", "content": self.system_prompt},
-                        {"role": "user", "content": user_message}
-                    ]
+                    messages=self._openai_messages(user_message)
                 )
                 response_text = response.choices[0].message.content
             
-            # Parse JSON response
-            result = self._parse_response(response_text)
-            result['source'] = 'LLM'  # Mark as LLM response
-            print("[USING LLM - API responded successfully]")
-            
-            # Add to history
-            self.conversation_history.append({"role": "assistant", "content": json.dumps(result)})
+            return self._accept_response(response_text, cache_key)
             
+        except Exception as e:
+            print(f"LLM Error: {e}")
+            print("[USING FALLBACK - API failed]")
+            return self._fallback_classify(user_message)
+    
+    async def aclassify(self, user_message: str, timeout: float = None) -> Dict:
+        """
+        Async variant of classify() for the event loop.
+        
+        Uses the providers' async clients, so the loop keeps serving other
+        conversations during the LLM round trip. Each call is bounded by
+        `timeout` (default LLM_TIMEOUT_S) and by the process-wide
+        LLM_MAX_CONCURRENCY semaphore; timeouts and errors use the fallback.
+        """
+        cache_key, result = await self._aresolve_without_llm(user_message)
+        if result is not None:
             return result
+        
+        # Add to conversation history
+        self._remember("user", user_message)
+        
+        try:
+            async with get_llm_semaphore():
+                if self.provider == "gemini":
+                    response = await asyncio.wait_for(
+                        self.model.generate_content_async(self._gemini_prompt(user_message)),
+                        timeout or LLM_TIMEOUT_S
+                    )
+                    response_text = response.text
+                else:  # openai
+                    client = get_llm_client(self.provider, self.api_key, asynchronous=True)
+                    response = await asyncio.wait_for(
+                        client.chat.completions.create(
+                            model="gpt-4o-mini",
+                            messages=self._openai_messages(user_message)
+                        ),
+                        timeout or LLM_TIMEOUT_S
+                    )
+                    response_text = response.choices[0].message.content
+            
+            return self._accept_response(response_text, cache_key)
             
+        except asyncio.TimeoutError:
+            print("[USING FALLBACK - API timed out]")
+            return self._fallback_classify(user_message)
         except Exception as e:
             print(f"LLM Error: {e}")
             print("[USING FALLBACK - API failed]")
             return self._fallback_classify(user_message)
     
+    async def _aresolve_without_llm(self, user_message: str) -> Tuple[Optional[tuple], Optional[Dict]]:
+        """
+        Cache, local model and no-client fallback, in that order.
+        
+        Returns:
+            (cache_key, result); result is None when the LLM has to be called
+        """
+        cache_key = self._cache_key(user_message)
+        cached = self._cached_result(cache_key, user_message)
+        if cached is not None:
+            return cache_key, cached
+        
+        model = self._local_model()
+        if model is not None:
+            # onnxruntime releases the GIL, so inference runs beside the event loop
+            prediction = await asyncio.get_running_loop().run_in_executor(None, model.classify, user_message)
+            local = self._local_result(user_message, prediction)
+            if local is not None:
+                return cache_key, local
+        
+        if not self.client_available:
+            print("[USING FALLBACK - No API client]")
+            return cache_key, self._fallback_classify(user_message)
+        
+        return cache_key, None
+    
+    async def astream(self, user_message: str, timeout: float = None):
+        """
+        Streaming variant of aclassify(), as an async generator of (event, data):
+        
+            ("urgency", {"urgency": ..., "provisional": bool})
+                - provisional: an emergency keyword in the message, sent before the LLM call
+                - final: the LLM's JSON `urgency` field, as soon as it has streamed in
+            ("token", str)   - raw LLM output as it arrives
+            ("result", dict) - the parsed classification (same as aclassify)
+        """
+        loop = asyncio.get_running_loop()
+        streamed_urgency = None
+        if KEYWORD_MATCHER.scan(user_message.lower().strip()).any("emergency"):
+            yield "urgency", {"urgency": "Emergency", "provisional": True}
+        
+        cache_key, result = await self._aresolve_without_llm(user_message)
+        if result is None:
+            # Add to conversation history
+            self._remember("user", user_message)
+            chunks = []
+            try:
+                async with get_llm_semaphore():
+                    deadline = loop.time() + (timeout or LLM_TIMEOUT_S)
+                    stream = await asyncio.wait_for(self._aopen_stream(user_message), deadline - loop.time())
+                    chunk_iter = stream.__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunk_iter.__anext__(), max(0.0, deadline - loop.time()))
+                        except StopAsyncIteration:
+                            break
+                        text = self._chunk_text(chunk)
+                        if not text:
+                            continue
+                        chunks.append(text)
+                        yield "token", text
+                        if streamed_urgency is None:
+                            match = URGENCY_FIELD.search("".join(chunks))
+                            if match:
+                                streamed_urgency = match.group(1)
+                                yield "urgency", {"urgency": streamed_urgency, "provisional": False}
+                
+                result = self._accept_response("".join(chunks), cache_key)
+                
+            except asyncio.TimeoutError:
+                print("[USING FALLBACK - API timed out]")
+                result = self._fallback_classify(user_message)
+            except Exception as e:
+                print(f"LLM Error: {e}")
+                print("[USING FALLBACK - API failed]")
+                result = self._fallback_classify(user_message)
+        
+        # Also covers non-streamed results and a reply that failed to parse after all
+        if streamed_urgency != result.get("urgency", "Medium"):
+            yield "urgency", {"urgency": result.get("urgency", "Medium"), "provisional": False}
+        yield "result", result
+    
+    async def _aopen_stream(self, user_message: str):
+        """Start a streaming completion; returns an async iterable of provider chunks."""
+        if self.provider == "gemini":
+            return await self.model.generate_content_async(self._gemini_prompt(user_message), stream=True)
+        client = get_llm_client(self.provider, self.api_key, asynchronous=True)
+        return await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=self._openai_messages(user_message),
+            stream=True
+        )
+    
+    def _chunk_text(self, chunk) -> Optional[str]:
+        if self.provider == "gemini":
+            try:
+                return chunk.text
+            except ValueError:  # chunk without text parts (e.g. safety metadata)
+                return None
+        return chunk.choices[0].delta.content if chunk.choices else None
+    
+    def _remember(self, role: str, content: str):
+        """Append a turn, keeping only the last CONTEXT_MAX_MESSAGES."""
+        self.conversation_history.append({"role": role, "content": content})
+        del self.conversation_history[:-CONTEXT_MAX_MESSAGES]
+    
+    def _context_window(self) -> List[Dict]:
+        """
+        Earlier turns to send with the current message: newest first, until
+        CONTEXT_TOKEN_BUDGET is spent. The last history entry is the current
+        user message, which is always sent separately.
+        """
+        window, budget = [], CONTEXT_TOKEN_BUDGET
+        for turn in reversed(self.conversation_history[:-1]):
+            budget -= estimate_tokens(turn["content"])
+            if budget < 0:
+                break
+            window.append(turn)
+        window.reverse()
+        # Start on a patient turn so the window never opens with an orphaned answer
+        if window and window[0]["role"] == "assistant":
+            window = window[1:]
+        return window
+    
+    def _symptom_summary(self) -> Optional[str]:
+        if not self.current_symptoms:
+            return None
+        return "Symptoms reported earlier in this conversation: " + ", ".join(self.current_symptoms)
+    
+    def _gemini_prompt(self, user_message: str) -> str:
+        # The system prompt stays the unchanged prefix of every call
+        parts = [self.system_prompt]
+        summary = self._symptom_summary()
+        if summary:
+            parts.append(summary)
+        for turn in self._context_window():
+            parts.append(("Patient: " if turn["role"] == "user" else "Assistant: ") + turn["content"])
+        return "\n".join(parts) + "\n\nPatient says: " + user_message
+    
+    def _openai_messages(self, user_message: str) -> List[Dict]:
+        messages = [{"role": "system", "content": self.system_prompt}]
+        summary = self._symptom_summary()
+        if summary:
+            messages.append({"role": "system", "content": summary})
+        messages.extend(self._context_window())
+        messages.append({"role": "user", "content": user_message})
+        return messages
+    
+    def _update_symptoms(self, symptoms: List[str]):
+        """Merge new key symptoms into the running summary (most recent last, bounded)."""
+        if isinstance(symptoms, str):
+            symptoms = [symptoms]
+        for symptom in symptoms:
+            symptom = str(symptom).strip()
+            if not symptom:
+                continue
+            self.current_symptoms = [s for s in self.current_symptoms if s.lower() != symptom.lower()]
+            self.current_symptoms.append(symptom)
+        del self.current_symptoms[:-CONTEXT_MAX_SYMPTOMS]
+    
+    def _accept_response(self, response_text: str, cache_key: Optional[tuple] = None) -> Dict:
+        """Parse a successful LLM reply, record it in the history and cache it if allowed."""
+        result = self._parse_response(response_text)
+        result['source'] = 'LLM'  # Mark as LLM response
+        print("[USING LLM - API responded successfully]")
+        
+        # Unparseable replies are not worth repeating to other patients
+        if cache_key is not None and "raw_response" not in result:
+            CLASSIFICATION_CACHE.put(cache_key, result)
+        
+        return self._record_result(result)
+    
+    def _record_result(self, result: Dict) -> Dict:
+        # Add to history: only the fields later turns need, not the full reply
+        self._update_symptoms(result.get("key_symptoms") or [])
+        self._remember("assistant", json.dumps({
+            "urgency": result.get("urgency"),
+            "key_symptoms": result.get("key_symptoms", []),
+            "recommended_services": result.get("recommended_services", [])
+        }, ensure_ascii=False, separators=(",", ":")))
+        
+        return result
+    
+    def _cache_key(self, user_message: str) -> Optional[tuple]:
+        """
+        Key into the shared classification cache, or None when the reply could
+        depend on earlier turns: only a session's first, stateless
+        classification is cached or served from the cache.
+        """
+        if not CLASSIFICATION_CACHE.enabled or self.conversation_history or self.current_symptoms:
+            return None
+        return CLASSIFICATION_CACHE.key(self.provider, user_message)
+    
+    def _local_model(self):
+        """The local model, when loaded and this turn is stateless (it only sees the current message)."""
+        if self.conversation_history or self.current_symptoms:
+            return None
+        return get_local_model()
+    
+    def _local_result(self, user_message: str, prediction: Dict) -> Optional[Dict]:
+        """Confident local prediction in the LLM result format, or None to escalate to the LLM."""
+        if not accept_local_prediction(user_message, prediction):
+            return None
+        print("[USING LOCAL MODEL - confident, non-emergency]")
+        
+        urgency = prediction["urgency"]
+        message_lower = user_message.lower().strip()
+        hits = KEYWORD_MATCHER.scan(message_lower)
+        service_hits = SERVICE_MATCHER.scan(message_lower)
+        services = [
+            s["name"] for key, s in SERVICES.items()
+            if urgency in s["urgency_match"] and service_hits.any(key)
+        ] or ([] if urgency == "High" else ["Vital Signs"])
+        symptoms = list(dict.fromkeys(
+            hit.keyword for category in ("high", "low", "medical") for hit in hits.in_category(category)
+        ))
+        immediate_advice, follow_up = LOCAL_ADVICE.get(urgency, LOCAL_ADVICE["Medium"])
+        
+        self._remember("user", user_message)
+        return self._record_result({
+            "urgency": urgency,
+            "confidence": round(prediction["confidence"], 3),
+            "reasoning": f"Local triage model assessment ({prediction['confidence']:.0%} confidence)",
+            "key_symptoms": symptoms,
+            "recommended_services": services,
+            "immediate_advice": immediate_advice,
+            "follow_up": follow_up,
+            "source": "local_model"
+        })
+    
+    def _cached_result(self, cache_key: Optional[tuple], user_message: str) -> Optional[Dict]:
+        if cache_key is None:
+            return None
+        result = CLASSIFICATION_CACHE.get(cache_key)
+        if result is None:
+            return None
+        print("[USING CACHE - same first message classified before]")
+        result['cached'] = True
+        self._remember("user", user_message)
+        return self._record_result(result)
+    
     def _parse_response(self, response_text: str) -> Dict:
         """Parse the LLM response into structured format."""
         # Try to extract JSON from response
@@ -259,62 +766,44 @@ class TriageLLM:
         """
         Fallback classification using keyword rules when LLM is unavailable.
         """
-        text_lower = text.lower()
-        
-        # Emergency keywords
-        emergency_keywords = [
-            "can't breathe", "cannot breathe", "not breathing", "chest pain", 
-            "heart attack", "unconscious", "collapsed", "seizure", "stroke",
-            "severe bleeding", "poisoning", "overdose", "suicidal"
-        ]
-        
-        # High keywords
-        high_keywords = [
-            "high fever", "39", "40", "deep cut", "broken", "fracture",
-            "blood in", "difficulty breathing", "severe pain"
-        ]
-        
-        # Low keywords
-        low_keywords = [
-            "cold", "runny nose", "tired", "minor", "small cut", "sneez"
-        ]
-        
-        # Check keywords
-        for kw in emergency_keywords:
-            if kw in text_lower:
-                return {
-                    "urgency": "Emergency",
-                    "confidence": 0.9,
-                    "reasoning": f"Detected emergency keyword: {kw}",
-                    "key_symptoms": [kw],
-                    "recommended_services": [],
-                    "immediate_advice": "Call emergency services immediately! Dial your local emergency number.",
-                    "follow_up": "Do not wait - this requires immediate medical attention."
-                }
-        
-        for kw in high_keywords:
-            if kw in text_lower:
-                return {
-                    "urgency": "High",
-                    "confidence": 0.8,
-                    "reasoning": f"Detected high-urgency keyword: {kw}",
-                    "key_symptoms": [kw],
-                    "recommended_services": ["IV Therapy", "Wound Care"],
-                    "immediate_advice": "Seek medical attention within the next few hours.",
-                    "follow_up": "Consider our home healthcare services."
-                }
-        
-        for kw in low_keywords:
-            if kw in text_lower:
-                return {
-                    "urgency": "Low",
-                    "confidence": 0.7,
-                    "reasoning": f"Detected low-urgency keyword: {kw}",
-                    "key_symptoms": [kw],
-                    "recommended_services": ["Vital Signs", "Blood Draw"],
-                    "immediate_advice": "Rest and monitor symptoms at home.",
-                    "follow_up": "Consult a doctor if symptoms persist or worsen."
-                }
+        hits = KEYWORD_MATCHER.scan(text.lower().strip())
+        
+        # Check keywords (within a category, list order decides which keyword is reported)
+        hit = hits.first("emergency")
+        if hit:
+            return {
+                "urgency": "Emergency",
+                "confidence": 0.9,
+                "reasoning": f"Detected emergency keyword: {hit.keyword}",
+                "key_symptoms": [hit.keyword],
+                "recommended_services": [],
+                "immediate_advice": "Call emergency services immediately! Dial your local emergency number.",
+                "follow_up": "Do not wait - this requires immediate medical attention."
+            }
+        
+        hit = hits.first("high")
+        if hit:
+            return {
+                "urgency": "High",
+                "confidence": 0.8,
+                "reasoning": f"Detected high-urgency keyword: {hit.keyword}",
+                "key_symptoms": [hit.keyword],
+                "recommended_services": ["IV Therapy", "Wound Care"],
+                "immediate_advice": "Seek medical attention within the next few hours.",
+                "follow_up": "Consider our home healthcare services."
+            }
+        
+        hit = hits.first("low")
+        if hit:
+            return {
+                "urgency": "Low",
+                "confidence": 0.7,
+                "reasoning": f"Detected low-urgency keyword: {hit.keyword}",
+                "key_symptoms": [hit.keyword],
+                "recommended_services": ["Vital Signs", "Blood Draw"],
+                "immediate_advice": "Rest and monitor symptoms at home.",
+                "follow_up": "Consult a doctor if symptoms persist or worsen."
+            }
         
         # Default to Medium
         return {
@@ -348,6 +837,26 @@ class TriageChatbot:
         self.state = "greeting"  # greeting, collecting_symptoms, classified
         self.last_classification = None
     
+    def to_state(self) -> Dict:
+        """Conversation data only (no LLM client), for external session stores."""
+        return {
+            "provider": self.triage.provider,
+            "conversation_history": self.triage.conversation_history,
+            "current_symptoms": self.triage.current_symptoms,
+            "state": self.state,
+            "last_classification": self.last_classification,
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict, api_key: str = None, provider: str = None) -> "TriageChatbot":
+        """Rebuild a chatbot from `to_state()` output."""
+        chatbot = cls(api_key=api_key, provider=provider or state.get("provider", "gemini"))
+        chatbot.triage.conversation_history = state.get("conversation_history", [])
+        chatbot.triage.current_symptoms = state.get("current_symptoms", [])
+        chatbot.state = state.get("state", "greeting")
+        chatbot.last_classification = state.get("last_classification")
+        return chatbot
+    
     def chat(self, user_message: str) -> Dict:
         """
         Process a user message and return appropriate response.
@@ -361,16 +870,46 @@ class TriageChatbot:
                 "full_classification": {...}
             }
         """
+        reply = self._quick_reply(user_message)
+        if reply is not None:
+            return reply
+        
+        # This looks like a symptom description - classify it
+        return self._classified_reply(self.triage.classify(user_message))
+    
+    async def achat(self, user_message: str) -> Dict:
+        """Async variant of chat(): same replies, classified with TriageLLM.aclassify."""
+        reply = self._quick_reply(user_message)
+        if reply is not None:
+            return reply
+        
+        return self._classified_reply(await self.triage.aclassify(user_message))
+    
+    async def astream(self, user_message: str):
+        """
+        Streaming variant of achat(): yields ("urgency", {...}) and ("token", str)
+        events from TriageLLM.astream, then ("reply", <same dict as chat()>).
+        """
+        reply = self._quick_reply(user_message)
+        if reply is not None:
+            yield "reply", reply
+            return
+        
+        async for event, data in self.triage.astream(user_message):
+            if event == "result":
+                yield "reply", self._classified_reply(data)
+            else:
+                if event == "urgency":
+                    data = dict(data, show_sos=data["urgency"] == "Emergency")
+                yield event, data
+    
+    def _quick_reply(self, user_message: str) -> Optional[Dict]:
+        """Reply to greetings, casual and non-medical messages; None means classify."""
         message_lower = user_message.lower().strip()
+        hits = KEYWORD_MATCHER.scan(message_lower)
         
         # Check for casual greetings
-        greetings = [
-            "hello", "hi", "hey", "hii", "hiii", "yo", "sup", "what's up", "whats up", 
-            "good morning", "good evening", "good afternoon", "good night",
-            "marhaba", "ahlan", "salam", "salaam", "assalam", "hola", "bonjour",
-            "how are you", "how r u", "how you doing", "what up", "wazzup", "wassup"
-        ]
-        if any(g in message_lower for g in greetings) or len(message_lower) < 5:
+        if hits.any("greeting") or len(message_lower) < 5:
             return {
                 "response": "Hello! I'm the Housepital health assistant. How can I help you today? Please describe any symptoms or health concerns you have.",
                 "urgency": None,
@@ -379,23 +918,8 @@ class TriageChatbot:
                 "full_classification": None
             }
         
-        # Check for casual/non-medical messages
-        casual_patterns = [
-            "thank", "thanks", "bye", "goodbye", "ok", "okay", "got it", "i see",
-            "cool", "nice", "great", "awesome", "alright", "sure", "yes", "no",
-            "what can you do", "who are you", "what are you", "help me", "test",
-            "lol", "haha", "hehe", "lmao", "bruh", "bro", "dude", "man",
-            "my friend", "friend", "buddy", "mate"
-        ]
-        
-        # Positive feelings - not medical
-        positive_feelings = [
-            "happy", "good", "fine", "great", "awesome", "wonderful", "amazing",
-            "better", "well", "excited", "glad", "pleased", "content", "joyful"
-        ]
-        
         # Check if message expresses positive feelings
-        if any(f"feel {p}" in message_lower or f"feeling {p}" in message_lower or f"i am {p}" in message_lower or f"i'm {p}" in message_lower for p in positive_feelings):
+        if hits.any("positive_feeling"):
             return {
                 "response": "That's great to hear! I'm here if you ever need help with any health concerns. Is there anything else I can assist you with?",
                 "urgency": None,
@@ -405,15 +929,8 @@ class TriageChatbot:
             }
         
         # Check if message is purely casual (no medical words)
-        medical_indicators = [
-            "pain", "hurt", "ache", "sick", "ill", "fever", "blood", "vomit", 
-            "cough", "breath", "chest", "head", "stomach", "tired", "weak",
-            "dizzy", "nausea", "symptom", "doctor", "hospital", "emergency",
-            "baby", "child", "wound", "cut", "burn", "injection", "medicine"
-        ]
-        
-        has_medical = any(m in message_lower for m in medical_indicators)
-        is_casual = any(p in message_lower for p in casual_patterns)
+        has_medical = hits.any("medical")
+        is_casual = hits.any("casual")
         
         # If it's casual and has no medical indicators
         if is_casual and not has_medical and len(message_lower) < 50:
@@ -435,8 +952,10 @@ class TriageChatbot:
                 "full_classification": None
             }
         
-        # This looks like a symptom description - classify it
-        classification = self.triage.classify(user_message)
+        return None
+    
+    def _classified_reply(self, classification: Dict) -> Dict:
+        """Build the chat reply for a triage classification."""
         self.last_classification = classification
         
         urgency = classification.get("urgency", "Medium")
@@ -1,9 +1,22 @@
 
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from inference_pipeline import InferencePipeline
-from PIL import Image
-import io
+from micro_batcher import MicroBatcher
+from preprocessing import DecodedImage
+from result_cache import ResultCache
+from inference_server import RemotePipeline
+from metrics import REGISTRY, CONTENT_TYPE, STAGE_SECONDS, REQUEST_SECONDS, REQUESTS
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+import asyncio
+import functools
+import json
+import sys
+import time
+import os
 import uvicorn
 import torch
 
@@ -23,65 +36,515 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global Pipeline Variable
+# Micro-batching config (BATCH_MAX_SIZE=1 disables batching)
+BATCH_MAX_SIZE = int(os.environ.get("BATCH_MAX_SIZE", "8"))
+BATCH_MAX_WAIT_MS = float(os.environ.get("BATCH_MAX_WAIT_MS", "10"))
+
+# Inference executor & admission control config
+INFERENCE_WORKERS = int(os.environ.get("INFERENCE_WORKERS", str(os.cpu_count() or 1)))
+MAX_PENDING_REQUESTS = int(os.environ.get("MAX_PENDING_REQUESTS", "64"))  # queued + running
+REQUEST_DEADLINE_S = float(os.environ.get("REQUEST_DEADLINE_S", "30"))
+RETRY_AFTER_S = int(os.environ.get("RETRY_AFTER_S", "2"))
+
+# Optional shared-backbone checkpoint for Stages 1-3 (see multihead_train.py)
+MULTIHEAD_MODEL_PATH = os.environ.get("MULTIHEAD_MODEL_PATH")
+# Execution backend: torch (eager), onnx or torchscript (see export_onnx.py)
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "torch")
+# fp32 or int8 (int8 requires INFERENCE_BACKEND=onnx, see quantize_int8.py)
+INFERENCE_PRECISION = os.environ.get("INFERENCE_PRECISION", "fp32")
+
+# Model loading: Stage 2/3 loaded on first use when LAZY_STAGES=1; loads run on MODEL_LOAD_WORKERS threads
+LAZY_STAGES = os.environ.get("LAZY_STAGES", "0") == "1"
+MODEL_LOAD_WORKERS = int(os.environ.get("MODEL_LOAD_WORKERS", "4"))
+# Memory-map converted .safetensors weights (convert_safetensors.py) so uvicorn workers share them
+MMAP_WEIGHTS = os.environ.get("MMAP_WEIGHTS", "1") == "1"
+
+# Shared inference server(s) (see inference_server.py). When set, this worker loads no models:
+# decoded images go over shared memory to the server, which batches across all uvicorn workers.
+INFERENCE_SERVER = os.environ.get("INFERENCE_SERVER")  # unix socket path(s), comma-separated
+INFERENCE_SERVER_CONNECT_TIMEOUT_S = float(os.environ.get("INFERENCE_SERVER_CONNECT_TIMEOUT_S", "300"))
+
+# Result cache config (RESULT_CACHE_SIZE=0 disables, RESULT_CACHE_DB enables the sqlite tier)
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "1024"))
+RESULT_CACHE_TTL_S = float(os.environ.get("RESULT_CACHE_TTL_S", "3600"))
+RESULT_CACHE_DB = os.environ.get("RESULT_CACHE_DB")
+RESULT_CACHE_DB_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_DB_MAX_ENTRIES", "100000"))
+
+# Upload quality checks (format, size, brightness, blur) from the backend's ImageValidator.
+# With validation on, the validator's decode is the one the pipeline runs on (one decode per upload).
+IMAGE_VALIDATOR_DIR = os.environ.get("IMAGE_VALIDATOR_DIR", str(Path(__file__).resolve().parents[2] / "Backend" / "ai_service"))
+VALIDATE_UPLOADS = os.environ.get("VALIDATE_UPLOADS", "0") == "1"  # default for ?validate=
+sys.path.append(IMAGE_VALIDATOR_DIR)
+try:
+    from image_validator import ImageValidator
+    image_validator = ImageValidator()
+except ImportError:
+    image_validator = None
+
+# /predict/batch: max photos per upload
+BATCH_MAX_FILES = int(os.environ.get("BATCH_MAX_FILES", "32"))
+
+VALID_CONTENT_TYPES = ["image/jpeg", "image/png", "image/jpg", "application/octet-stream"]
+
+# Global Pipeline Variable (set once the models are loaded)
 pipeline = None
+# The pipeline being loaded in the background, exposes per-stage state to /ready
+loading_pipeline = None
+load_error = None
+load_started_at = None
+model_loader = None
+batcher = None
+result_cache = None
+
+# Blocking work (decode + model inference) runs here, never on the event loop
+inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+# sqlite reads/writes of the result cache run here (one thread: the connection is shared)
+cache_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-cache")
+pending_requests = 0
+rejected_requests = 0
+timed_out_requests = 0
 
 @app.on_event("startup")
 async def startup_event():
-    global pipeline
+    # Load models in the background: /live answers immediately, /ready once the models are in
+    global model_loader
+    model_loader = asyncio.create_task(load_models())
+
+async def load_models():
+    global pipeline, batcher, result_cache, loading_pipeline, load_error, load_started_at
     print("⏳ Loading Models...")
+    load_started_at = time.perf_counter()
     try:
-        pipeline = InferencePipeline()
-        print("✅ Models Loaded Successfully!")
+        if INFERENCE_SERVER:
+            loading_pipeline = RemotePipeline(INFERENCE_SERVER)
+            await asyncio.get_running_loop().run_in_executor(None, loading_pipeline.connect, INFERENCE_SERVER_CONNECT_TIMEOUT_S)
+            print(f"✅ Connected to inference server(s) {INFERENCE_SERVER} in {time.perf_counter() - load_started_at:.1f}s!")
+        else:
+            loading_pipeline = InferencePipeline(
+                multihead_path=MULTIHEAD_MODEL_PATH,
+                backend=INFERENCE_BACKEND,
+                precision=INFERENCE_PRECISION,
+                lazy_stages=LAZY_STAGES,
+                load_workers=MODEL_LOAD_WORKERS,
+                mmap_weights=MMAP_WEIGHTS,
+                autoload=False
+            )
+            await asyncio.get_running_loop().run_in_executor(None, loading_pipeline.load)
+            print(f"✅ Models Loaded Successfully in {time.perf_counter() - load_started_at:.1f}s!")
     except Exception as e:
+        load_error = str(e)
         print(f"❌ Error loading models: {e}")
+        return
+
+    if RESULT_CACHE_SIZE > 0:
+        result_cache = ResultCache(
+            max_entries=RESULT_CACHE_SIZE,
+            ttl_s=RESULT_CACHE_TTL_S,
+            disk_path=RESULT_CACHE_DB,
+            model_version=loading_pipeline.model_version,
+            max_disk_entries=RESULT_CACHE_DB_MAX_ENTRIES
+        )
+        await asyncio.get_running_loop().run_in_executor(cache_executor, result_cache.prune_disk)
+        print(f"✅ Result cache enabled (size={RESULT_CACHE_SIZE}, ttl={RESULT_CACHE_TTL_S:g}s, disk={RESULT_CACHE_DB or 'off'})")
+
+    # With an inference server the batching happens there, across all workers
+    if BATCH_MAX_SIZE > 1 and not INFERENCE_SERVER:
+        batcher = MicroBatcher(
+            loading_pipeline.predict_batch,
+            max_batch_size=BATCH_MAX_SIZE,
+            max_wait_ms=BATCH_MAX_WAIT_MS,
+            executor=inference_executor
+        )
+        await batcher.start()
+        print(f"✅ Micro-batching enabled (max_batch_size={BATCH_MAX_SIZE}, max_wait_ms={BATCH_MAX_WAIT_MS})")
+
+    # Start serving only once the cache / batcher are in place
+    pipeline = loading_pipeline
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if model_loader and not model_loader.done():
+        model_loader.cancel()
+    if batcher:
+        await batcher.stop()
+    inference_executor.shutdown(wait=False)
+    if isinstance(pipeline, RemotePipeline):
+        pipeline.close()
+    if result_cache:
+        cache_executor.shutdown(wait=True)  # flush queued sqlite writes
+        result_cache.close()
+
+def decode_upload(contents, timings=None, validate=False):
+    """
+    Decode uploaded bytes once; every pipeline stage reuses this buffer.
+    With `validate`, ImageValidator does the decode and its quality checks run on it;
+    an invalid upload raises 422 with the validator's Arabic/English messages.
+    """
+    start = time.perf_counter()
+    if validate:
+        result = image_validator.validate(contents)
+        if not result.is_valid:
+            raise HTTPException(status_code=422, detail={
+                "error": result.error.name,
+                "message_ar": result.error_message_ar,
+                "message_en": result.error_message_en,
+            })
+        image = DecodedImage.from_pil(result.image)
+        stage = "validate_decode"
+    else:
+        image = DecodedImage.from_bytes(contents)
+        stage = "decode"
+    elapsed = time.perf_counter() - start
+    STAGE_SECONDS.observe(elapsed, stage=stage)
+    if timings is not None:
+        timings[stage] = elapsed
+    print(f"🖼️ Image size: {image.size}")
+    return image
+
+async def cache_lookup(cache_key):
+    """Memory tier on the event loop; only a memory miss goes to sqlite, on the cache thread."""
+    result = result_cache.get_memory(cache_key)
+    if result is None and result_cache.has_disk:
+        result = await asyncio.get_running_loop().run_in_executor(cache_executor, result_cache.get_disk, cache_key)
+    return result
+
+def cache_store(cache_key, result):
+    """Memory tier now; the sqlite write is queued on the cache thread and not waited for."""
+    value = result_cache.put_memory(cache_key, result)
+    if result_cache.has_disk:
+        cache_executor.submit(result_cache.put_disk, cache_key, value)
+
+def _resolve_validate(validate):
+    """?validate= falls back to VALIDATE_UPLOADS; 501 if the validator is not importable."""
+    if validate is None:
+        validate = VALIDATE_UPLOADS
+    if validate and image_validator is None:
+        raise HTTPException(status_code=501, detail=f"ImageValidator not available (looked in {IMAGE_VALIDATOR_DIR})")
+    return validate
+
+async def run_inference(contents, timings=None, validate=False):
+    """
+    Decode (+ validate) + predict in the inference executor, with admission control and a per-request deadline.
+    Raises 503 (with Retry-After) when saturated and 504 when the deadline is exceeded.
+    Per-stage times (seconds) are written to `timings` if a dict is given.
+    """
+    global pending_requests, rejected_requests, timed_out_requests
+    if pending_requests >= MAX_PENDING_REQUESTS:
+        rejected_requests += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Inference queue is full. Please retry later.",
+            headers={"Retry-After": str(RETRY_AFTER_S)}
+        )
+
+    # The executor cannot abandon a running decode/predict, so the slot is held until the
+    # work itself finishes (done-callback), not until this request stops waiting for it
+    pending_requests += 1
+    deadline = asyncio.get_running_loop().time() + REQUEST_DEADLINE_S
+    work = asyncio.ensure_future(_decode_and_predict(contents, timings, validate, deadline))
+    work.add_done_callback(_release_slots)
+    try:
+        return await asyncio.wait_for(asyncio.shield(work), timeout=REQUEST_DEADLINE_S)
+    except asyncio.TimeoutError:
+        timed_out_requests += 1
+        raise HTTPException(status_code=504, detail=f"Inference exceeded the {REQUEST_DEADLINE_S:g}s deadline")
+
+def _release_slots(work, count=1):
+    """Done-callback of an admitted unit of work: give its admission slots back."""
+    global pending_requests
+    pending_requests -= count
+    if not work.cancelled():
+        work.exception()  # already reported to the request if it was still waiting
+
+async def _decode_and_predict(contents, timings, validate, deadline):
+    loop = asyncio.get_running_loop()
+    image = await loop.run_in_executor(inference_executor, decode_upload, contents, timings, validate)
+    if loop.time() >= deadline:
+        # The request has already answered 504: do not queue a prediction nobody will read
+        raise asyncio.TimeoutError()
+    if batcher:
+        return await batcher.submit(image, timings)
+    if isinstance(pipeline, RemotePipeline):
+        return await asyncio.wrap_future(pipeline.submit(image, timings))
+    return await loop.run_in_executor(inference_executor, pipeline.predict, image, timings)
 
 @app.get("/")
 def home():
     return {"message": "Housepital-AI Inference API is Running"}
 
+@app.get("/live")
+def liveness():
+    """Liveness: the process is up. Fails only if model loading failed, so the replica gets restarted."""
+    if load_error:
+        return JSONResponse({"status": "failed", "error": load_error}, status_code=503)
+    return {"status": "alive"}
+
+@app.get("/ready")
+def readiness():
+    """Readiness: 200 once all eagerly loaded stages are in (lazy stages load on first use), 503 before."""
+    stages = loading_pipeline.stage_status if loading_pipeline else {}
+    body = {
+        "stages": stages,
+        "load_seconds": loading_pipeline.load_seconds if loading_pipeline else {},
+    }
+    if pipeline and pipeline.ready:
+        return {"status": "ready", **body}
+    body["status"] = "failed" if load_error else "loading"
+    if load_error:
+        body["error"] = load_error
+    elif load_started_at is not None:
+        body["loading_for_s"] = round(time.perf_counter() - load_started_at, 2)
+    return JSONResponse(body, status_code=503)
+
 @app.get("/health")
 def health_check():
     if pipeline:
-        return {"status": "healthy", "gpu": torch.cuda.is_available()}
+        return {
+            "status": "healthy",
+            "gpu": torch.cuda.is_available(),
+            "backend": pipeline.backend,
+            "precision": pipeline.precision,
+            "batching": batcher.stats() if batcher else None,
+            "inference_server": INFERENCE_SERVER,
+            "model_version": pipeline.model_version,
+            "stages": pipeline.stage_status,
+            "result_cache": result_cache.stats() if result_cache else None,
+            "inference": {
+                "workers": INFERENCE_WORKERS,
+                "pending": pending_requests,
+                "max_pending": MAX_PENDING_REQUESTS,
+                "rejected": rejected_requests,
+                "timed_out": timed_out_requests
+            }
+        }
     return {"status": "loading_or_failed"}
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint: per-stage latency histograms, cascade exit counters, request outcomes."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
 @app.post("/predict")
-async def predict_image(file: UploadFile = File(...)):
+async def predict_image(file: UploadFile = File(...), debug: bool = False, validate: Optional[bool] = None):
+    """
+    Runs the wound pipeline on one upload. With `?debug=true` the response also
+    carries `timings_ms` (decode, preprocess, stage0..stage3, batch_size).
+    Every response has a Server-Timing header, serialization included.
+    With `?validate=true` the upload is quality-checked first (422 if rejected).
+    """
     global pipeline
     if not pipeline:
         raise HTTPException(status_code=503, detail="Model pipeline not initialized")
+    validate = _resolve_validate(validate)
 
     print(f"📷 Received file: {file.filename}, content_type: {file.content_type}")
     
     # Validate Content Type - be more flexible
-    valid_types = ["image/jpeg", "image/png", "image/jpg", "application/octet-stream"]
-    if file.content_type and file.content_type not in valid_types:
+    if file.content_type and file.content_type not in VALID_CONTENT_TYPES:
         print(f"❌ Invalid content type: {file.content_type}")
         raise HTTPException(status_code=400, detail=f"Invalid file type: {file.content_type}. Only JPEG/PNG supported.")
 
+    request_start = time.perf_counter()
+    outcome = "error"
     try:
         # Read Image
         contents = await file.read()
         print(f"📦 Read {len(contents)} bytes")
-        image = Image.open(io.BytesIO(contents)).convert("RGB")
-        print(f"🖼️ Image size: {image.size}")
         
-        # Run Inference
-        import numpy as np
-        img_arr = np.array(image)
-        
-        results = pipeline.predict(img_arr)
+        # Re-submitted photo? Serve it from the cache
+        timings = {}
+        cache_key = None
+        results = None
+        if result_cache:
+            # Validated results are cached separately: a hit there means the bytes passed validation
+            cache_key = result_cache.key(contents, namespace="validated" if validate else "")
+            results = await cache_lookup(cache_key)
+            if results is not None:
+                outcome = "cache_hit"
+                print("♻️ Result cache hit")
+
+        if results is None:
+            # Run Inference (off the event loop)
+            results = await run_inference(contents, timings, validate)
+            outcome = "ok"
+            if result_cache:
+                cache_store(cache_key, results)
         print(f"✅ Prediction: {results.get('final_verdict', 'unknown')}")
         
         # Add filename to result
         results['filename'] = file.filename
-        
-        return results
+        if debug:
+            results['timings_ms'] = _timings_ms(timings)
+
+        serialize_start = time.perf_counter()
+        response = JSONResponse(results)
+        timings["serialization"] = time.perf_counter() - serialize_start
+        STAGE_SECONDS.observe(timings["serialization"], stage="serialization")
+        response.headers["Server-Timing"] = ", ".join(
+            f"{stage};dur={value * 1000:.2f}" for stage, value in timings.items() if stage != "batch_size"
+        )
+        return response
 
+    except HTTPException as e:
+        outcome = {422: "invalid", 503: "rejected", 504: "timed_out"}.get(e.status_code, "error")
+        raise
     except Exception as e:
         print(f"Error processing image: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        REQUESTS.inc(outcome=outcome)
+        REQUEST_SECONDS.observe(time.perf_counter() - request_start, outcome=outcome)
+
+@app.post("/predict/batch")
+async def predict_batch_images(files: List[UploadFile] = File(...), validate: Optional[bool] = None):
+    """
+    Runs a whole session of photos through the pipeline as one batch and streams
+    NDJSON: one line per image, written as soon as that image's cascade completes
+    (so Stage 0 rejects / healthy skin arrive before the wound-type results):
+        {"index": 0, "filename": "...", "stage0": ..., "final_verdict": ...}
+        {"index": 1, "filename": "...", "error": "..."}
+    A bad file (wrong type, undecodable, or rejected by `?validate=true`) only produces
+    an error line for itself; the rest of the batch still runs.
+    """
+    global rejected_requests
+    if not pipeline:
+        raise HTTPException(status_code=503, detail="Model pipeline not initialized")
+    validate = _resolve_validate(validate)
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"Too many files: {len(files)} (max {BATCH_MAX_FILES})")
+
+    print(f"📷 Received batch of {len(files)} files")
+
+    # Per-file checks and cache lookups happen up front; those lines are streamed first
+    ready_lines = []
+    to_run = []  # (index, filename, contents, cache_key)
+    for index, file in enumerate(files):
+        if file.content_type and file.content_type not in VALID_CONTENT_TYPES:
+            ready_lines.append({"index": index, "filename": file.filename,
+                                "error": f"Invalid file type: {file.content_type}. Only JPEG/PNG supported."})
+            continue
+        contents = await file.read()
+        cache_key = result_cache.key(contents, namespace="validated" if validate else "") if result_cache else None
+        cached = await cache_lookup(cache_key) if result_cache else None
+        if cached is not None:
+            ready_lines.append({"index": index, **cached, "filename": file.filename})
+            REQUESTS.inc(outcome="cache_hit")
+        else:
+            to_run.append((index, file.filename, contents, cache_key))
+
+    # Admission control counts every image that needs inference (slots are taken in _stream_batch)
+    if to_run and pending_requests + len(to_run) > MAX_PENDING_REQUESTS:
+        rejected_requests += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Inference queue is full. Please retry later.",
+            headers={"Retry-After": str(RETRY_AFTER_S)}
+        )
+
+    return StreamingResponse(_stream_batch(ready_lines, to_run, validate), media_type="application/x-ndjson")
+
+async def _stream_batch(ready_lines, to_run, validate):
+    global pending_requests, rejected_requests, timed_out_requests
+    for line in ready_lines:
+        yield json.dumps(line) + "\n"
+    if not to_run:
+        return
+
+    # Slots are taken once streaming starts, so a client gone before then holds none.
+    # Checked again: other requests may have been admitted since the handler returned.
+    if pending_requests + len(to_run) > MAX_PENDING_REQUESTS:
+        rejected_requests += 1
+        for index, filename, _, _ in to_run:
+            REQUESTS.inc(outcome="rejected")
+            yield json.dumps({"index": index, "filename": filename, "error": "Inference queue is full. Please retry later."}) + "\n"
+        return
+    pending_requests += len(to_run)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + REQUEST_DEADLINE_S
+    # Decode + cascade run as a task that outlives this generator (deadline, client disconnect),
+    # and the slots go back when it finishes, i.e. when the executor is done with the batch
+    lines = asyncio.Queue()
+    work = asyncio.ensure_future(_run_batch(to_run, validate, deadline, lines))
+    work.add_done_callback(functools.partial(_release_slots, count=len(to_run)))
+
+    remaining = {index: filename for index, filename, _, _ in to_run}
+    while remaining:
+        try:
+            outcome, line = await asyncio.wait_for(lines.get(), timeout=max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            timed_out_requests += 1
+            for index in sorted(remaining):
+                REQUESTS.inc(outcome="error")
+                yield json.dumps({"index": index, "filename": remaining[index],
+                                  "error": f"Inference exceeded the {REQUEST_DEADLINE_S:g}s deadline"}) + "\n"
+            break
+        del remaining[line["index"]]
+        REQUESTS.inc(outcome=outcome)
+        yield json.dumps(line) + "\n"
+
+async def _run_batch(to_run, validate, deadline, lines):
+    """
+    Work side of /predict/batch: puts one (outcome, line) pair on `lines` per image.
+    Only returns once every executor job it started has finished.
+    """
+    loop = asyncio.get_running_loop()
+
+    # Decode all uploads concurrently; an undecodable file becomes an error line
+    decoded = await asyncio.gather(
+        *(loop.run_in_executor(inference_executor, decode_upload, contents, None, validate) for _, _, contents, _ in to_run),
+        return_exceptions=True
+    )
+    batch = []  # (index, filename, cache_key) of the images in the pipeline batch, in batch order
+    images = []
+    for (index, filename, _, cache_key), image in zip(to_run, decoded):
+        if isinstance(image, HTTPException):
+            # Rejected by the validator: same error body as /predict
+            lines.put_nowait(("invalid", {"index": index, "filename": filename, "error": image.detail}))
+        elif isinstance(image, Exception):
+            lines.put_nowait(("error", {"index": index, "filename": filename, "error": f"Could not decode image: {image}"}))
+        else:
+            batch.append((index, filename, cache_key))
+            images.append(image)
+    if not images or loop.time() >= deadline:
+        return  # nothing to run, or the response has already timed these images out
+
+    # The cascade runs in the inference executor and hands each finished image over as it completes
+    queue = asyncio.Queue()
+    loop.run_in_executor(inference_executor, _run_batch_iter, images, loop, queue)
+    remaining = set(range(len(batch)))
+    while True:
+        item = await queue.get()
+        if item is None:
+            break
+        if isinstance(item, Exception):
+            for row in sorted(remaining):
+                index, filename, _ = batch[row]
+                lines.put_nowait(("error", {"index": index, "filename": filename, "error": str(item)}))
+            remaining.clear()
+            continue
+
+        row, result = item
+        remaining.discard(row)
+        index, filename, cache_key = batch[row]
+        if result_cache:
+            cache_store(cache_key, result)
+        print(f"✅ [{index}] Prediction: {result.get('final_verdict', 'unknown')}")
+        lines.put_nowait(("ok", {"index": index, **result, "filename": filename}))
+
+def _run_batch_iter(images, loop, queue):
+    """Executor side of /predict/batch: push (row, result) pairs, an exception, then None."""
+    try:
+        for item in pipeline.predict_batch_iter(images):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+    except Exception as e:
+        print(f"Error processing batch: {e}")
+        loop.call_soon_threadsafe(queue.put_nowait, e)
+    finally:
+        loop.call_soon_threadsafe(queue.put_nowait, None)
+
+def _timings_ms(timings):
+    return {stage: (value if stage == "batch_size" else round(value * 1000, 3)) for stage, value in timings.items()}
 
 if __name__ == "__main__":
     uvicorn.run("api:app", host="localhost", port=8000, reload=True)
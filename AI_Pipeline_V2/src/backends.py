@@ -0,0 +1,73 @@
+import torch
+from pathlib import Path
+
+# Execution backends for the EfficientNet stages
+#   torch       -> eager timm model (default)
+#   onnx        -> ONNX Runtime on CPU, graph exported by export_onnx.py
+#   torchscript -> traced TorchScript module exported by export_onnx.py
+BACKENDS = ('torch', 'onnx', 'torchscript')
+
+BACKEND_SUFFIX = {
+    'onnx': '.onnx',
+    'torchscript': '.torchscript',
+}
+
+# Weight precisions. INT8 models are produced by quantize_int8.py and only exist for ONNX.
+PRECISIONS = ('fp32', 'int8')
+
+
+def exported_path(checkpoint_path, backend, precision='fp32'):
+    """
+    Where export_onnx.py (fp32) / quantize_int8.py (int8) write the exported graph
+    for a given .pth/.pt checkpoint, e.g. best_model.onnx / best_model.int8.onnx.
+    """
+    suffix = BACKEND_SUFFIX[backend]
+    if precision != 'fp32':
+        suffix = f".{precision}{suffix}"
+    return Path(checkpoint_path).with_suffix(suffix)
+
+
+class OnnxModel:
+    """
+    Callable wrapper around an ONNX Runtime session that behaves like an eval-mode
+    torch module: takes an NCHW float tensor and returns the logits as a tensor.
+    """
+
+    def __init__(self, path, intra_op_threads=None):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("Install onnxruntime to use the ONNX backend: pip install onnxruntime")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.path = Path(path)
+        self.session = ort.InferenceSession(str(path), options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, x):
+        outputs = self.session.run(None, {self.input_name: x.detach().cpu().numpy()})
+        return torch.from_numpy(outputs[0])
+
+    # Keep the torch module API used by InferencePipeline
+    def to(self, device):
+        return self
+
+    def eval(self):
+        return self
+
+
+def load_exported_model(checkpoint_path, backend, device, precision='fp32'):
+    """Load the exported counterpart of `checkpoint_path` for a non-eager backend."""
+    path = exported_path(checkpoint_path, backend, precision)
+    if not path.exists():
+        hint = "python quantize_int8.py" if precision == 'int8' else f"python export_onnx.py --format {backend}"
+        raise FileNotFoundError(f"{backend} ({precision}) export not found at {path}. Run: {hint}")
+    if backend == 'onnx':
+        return OnnxModel(path)
+    if backend == 'torchscript':
+        return torch.jit.load(str(path), map_location=device).eval()
+    raise ValueError(f"Unknown backend '{backend}'. Expected one of {BACKENDS}")
@@ -0,0 +1,46 @@
+import argparse
+from pathlib import Path
+
+import torch
+
+from weights import safetensors_path, load_weights
+from inference_pipeline import STAGE1_MODEL_PATH, STAGE2_MODEL_PATH, STAGE3_MODEL_PATH, MULTIHEAD_MODEL_PATH
+
+# Stage 0 stays a .pt: Ultralytics loads its own checkpoint format.
+STAGES = [
+    ("Stage 1 (Binary)", STAGE1_MODEL_PATH),
+    ("Stage 2 (Wound Type)", STAGE2_MODEL_PATH),
+    ("Stage 3 (DFU Severity)", STAGE3_MODEL_PATH),
+]
+
+
+def convert(name, checkpoint):
+    """Write <checkpoint>.safetensors next to the .pth; InferencePipeline memory-maps it when present."""
+    try:
+        from safetensors.torch import save_file
+    except ImportError:
+        raise ImportError("Install safetensors to convert checkpoints: pip install safetensors")
+
+    if not Path(checkpoint).exists():
+        print(f"⚠️ {name} checkpoint not found at {checkpoint}. Skipping.")
+        return
+    state_dict, metadata = load_weights(checkpoint, map_location='cpu', mmap_weights=False)
+    # safetensors refuses shared/non-contiguous storage; give every tensor its own contiguous copy
+    tensors = {k: v.detach().contiguous().clone() for k, v in state_dict.items() if isinstance(v, torch.Tensor)}
+    out_path = safetensors_path(checkpoint)
+    save_file(tensors, str(out_path), metadata={**metadata, 'source': Path(checkpoint).name})
+
+    size_mb = out_path.stat().st_size / 1e6
+    print(f"✅ {name}: {len(tensors)} tensors -> {out_path} ({size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert .pth stage checkpoints to memory-mappable .safetensors")
+    parser.add_argument("--multihead", type=str, default=None,
+                        help=f"Also convert a multi-head checkpoint (e.g. {MULTIHEAD_MODEL_PATH})")
+    args = parser.parse_args()
+
+    for name, checkpoint in STAGES:
+        convert(name, checkpoint)
+    if args.multihead:
+        convert("Multi-head", args.multihead)
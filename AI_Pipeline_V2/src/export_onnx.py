@@ -0,0 +1,91 @@
+import argparse
+from pathlib import Path
+
+import torch
+import timm
+from ultralytics import YOLO
+
+from backends import exported_path
+from inference_pipeline import STAGE0_MODEL_PATH, STAGE1_MODEL_PATH, STAGE2_MODEL_PATH, STAGE3_MODEL_PATH, MULTIHEAD_MODEL_PATH, TIMM_STAGES
+from multihead_model import SharedBackboneMultiHead, load_checkpoint_state
+
+# Config
+CONFIG = {
+    "img_size": 224,
+    "opset": 17,
+}
+
+CHECKPOINTS = {
+    'stage1': STAGE1_MODEL_PATH,
+    'stage2': STAGE2_MODEL_PATH,
+    'stage3': STAGE3_MODEL_PATH,
+}
+
+
+def export_module(model, out_path, fmt):
+    """Export an eval-mode module taking (N, 3, 224, 224) with a dynamic batch axis."""
+    model.eval()
+    dummy = torch.randn(2, 3, CONFIG['img_size'], CONFIG['img_size'])
+
+    if fmt == 'onnx':
+        torch.onnx.export(
+            model, dummy, str(out_path),
+            input_names=['input'],
+            output_names=['output'],
+            dynamic_axes={'input': {0: 'batch'}, 'output': {0: 'batch'}},
+            opset_version=CONFIG['opset'],
+            do_constant_folding=True,
+        )
+    else:
+        with torch.no_grad():
+            traced = torch.jit.trace(model, dummy)
+        traced = torch.jit.freeze(traced)
+        traced.save(str(out_path))
+
+
+def export_stage0(fmt):
+    if not STAGE0_MODEL_PATH.exists():
+        print(f"⚠️ Stage 0 Model not found at {STAGE0_MODEL_PATH}. Skipping.")
+        return
+    model = YOLO(str(STAGE0_MODEL_PATH))
+    # Ultralytics writes best.onnx / best.torchscript next to best.pt
+    exported = model.export(format=fmt, dynamic=True, imgsz=CONFIG['img_size'], simplify=(fmt == 'onnx'))
+    print(f"✅ Stage 0 (YOLOv11) exported to {exported}")
+
+
+def export_timm_stages(fmt):
+    # Same architectures as InferencePipeline loads (TIMM_STAGES is shared)
+    for stage, (stage_name, task, model_name, num_classes) in TIMM_STAGES.items():
+        name, checkpoint = f"{stage_name} ({task})", CHECKPOINTS[stage]
+        if not checkpoint.exists():
+            print(f"⚠️ {name} checkpoint not found at {checkpoint}. Skipping.")
+            continue
+        model = timm.create_model(model_name, pretrained=False, num_classes=num_classes)
+        model.load_state_dict(load_checkpoint_state(checkpoint))
+        out_path = exported_path(checkpoint, fmt)
+        export_module(model, out_path, fmt)
+        print(f"✅ {name} exported to {out_path}")
+
+
+def export_multihead(fmt, multihead_path):
+    """Only the shared backbone is exported; the linear heads run eagerly."""
+    if not Path(multihead_path).exists():
+        print(f"⚠️ Multi-head checkpoint not found at {multihead_path}. Skipping.")
+        return
+    model = SharedBackboneMultiHead.from_checkpoint(multihead_path)
+    out_path = exported_path(multihead_path, fmt)
+    export_module(model.backbone, out_path, fmt)
+    print(f"✅ Multi-head backbone exported to {out_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export pipeline stages for the ONNX Runtime / TorchScript backends")
+    parser.add_argument("--format", choices=['onnx', 'torchscript'], default='onnx')
+    parser.add_argument("--multihead", type=str, default=None,
+                        help=f"Also export a multi-head checkpoint (e.g. {MULTIHEAD_MODEL_PATH})")
+    args = parser.parse_args()
+
+    export_stage0(args.format)
+    export_timm_stages(args.format)
+    if args.multihead:
+        export_multihead(args.format, args.multihead)
@@ -1,11 +1,18 @@
 
 import cv2
 import torch
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from PIL import Image
 from pathlib import Path
 from ultralytics import YOLO
 import timm
+from preprocessing import DecodedImage, batch_tensor
+from metrics import StageTimer, BATCH_SIZE, CASCADE_EXITS
+from backends import BACKENDS, PRECISIONS, exported_path, load_exported_model
+from weights import load_weights, build_with_weights, safetensors_path
 
 
 # Config
@@ -15,164 +22,410 @@ STAGE0_MODEL_PATH = BASE_PATH / "models/stage0_yolo_v11/weights/best.pt"
 STAGE1_MODEL_PATH = BASE_PATH / "models/stage1_binary/best_model_fold_0.pth"
 STAGE2_MODEL_PATH = BASE_PATH / "models/stage2_type/best_model.pth"
 STAGE3_MODEL_PATH = BASE_PATH / "models/stage3_severity/best_model.pth"
+MULTIHEAD_MODEL_PATH = BASE_PATH / "models/multihead/best_model.pth"
 
 # Stage 2 Classes (Must match training order)
 STAGE2_CLASSES = ['abrasion', 'bruise', 'burn', 'cut', 'diabetic_foot', 'laceration', 'surgical']
 STAGE3_CLASSES = ['grade_1', 'grade_2', 'grade_3', 'grade_4']
 
+# Stage 1-3 EfficientNets: stage -> (name, task, timm model, num_classes). Also drives export_onnx.py
+TIMM_STAGES = {
+    'stage1': ("Stage 1", "Binary", 'tf_efficientnet_b0_ns', 1),
+    'stage2': ("Stage 2", "Wound Type", 'tf_efficientnet_b0', len(STAGE2_CLASSES)),
+    'stage3': ("Stage 3", "DFU Severity", 'tf_efficientnet_b0', len(STAGE3_CLASSES)),
+}
+
 class InferencePipeline:
-    def __init__(self, stage0_path=None, stage1_path=None, stage2_path=None, stage3_path=None):
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        
+    STAGES = ('stage0', 'stage1', 'stage2', 'stage3')
+
+    def __init__(self, stage0_path=None, stage1_path=None, stage2_path=None, stage3_path=None, multihead_path=None,
+                 backend='torch', precision='fp32', lazy_stages=False, load_workers=4, autoload=True, mmap_weights=True):
+        """
+        Args:
+            stage0_path..stage3_path: Optional overrides for the per-stage checkpoints.
+            multihead_path: Optional shared-backbone checkpoint (see multihead_train.py).
+                            When given, Stages 1-3 run as heads on one backbone pass
+                            instead of three separate EfficientNets.
+            backend: 'torch' (eager), 'onnx' (ONNX Runtime, CPU) or 'torchscript'.
+                     Non-eager backends load the files written by export_onnx.py.
+            precision: 'fp32' or 'int8'. INT8 loads the Stage 1-3 models written by
+                       quantize_int8.py and requires backend='onnx' (Stage 0 stays FP32).
+                       Not available with multihead_path (quantize_int8.py does not
+                       quantize the shared backbone).
+            lazy_stages: Load Stage 2/3 on the first image that reaches them instead of
+                         at startup (ignored with multihead_path, the heads share one file).
+            load_workers: Models are loaded concurrently on this many threads.
+            autoload: Set to False to construct without loading, then call `load()`
+                      (e.g. from a background thread while `stage_status` is polled).
+            mmap_weights: Memory-map the .safetensors conversion of a Stage 1-3 / multi-head
+                          checkpoint when it exists (convert_safetensors.py), so worker
+                          processes share the weight pages. Falls back to torch.load.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Expected one of {BACKENDS}")
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}'. Expected one of {PRECISIONS}")
+        if precision == 'int8' and backend != 'onnx':
+            raise ValueError("INT8 models are only available with backend='onnx'")
+        if precision == 'int8' and multihead_path:
+            raise ValueError("INT8 is not available for the multi-head model; use precision='fp32'")
+        self.backend = backend
+        self.precision = precision
+        self.device = torch.device('cuda' if torch.cuda.is_available() and backend != 'onnx' else 'cpu')
+        self.lazy_stages = lazy_stages and not multihead_path
+        self.load_workers = max(1, int(load_workers))
+        self.mmap_weights = mmap_weights
+
+        self.multihead_path = multihead_path
+        self.checkpoint_paths = {
+            'stage0': Path(stage0_path if stage0_path else STAGE0_MODEL_PATH),
+            'stage1': Path(stage1_path if stage1_path else STAGE1_MODEL_PATH),
+            'stage2': Path(stage2_path if stage2_path else STAGE2_MODEL_PATH),
+            'stage3': Path(stage3_path if stage3_path else STAGE3_MODEL_PATH),
+        }
+
+        # Stages 1-3 consume `feature_extractor(img_tensor)` when it is set (shared backbone),
+        # otherwise the image tensor directly.
+        self.feature_extractor = None
+        self.multihead_model = None
+        self.stage0_model = self.stage1_model = self.stage2_model = self.stage3_model = None
+
+        # Per-stage load state: pending -> loading -> loaded | missing | failed ('lazy' until first use)
+        self.stage_status = {stage: 'pending' for stage in self.STAGES}
+        self.load_seconds = {}
+        self.model_version = None
+        self._lazy_lock = threading.Lock()
+
+        if autoload:
+            self.load()
+
+    @property
+    def ready(self):
+        """True once every eagerly loaded stage is in and none failed (Stage 2/3 may be missing or lazy)."""
+        return self.model_version is not None and 'failed' not in self.stage_status.values()
+
+    def load(self):
+        """
+        Loads all (non-lazy) models concurrently and waits for them. Stage 0 and Stage 1
+        are required; the first load error is re-raised after the other loads finish.
+        """
+        with ThreadPoolExecutor(max_workers=self.load_workers, thread_name_prefix="model-load") as pool:
+            futures = [pool.submit(self._load_stage, 'stage0', self._load_stage0)]
+            if self.multihead_path:
+                futures.append(pool.submit(self._load_multihead, self.multihead_path))
+            else:
+                futures.append(pool.submit(self._load_stage, 'stage1', self._load_stage1))
+                for stage in ('stage2', 'stage3'):
+                    if self.lazy_stages:
+                        self.stage_status[stage] = 'lazy'
+                    else:
+                        futures.append(pool.submit(self._load_stage, stage, self._load_optional_stage, stage))
+            for future in futures:
+                future.result()
+
+        # Identifies the loaded weights + execution mode (used e.g. as part of result cache keys)
+        self.model_version = self._model_version()
+        return self
+
+    def _load_stage(self, stage, load_fn, *args):
+        """Run one loader, keeping `stage_status` / `load_seconds` up to date."""
+        self.stage_status[stage] = 'loading'
+        start = time.perf_counter()
+        try:
+            model = load_fn(*args)
+        except Exception:
+            self.stage_status[stage] = 'failed'
+            raise
+        setattr(self, f"{stage}_model", model)
+        self.load_seconds[stage] = time.perf_counter() - start
+        self.stage_status[stage] = 'loaded' if model is not None else 'missing'
+        return model
+
+    def _stage_model(self, stage):
+        """Stage 2/3 model, loaded on first use when lazy. None if its checkpoint is missing."""
+        if self.stage_status[stage] in ('lazy', 'loading'):
+            with self._lazy_lock:
+                if self.stage_status[stage] == 'lazy':
+                    self._load_stage(stage, self._load_optional_stage, stage)
+        if self.stage_status[stage] == 'failed':
+            raise RuntimeError(f"{stage} failed to load")
+        return getattr(self, f"{stage}_model")
+
+    def _model_version(self):
+        """Short fingerprint of backend, precision and the model files (name, size, mtime)."""
+        if self.multihead_path:
+            checkpoints = [(self.checkpoint_paths['stage0'], 'fp32'), (Path(self.multihead_path), self.precision)]
+        else:
+            checkpoints = [(self.checkpoint_paths['stage0'], 'fp32')] + [
+                (self.checkpoint_paths[stage], self.precision) for stage in ('stage1', 'stage2', 'stage3')
+            ]
+        files = [path for path, _ in checkpoints]
+        if self.backend == 'torch' and self.mmap_weights:
+            files = [safetensors_path(path) if safetensors_path(path).exists() else path for path in files]
+        if self.backend != 'torch':
+            files = [exported_path(path, self.backend, precision) for path, precision in checkpoints]
+
+        digest = hashlib.sha1(f"{self.backend}/{self.precision}".encode())
+        for path in files:
+            if path.exists():
+                stat = path.stat()
+                digest.update(f"|{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()[:12]
+
+    def _load_stage0(self):
         # Load Stage 0 (YOLOv11)
-        s0_path = stage0_path if stage0_path else STAGE0_MODEL_PATH
-        if not Path(s0_path).exists():
+        s0_path = self.checkpoint_paths['stage0']
+        if not s0_path.exists():
             raise FileNotFoundError(f"Stage 0 Model not found at {s0_path}")
-        self.stage0_model = YOLO(s0_path)
+        if self.backend != 'torch':
+            # Ultralytics runs exported .onnx / .torchscript files through the same YOLO API
+            s0_path = exported_path(s0_path, self.backend)
+            if not s0_path.exists():
+                raise FileNotFoundError(f"Stage 0 {self.backend} export not found at {s0_path}. Run: python export_onnx.py --format {self.backend}")
+        model = YOLO(str(s0_path), task='classify')
         print(f"✅ Stage 0 (YOLOv11) Loaded on {self.device}")
-        
+        return model
+
+    def _load_multihead(self, multihead_path):
+        from multihead_model import SharedBackboneMultiHead
+        heads = ('stage1', 'stage2', 'stage3')
+        for stage in heads:
+            self.stage_status[stage] = 'loading'
+        start = time.perf_counter()
+        try:
+            if not Path(multihead_path).exists():
+                raise FileNotFoundError(f"Multi-head Model not found at {multihead_path}")
+            model = SharedBackboneMultiHead.from_checkpoint(multihead_path, map_location=self.device, mmap_weights=self.mmap_weights)
+            model.to(self.device).eval()
+            self.multihead_model = model
+            if self.backend != 'torch':
+                # Only the backbone is exported, the linear heads stay eager
+                self.feature_extractor = load_exported_model(multihead_path, self.backend, self.device, self.precision)
+            else:
+                self.feature_extractor = model.backbone
+        except Exception:
+            for stage in heads:
+                self.stage_status[stage] = 'failed'
+            raise
+        self.stage1_model = model.wound_head
+        self.stage2_model = model.type_head
+        self.stage3_model = model.severity_head
+        for stage in heads:
+            self.load_seconds[stage] = time.perf_counter() - start
+            self.stage_status[stage] = 'loaded'
+        print(f"✅ Stages 1-3 (Shared-Backbone Multi-Head) Loaded on {self.device}")
+
+    def _load_stage1(self):
         # Load Stage 1 (EfficientNet Binary)
-        s1_path = stage1_path if stage1_path else STAGE1_MODEL_PATH
-        if not Path(s1_path).exists():
+        s1_path = self.checkpoint_paths['stage1']
+        if not s1_path.exists():
             raise FileNotFoundError(f"Stage 1 Model not found at {s1_path}")
-        
-        self.stage1_model = timm.create_model('tf_efficientnet_b0_ns', pretrained=False, num_classes=1)
-        s1_checkpoint = torch.load(s1_path, map_location=self.device)
-        if isinstance(s1_checkpoint, dict) and 'model_state_dict' in s1_checkpoint:
-            self.stage1_model.load_state_dict(s1_checkpoint['model_state_dict'])
-        else:
-            self.stage1_model.load_state_dict(s1_checkpoint)
-        self.stage1_model.to(self.device)
-        self.stage1_model.eval()
-        print(f"✅ Stage 1 (EfficientNet Binary) Loaded on {self.device}")
-        
-        # Load Stage 2 (EfficientNet Multi-class)
-        s2_path = stage2_path if stage2_path else STAGE2_MODEL_PATH
-        if not Path(s2_path).exists():
-             print(f"⚠️ Stage 2 Model not found at {s2_path}. Running without Stage 2.")
-             self.stage2_model = None
-        else:
-            self.stage2_model = timm.create_model('tf_efficientnet_b0', pretrained=False, num_classes=len(STAGE2_CLASSES))
-            s2_checkpoint = torch.load(s2_path, map_location=self.device)
-            # Stage 2 saved state dict directly usually, but let's handle both
-            if isinstance(s2_checkpoint, dict) and 'model_state_dict' in s2_checkpoint:
-                self.stage2_model.load_state_dict(s2_checkpoint['model_state_dict'])
-            else:
-                self.stage2_model.load_state_dict(s2_checkpoint)
-            
-            self.stage2_model.to(self.device).eval()
-            print(f"✅ Stage 2 (Wound Type) Loaded on {self.device}")
-
-        # Load Stage 3 (DFU Severity - EfficientNet-B0)
-        s3_path = stage3_path if stage3_path else STAGE3_MODEL_PATH
-        if not Path(s3_path).exists():
-             print(f"⚠️ Stage 3 Model not found at {s3_path}. Running without Stage 3.")
-             self.stage3_model = None
-        else:
-            self.stage3_model = timm.create_model('tf_efficientnet_b0', pretrained=False, num_classes=len(STAGE3_CLASSES))
-            s3_checkpoint = torch.load(s3_path, map_location=self.device)
-            if isinstance(s3_checkpoint, dict) and 'model_state_dict' in s3_checkpoint:
-                self.stage3_model.load_state_dict(s3_checkpoint['model_state_dict'])
-            else:
-                self.stage3_model.load_state_dict(s3_checkpoint)
-            
-            self.stage3_model.to(self.device).eval()
-            print(f"✅ Stage 3 (DFU Severity) Loaded on {self.device}")
-        
-        # Common Transforms
-        import torchvision.transforms as T
-        self.common_transform = T.Compose([
-            T.Resize((224, 224)),
-            T.ToTensor(),
-            T.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
-        ])
-
-    def predict(self, image_path_or_array):
+        _, _, model_name, num_classes = TIMM_STAGES['stage1']
+        model = self._load_timm_stage(s1_path, model_name, num_classes)
+        print(f"✅ Stage 1 (EfficientNet Binary) Loaded on {self.device} [{self.backend}/{self.precision}]")
+        return model
+
+    def _load_optional_stage(self, stage):
+        """Stage 2 (Wound Type) or Stage 3 (DFU Severity). Returns None when the checkpoint is missing."""
+        name, task, model_name, num_classes = TIMM_STAGES[stage]
+        path = self.checkpoint_paths[stage]
+        if not path.exists():
+            print(f"⚠️ {name} Model not found at {path}. Running without {name}.")
+            return None
+        model = self._load_timm_stage(path, model_name, num_classes)
+        print(f"✅ {name} ({task}) Loaded on {self.device} [{self.backend}/{self.precision}]")
+        return model
+
+    def _load_timm_stage(self, checkpoint_path, model_name, num_classes):
+        """Load one EfficientNet stage with the configured backend."""
+        if self.backend != 'torch':
+            return load_exported_model(checkpoint_path, self.backend, self.device, self.precision)
+
+        # .safetensors (memory-mapped) when converted, else the .pth (raw state dict or 'model_state_dict')
+        state_dict, _ = load_weights(checkpoint_path, self.device, self.mmap_weights)
+        model = build_with_weights(lambda: timm.create_model(model_name, pretrained=False, num_classes=num_classes), state_dict)
+        return model.to(self.device).eval()
+
+    def predict(self, image_path_or_array, timings=None):
         """
         Runs the full pipeline:
         Image -> Stage 0 -> (If Relevant) -> Stage 1 -> (If Wound) -> Stage 2 -> (If DFU) -> Stage 3 -> Result
         """
-        results = {}
-        
-        # 1. Preprocessing (Handle path or numpy/PIL)
-        if isinstance(image_path_or_array, (str, Path)):
-            img_src = str(image_path_or_array)
-            img_pil = Image.open(image_path_or_array).convert('RGB')
-        else:
-            img_src = image_path_or_array # For YOLO
-            img_pil = Image.fromarray(image_path_or_array).convert('RGB')
-            
-        # --- STAGE 0: VALIDATION ---
-        # YOLO inference
-        yolo_res = self.stage0_model(img_src, verbose=False)[0]
-        top1_idx = yolo_res.probs.top1
-        s0_class = yolo_res.names[top1_idx]
-        s0_conf = yolo_res.probs.top1conf.item()
-        
-        results['stage0'] = {
-            'class': s0_class,
-            'confidence': s0_conf,
-            'is_relevant': s0_class in ['wound', 'skin', 'diabetic_foot', 'healthy'] # Adjust based on actual YOLO classes
-        }
-        
-        if not results['stage0']['is_relevant'] and s0_class != 'diabetic_foot': # Example override
-            results['final_verdict'] = f"Irrelevant ({s0_class})"
-            return results
-            
-        # --- STAGE 1: TRIAGE (Binary) ---
-        # Prepare for EfficientNet
-        img_tensor = self.common_transform(img_pil).unsqueeze(0).to(self.device)
-        
-        with torch.no_grad():
-            s1_out = self.stage1_model(img_tensor)
-            prob = torch.sigmoid(s1_out).item()
-            
-        is_wound = prob > 0.5
-        results['stage1'] = {
-            'probability': prob,
-            'is_wound': is_wound
-        }
-        
-        if not is_wound:
-            results['final_verdict'] = "Healthy Skin"
-            return results
-            
-        # --- STAGE 2: WOUND TYPE (Multi-class) ---
-        wound_type = "unknown"
-        if self.stage2_model:
-            with torch.no_grad():
-                s2_out = self.stage2_model(img_tensor)
-                s2_probs = torch.softmax(s2_out, dim=1)[0]
-                top1_idx = torch.argmax(s2_probs).item()
-                top1_prob = s2_probs[top1_idx].item()
-                
+        return self.predict_batch([image_path_or_array], timings)[0]
+
+    def predict_batch(self, images, timings=None):
+        """
+        Runs the full pipeline on a list of images at once. Each image may be a path,
+        raw bytes, a PIL image, an RGB numpy array or a preprocessing.DecodedImage.
+
+        Stage 0 runs on the whole batch, then each later stage only receives the
+        subset that survived the previous one (relevant -> wound -> diabetic_foot),
+        so every stage runs a single forward pass on the largest batch it can.
+        Each per-image result dict has exactly the same schema as `predict`.
+
+        Per-stage wall times are exported to the metrics registry; pass a dict as
+        `timings` to also receive them ({stage: seconds}, for the whole batch).
+
+        Returns a list of result dicts, in the same order as `images`.
+        """
+        batch_results = [None] * len(images)
+        for i, result in self.predict_batch_iter(images, timings):
+            batch_results[i] = result
+        return batch_results
+
+    def predict_batch_iter(self, images, timings=None):
+        """
+        Same batched cascade as `predict_batch`, as a generator of (index, result) pairs.
+        Each image is yielded as soon as its cascade ends, so the Stage 0 rejects come
+        out before Stage 1 runs, the healthy-skin results before Stage 2, and so on.
+        `timings` is filled once the generator is exhausted.
+        """
+        if len(images) == 0:
+            return
+
+        timer = StageTimer()
+        try:
+            for i, result in self._predict_batch(images, timer):
+                CASCADE_EXITS.inc(stage=self._exit_stage(result))
+                yield i, result
+        finally:
+            timer.finish()
+            if timings is not None:
+                timings.update(timer.timings)
+            BATCH_SIZE.observe(len(images))
+
+    def _predict_batch(self, images, timer):
+        # 1. Preprocessing: decode each input once, all stages derive their inputs from it
+        with timer.stage('preprocess'):
+            decoded = [DecodedImage.load(image) for image in images]
+            yolo_inputs = [d.yolo_input() for d in decoded]
+
+        batch_results = [{} for _ in images]
+
+        # --- STAGE 0: VALIDATION (whole batch) ---
+        with timer.stage('stage0'):
+            s0_results = self._run_stage0(yolo_inputs)
+
+        relevant_idx = []
+        for i, s0_result in enumerate(s0_results):
+            batch_results[i]['stage0'] = s0_result
+            s0_class = s0_result['class']
+            if not s0_result['is_relevant'] and s0_class != 'diabetic_foot': # Example override
+                batch_results[i]['final_verdict'] = f"Irrelevant ({s0_class})"
+                yield i, batch_results[i]
+            else:
+                relevant_idx.append(i)
+
+        if not relevant_idx:
+            return
+
+        # --- STAGE 1: TRIAGE (Binary) on relevant images ---
+        with timer.stage('preprocess'):
+            img_tensor = batch_tensor([decoded[i] for i in relevant_idx]).to(self.device)
+
+        with timer.stage('stage1'), torch.no_grad():
+            if self.feature_extractor is not None:
+                # Shared backbone: run it once, the stage "models" are heads on the pooled features
+                img_tensor = self.feature_extractor(img_tensor)
+            s1_probs = torch.sigmoid(self.stage1_model(img_tensor)).view(-1).tolist()
+
+        wound_rows = []
+        for row, i in enumerate(relevant_idx):
+            prob = s1_probs[row]
+            is_wound = prob > 0.5
+            batch_results[i]['stage1'] = {
+                'probability': prob,
+                'is_wound': is_wound
+            }
+            if is_wound:
+                wound_rows.append(row)
+            else:
+                batch_results[i]['final_verdict'] = "Healthy Skin"
+                yield i, batch_results[i]
+
+        if not wound_rows:
+            return
+
+        wound_idx = [relevant_idx[row] for row in wound_rows]
+        wound_tensor = img_tensor[wound_rows]
+
+        # --- STAGE 2: WOUND TYPE (Multi-class) on wound images ---
+        stage2_model = self._stage_model('stage2')
+        if not stage2_model:
+            for i in wound_idx:
+                batch_results[i]['final_verdict'] = "Wound Detected (Type Unknown - Stage 2 Missing)"
+                yield i, batch_results[i]
+            return
+
+        with timer.stage('stage2'):
+            s2_outputs = self._classify(stage2_model, wound_tensor)
+
+        dfu_rows = []
+        for row, (top1_idx, top1_prob, probs) in enumerate(s2_outputs):
+            i = wound_idx[row]
             wound_type = STAGE2_CLASSES[top1_idx]
-            results['stage2'] = {
+            batch_results[i]['stage2'] = {
                 'type': wound_type,
                 'confidence': top1_prob,
-                'all_probs': {cls: conf for cls, conf in zip(STAGE2_CLASSES, s2_probs.tolist())}
+                'all_probs': {cls: conf for cls, conf in zip(STAGE2_CLASSES, probs)}
             }
-            results['final_verdict'] = f"Wound Detected: {wound_type}"
-        else:
-            results['final_verdict'] = "Wound Detected (Type Unknown - Stage 2 Missing)"
-        
-        # --- STAGE 3: DFU SEVERITY (If DFU) ---
-        if wound_type == 'diabetic_foot' and self.stage3_model:
-            with torch.no_grad():
-                s3_out = self.stage3_model(img_tensor)
-                s3_probs = torch.softmax(s3_out, dim=1)[0]
-                s3_top1_idx = torch.argmax(s3_probs).item()
-                s3_conf = s3_probs[s3_top1_idx].item()
-                severity_grade = STAGE3_CLASSES[s3_top1_idx]
-            
-            results['stage3'] = {
+            batch_results[i]['final_verdict'] = f"Wound Detected: {wound_type}"
+            if wound_type == 'diabetic_foot':
+                dfu_rows.append(row)
+            else:
+                yield i, batch_results[i]
+
+        # --- STAGE 3: DFU SEVERITY on diabetic_foot images ---
+        if not dfu_rows:
+            return
+        dfu_idx = [wound_idx[row] for row in dfu_rows]
+        stage3_model = self._stage_model('stage3')
+        if not stage3_model:
+            for i in dfu_idx:
+                yield i, batch_results[i]
+            return
+
+        with timer.stage('stage3'):
+            s3_outputs = self._classify(stage3_model, wound_tensor[dfu_rows])
+
+        for row, (s3_top1_idx, s3_conf, probs) in enumerate(s3_outputs):
+            i = dfu_idx[row]
+            severity_grade = STAGE3_CLASSES[s3_top1_idx]
+            batch_results[i]['stage3'] = {
                 'grade': severity_grade,
                 'confidence': s3_conf,
-                'all_probs': {cls: conf for cls, conf in zip(STAGE3_CLASSES, s3_probs.tolist())}
+                'all_probs': {cls: conf for cls, conf in zip(STAGE3_CLASSES, probs)}
             }
-            results['final_verdict'] += f" ({severity_grade})"
+            batch_results[i]['final_verdict'] += f" ({severity_grade})"
+            yield i, batch_results[i]
+
+    @staticmethod
+    def _exit_stage(result):
+        """Deepest stage that produced output for this image, i.e. where the cascade stopped."""
+        for stage in ('stage3', 'stage2', 'stage1'):
+            if stage in result:
+                return stage
+        return 'stage0'
 
-        return results
+    def _run_stage0(self, img_srcs):
+        """YOLO inference on a list of BGR arrays, one stage0 dict per source."""
+        s0_results = []
+        for yolo_res in self.stage0_model(img_srcs, verbose=False):
+            top1_idx = yolo_res.probs.top1
+            s0_class = yolo_res.names[top1_idx]
+            s0_results.append({
+                'class': s0_class,
+                'confidence': yolo_res.probs.top1conf.item(),
+                'is_relevant': s0_class in ['wound', 'skin', 'diabetic_foot', 'healthy'] # Adjust based on actual YOLO classes
+            })
+        return s0_results
+
+    def _classify(self, model, img_tensor):
+        """Softmax classifier forward pass, returns (top1_idx, top1_prob, all_probs) per row."""
+        with torch.no_grad():
+            probs = torch.softmax(model(img_tensor), dim=1)
+            top1_prob, top1_idx = torch.max(probs, dim=1)
+        return list(zip(top1_idx.tolist(), top1_prob.tolist(), probs.tolist()))
 
 if __name__ == "__main__":
     # Test
@@ -0,0 +1,334 @@
+import os
+import time
+import asyncio
+import argparse
+import itertools
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Listener, Client
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from micro_batcher import MicroBatcher
+from preprocessing import DecodedImage
+
+# Unix socket(s) of the inference server process(es); comma-separated for several servers.
+# The default lives in a per-user directory that the server keeps at mode 0700.
+DEFAULT_ADDRESS = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir(), f"housepital-inference-{os.getuid()}", "inference.sock"
+)
+# Shared secret between the server and the HTTP workers (required, e.g. `openssl rand -hex 32`)
+AUTHKEY_ENV = "INFERENCE_SERVER_AUTHKEY"
+
+# Protocol (pickled tuples over multiprocessing.connection; pixels never go through the socket):
+#   server -> client  ('hello', info)                         on connect, once the models are loaded
+#   client -> server  ('predict', request_id, shm_name, shape)
+#   server -> client  ('result', request_id, result, timings) | ('error', request_id, message)
+
+
+def _authkey():
+    key = os.environ.get(AUTHKEY_ENV)
+    if not key:
+        raise RuntimeError(f"{AUTHKEY_ENV} is not set; the server and its HTTP workers need the same secret")
+    return key.encode()
+
+
+def _private_socket_dir(address):
+    """Create the socket's directory at mode 0700, or check that an existing one is ours and private."""
+    directory = os.path.dirname(os.path.abspath(address))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    stat = os.stat(directory)
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+        # Shared directory (e.g. /tmp itself): protect the socket file instead
+        return False
+    return True
+
+
+def _attach(name):
+    """Attach to a client's segment without registering it with our resource tracker (the client owns it)."""
+    shm = SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class InferenceServer:
+    """
+    Dedicated process owning the models. Any number of HTTP workers connect to it,
+    and their images are batched together by one MicroBatcher in front of
+    `InferencePipeline.predict_batch`, so a host holds one copy of the weights
+    no matter how many uvicorn workers it runs.
+
+    Each decoded image arrives as a shared memory segment written by the client;
+    the server maps it as the DecodedImage buffer directly (no pickling, no copy).
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, pipeline_kwargs=None, max_batch_size=16, max_wait_ms=5, workers=1):
+        self.address = address
+        self.pipeline_kwargs = pipeline_kwargs or {}
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.workers = workers
+        self.pipeline = None
+        self.batcher = None
+        self._loop = None
+
+    def serve_forever(self):
+        from inference_pipeline import InferencePipeline
+        authkey = _authkey()  # fail before spending minutes loading models
+        print("⏳ Loading Models...")
+        self.pipeline = InferencePipeline(**self.pipeline_kwargs)
+        print("✅ Models Loaded Successfully!")
+
+        # The batcher runs on its own event loop; connection threads submit into it
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="batcher-loop", daemon=True).start()
+        self.batcher = MicroBatcher(
+            self.pipeline.predict_batch,
+            max_batch_size=self.max_batch_size,
+            max_wait_ms=self.max_wait_ms,
+            executor=ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        )
+        asyncio.run_coroutine_threadsafe(self.batcher.start(), self._loop).result()
+
+        # Only listen once ready: clients treat a refused connection as "still loading"
+        private_dir = _private_socket_dir(self.address)
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+        with Listener(self.address, family='AF_UNIX', authkey=authkey) as listener:
+            os.chmod(self.address, 0o600)
+            if not private_dir:
+                print(f"⚠️ {os.path.dirname(self.address)} is not a private directory; only the socket file is 0600")
+            print(f"✅ Inference server listening on {self.address} (max_batch_size={self.max_batch_size}, max_wait_ms={self.max_wait_ms})")
+            while True:
+                conn = listener.accept()
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def info(self):
+        return {
+            "model_version": self.pipeline.model_version,
+            "backend": self.pipeline.backend,
+            "precision": self.pipeline.precision,
+            "stage_status": dict(self.pipeline.stage_status),
+            "load_seconds": dict(self.pipeline.load_seconds),
+            "pid": os.getpid(),
+        }
+
+    def _handle(self, conn):
+        send_lock = threading.Lock()
+        with send_lock:
+            conn.send(('hello', self.info()))
+        while True:
+            try:
+                kind, request_id, shm_name, shape = conn.recv()
+            except (EOFError, OSError):
+                break
+            try:
+                shm = _attach(shm_name)
+            except FileNotFoundError:
+                # Client gave up on this request and already unlinked the segment
+                continue
+            image = DecodedImage(np.ndarray(shape, dtype=np.uint8, buffer=shm.buf))
+            timings = {}
+            future = asyncio.run_coroutine_threadsafe(self.batcher.submit(image, timings), self._loop)
+            future.add_done_callback(
+                lambda f, request_id=request_id, shm=shm, timings=timings: self._reply(conn, send_lock, request_id, f, shm, timings)
+            )
+            del image
+        conn.close()
+
+    def _reply(self, conn, send_lock, request_id, future, shm, timings):
+        try:
+            message = ('result', request_id, future.result(), timings)
+        except Exception as e:
+            message = ('error', request_id, str(e))
+        try:
+            shm.close()
+        except BufferError:
+            pass  # a view is still referenced; the mapping goes away with it
+        try:
+            with send_lock:
+                conn.send(message)
+        except (OSError, ValueError):
+            pass  # client disconnected
+
+
+class _ServerConnection:
+    """One client connection to an InferenceServer; safe to share between threads."""
+
+    def __init__(self, address):
+        self.address = address
+        self.conn = Client(address, family='AF_UNIX', authkey=_authkey())
+        kind, self.info = self.conn.recv()
+        self._send_lock = threading.Lock()
+        self._pending = {}  # request_id -> (future, shm, timings)
+        self._ids = itertools.count()
+        self.closed = False
+        threading.Thread(target=self._receive, name="inference-client", daemon=True).start()
+
+    def submit(self, image, timings=None):
+        request_id = next(self._ids)
+        rgb = image.rgb
+        shm = SharedMemory(create=True, size=max(1, rgb.nbytes))
+        np.ndarray(rgb.shape, dtype=np.uint8, buffer=shm.buf)[...] = rgb
+        future = Future()
+        self._pending[request_id] = (future, shm, timings)
+        try:
+            with self._send_lock:
+                self.conn.send(('predict', request_id, shm.name, rgb.shape))
+        except (OSError, ValueError) as e:
+            self._finish(request_id, error=ConnectionError(f"Inference server {self.address} unavailable: {e}"))
+        return future
+
+    def _receive(self):
+        while True:
+            try:
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                break
+            if message[0] == 'result':
+                _, request_id, result, timings = message
+                self._finish(request_id, result=result, timings=timings)
+            else:
+                _, request_id, error = message
+                self._finish(request_id, error=RuntimeError(error))
+        self.closed = True
+        for request_id in list(self._pending):
+            self._finish(request_id, error=ConnectionError(f"Lost connection to inference server {self.address}"))
+
+    def _finish(self, request_id, result=None, timings=None, error=None):
+        entry = self._pending.pop(request_id, None)
+        if entry is None:
+            return
+        future, shm, caller_timings = entry
+        shm.close()
+        shm.unlink()
+        if caller_timings is not None and timings:
+            caller_timings.update(timings)
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def close(self):
+        self.closed = True
+        self.conn.close()
+
+
+class RemotePipeline:
+    """
+    Client side of InferenceServer with the InferencePipeline interface used by api.py.
+
+    The HTTP worker decodes the upload, copies the RGB buffer into a shared memory
+    segment and sends only its name; the result dict comes back over the socket.
+    Requests are spread round-robin over the given server addresses.
+    """
+
+    def __init__(self, addresses=DEFAULT_ADDRESS):
+        if isinstance(addresses, str):
+            addresses = [a.strip() for a in addresses.split(",") if a.strip()]
+        self.addresses = list(addresses)
+        self._connections = [None] * len(self.addresses)
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def connect(self, timeout=300, interval=0.5):
+        """Block until every server accepts a connection (i.e. has its models loaded)."""
+        deadline = time.monotonic() + timeout
+        for i, address in enumerate(self.addresses):
+            while True:
+                try:
+                    self._connections[i] = _ServerConnection(address)
+                    break
+                except (FileNotFoundError, ConnectionRefusedError, EOFError):
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Inference server at {address} not ready after {timeout:g}s")
+                    time.sleep(interval)
+        return self
+
+    def _connection(self):
+        i = next(self._next) % len(self.addresses)
+        conn = self._connections[i]
+        if conn is None or conn.closed:
+            # Server restarted: reconnect once, errors surface to the caller
+            with self._lock:
+                conn = self._connections[i]
+                if conn is None or conn.closed:
+                    conn = self._connections[i] = _ServerConnection(self.addresses[i])
+        return conn
+
+    def submit(self, image, timings=None):
+        """Returns a concurrent.futures.Future with the result dict (api.py awaits it via asyncio.wrap_future)."""
+        return self._connection().submit(DecodedImage.load(image), timings)
+
+    def predict(self, image, timings=None):
+        return self.submit(image, timings).result()
+
+    def predict_batch(self, images, timings=None):
+        futures = [self.submit(image) for image in images]
+        return [f.result() for f in futures]
+
+    def predict_batch_iter(self, images, timings=None):
+        """(index, result) pairs in completion order; the server batches them with other workers' requests."""
+        futures = {self.submit(image): i for i, image in enumerate(images)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    # InferencePipeline attributes reported by /health and /ready
+    def _info(self, key):
+        conn = next((c for c in self._connections if c is not None), None)
+        return conn.info[key] if conn else None
+
+    @property
+    def model_version(self):
+        return self._info("model_version")
+
+    @property
+    def backend(self):
+        return self._info("backend")
+
+    @property
+    def precision(self):
+        return self._info("precision")
+
+    @property
+    def stage_status(self):
+        return self._info("stage_status") or {}
+
+    @property
+    def load_seconds(self):
+        return self._info("load_seconds") or {}
+
+    @property
+    def ready(self):
+        return all(c is not None and not c.closed for c in self._connections)
+
+    def close(self):
+        for conn in self._connections:
+            if conn is not None:
+                conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inference server shared by all uvicorn workers on this host")
+    parser.add_argument("--address", type=str, default=DEFAULT_ADDRESS, help="Unix socket path")
+    parser.add_argument("--max-batch-size", type=int, default=int(os.environ.get("BATCH_MAX_SIZE", "16")))
+    parser.add_argument("--max-wait-ms", type=float, default=float(os.environ.get("BATCH_MAX_WAIT_MS", "5")))
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent predict_batch calls")
+    parser.add_argument("--backend", type=str, default=os.environ.get("INFERENCE_BACKEND", "torch"))
+    parser.add_argument("--precision", type=str, default=os.environ.get("INFERENCE_PRECISION", "fp32"))
+    parser.add_argument("--multihead", type=str, default=os.environ.get("MULTIHEAD_MODEL_PATH"))
+    args = parser.parse_args()
+    _authkey()
+
+    InferenceServer(
+        address=args.address,
+        pipeline_kwargs=dict(multihead_path=args.multihead, backend=args.backend, precision=args.precision),
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        workers=args.workers
+    ).serve_forever()
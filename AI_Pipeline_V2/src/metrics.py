@@ -0,0 +1,172 @@
+import time
+import threading
+from bisect import bisect_left
+
+
+class Counter:
+    """Monotonic counter with optional labels (Prometheus `counter`)."""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels.get(name, "") for name in self.labelnames), 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels (Prometheus `histogram`)."""
+
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _number(bound)
+                    bucket_labels = _labels(self.labelnames + ("le",), key + (le,))
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(series[-1])}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Process-wide metrics, rendered by the API on /metrics
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "wound_pipeline_stage_seconds",
+    "Time spent in each pipeline stage (per batch for the model stages).",
+    labelnames=("stage",)
+))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "wound_pipeline_request_seconds",
+    "End-to-end /predict latency.",
+    labelnames=("outcome",)
+))
+BATCH_SIZE = REGISTRY.register(Histogram(
+    "wound_pipeline_batch_size",
+    "Images per predict_batch call.",
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+))
+CASCADE_EXITS = REGISTRY.register(Counter(
+    "wound_pipeline_exits_total",
+    "Images by the stage at which the cascade stopped (stage3 = full depth).",
+    labelnames=("stage",)
+))
+REQUESTS = REGISTRY.register(Counter(
+    "wound_pipeline_requests_total",
+    "/predict requests by outcome.",
+    labelnames=("outcome",)
+))
+
+
+class StageTimer:
+    """
+    Accumulates wall time per named stage and observes each stage once on `finish()`.
+
+    Usage:
+        timer = StageTimer()
+        with timer.stage("stage0"):
+            ...
+        timer.finish()
+        timer.timings  # {"stage0": seconds, ...}
+    """
+
+    def __init__(self, histogram=STAGE_SECONDS):
+        self.histogram = histogram
+        self.timings = {}
+
+    def stage(self, name):
+        return _TimedBlock(self, name)
+
+    def add(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def finish(self):
+        for name, seconds in self.timings.items():
+            self.histogram.observe(seconds, stage=name)
+        return self.timings
+
+
+class _TimedBlock:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.add(self.name, time.perf_counter() - self.start)
+        return False
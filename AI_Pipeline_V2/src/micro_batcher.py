@@ -0,0 +1,114 @@
+import asyncio
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching queue in front of InferencePipeline.
+
+    Concurrent requests are collected for up to `max_wait_ms` (or until
+    `max_batch_size` images are waiting), run through `predict_batch_fn`
+    as a single batch, and each per-image result is handed back to the
+    request that submitted it.
+
+    Usage:
+        batcher = MicroBatcher(pipeline.predict_batch, max_batch_size=8, max_wait_ms=10)
+        await batcher.start()
+        result = await batcher.submit(img_arr)
+    """
+
+    def __init__(self, predict_batch_fn, max_batch_size=8, max_wait_ms=10, executor=None):
+        self.predict_batch_fn = predict_batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+        self.executor = executor
+        self._queue = None
+        self._worker = None
+
+        # Stats
+        self.batches_run = 0
+        self.images_processed = 0
+
+    async def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, image, timings=None):
+        """
+        Queue one image and wait for its result dict. If `timings` is a dict it is
+        filled with the per-stage times of the batch the image ran in (plus batch_size).
+        """
+        if self._worker is None:
+            raise RuntimeError("MicroBatcher is not started")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, future, timings))
+        return await future
+
+    def stats(self):
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches_run": self.batches_run,
+            "images_processed": self.images_processed,
+            "avg_batch_size": (self.images_processed / self.batches_run) if self.batches_run else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def _collect(self):
+        """Wait for the first request, then gather more until the batch is full or the window closes."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        # Drain anything that is already waiting without blocking
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Requests whose caller already gave up are dropped from the batch
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            images = [image for image, _, _ in batch]
+            # Only ask for stage timings when a caller wants them
+            batch_timings = {} if any(timings is not None for _, _, timings in batch) else None
+            try:
+                if batch_timings is None:
+                    results = await loop.run_in_executor(self.executor, self.predict_batch_fn, images)
+                else:
+                    results = await loop.run_in_executor(self.executor, self.predict_batch_fn, images, batch_timings)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches_run += 1
+            self.images_processed += len(images)
+            for (_, future, timings), result in zip(batch, results):
+                if timings is not None:
+                    timings.update(batch_timings, batch_size=len(images))
+                if not future.done():
+                    future.set_result(result)
+
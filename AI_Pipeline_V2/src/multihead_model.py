@@ -0,0 +1,96 @@
+import torch
+import torch.nn as nn
+import timm
+from pathlib import Path
+
+# Must match inference_pipeline.STAGE2_CLASSES / STAGE3_CLASSES
+STAGE2_CLASSES = ['abrasion', 'bruise', 'burn', 'cut', 'diabetic_foot', 'laceration', 'surgical']
+STAGE3_CLASSES = ['grade_1', 'grade_2', 'grade_3', 'grade_4']
+
+
+def load_checkpoint_state(path, map_location='cpu'):
+    """Load a stage checkpoint, accepting both raw state dicts and {'model_state_dict': ...}."""
+    checkpoint = torch.load(path, map_location=map_location)
+    if isinstance(checkpoint, dict) and 'model_state_dict' in checkpoint:
+        return checkpoint['model_state_dict']
+    return checkpoint
+
+
+class SharedBackboneMultiHead(nn.Module):
+    """
+    Single EfficientNet-B0 feature extractor shared by Stages 1-3.
+
+    The backbone runs once per image and returns pooled features; three linear
+    heads consume them:
+        wound_head    -> 1 logit   (Stage 1, wound vs healthy)
+        type_head     -> 7 logits  (Stage 2, wound type)
+        severity_head -> 4 logits  (Stage 3, DFU grade)
+    """
+
+    def __init__(self, backbone_name='tf_efficientnet_b0', pretrained=False,
+                 num_types=len(STAGE2_CLASSES), num_grades=len(STAGE3_CLASSES), drop_rate=0.2):
+        super().__init__()
+        self.backbone_name = backbone_name
+        # num_classes=0 -> timm returns the globally pooled features
+        self.backbone = timm.create_model(backbone_name, pretrained=pretrained, num_classes=0)
+        num_features = self.backbone.num_features
+        self.dropout = nn.Dropout(drop_rate)
+        self.wound_head = nn.Linear(num_features, 1)
+        self.type_head = nn.Linear(num_features, num_types)
+        self.severity_head = nn.Linear(num_features, num_grades)
+
+    def forward_features(self, x):
+        return self.backbone(x)
+
+    def forward(self, x):
+        features = self.dropout(self.forward_features(x))
+        return self.wound_head(features), self.type_head(features), self.severity_head(features)
+
+    @classmethod
+    def from_stage_checkpoints(cls, stage1_path, stage2_path=None, stage3_path=None, map_location='cpu'):
+        """
+        Build the multi-head model from the existing per-stage checkpoints.
+
+        The backbone and wound head come from Stage 1 (so Stage 1 outputs are unchanged).
+        The type/severity heads are initialised from the Stage 2/3 classifiers; since those
+        were trained on a different backbone they should be fine-tuned with multihead_train.py.
+        """
+        model = cls()
+
+        s1_state = load_checkpoint_state(stage1_path, map_location)
+        backbone_state = {k: v for k, v in s1_state.items() if not k.startswith('classifier.')}
+        model.backbone.load_state_dict(backbone_state)
+        model.wound_head.load_state_dict(_classifier_state(s1_state))
+
+        if stage2_path and Path(stage2_path).exists():
+            model.type_head.load_state_dict(_classifier_state(load_checkpoint_state(stage2_path, map_location)))
+        if stage3_path and Path(stage3_path).exists():
+            model.severity_head.load_state_dict(_classifier_state(load_checkpoint_state(stage3_path, map_location)))
+
+        return model
+
+    @classmethod
+    def from_checkpoint(cls, path, map_location='cpu', mmap_weights=False):
+        """
+        Load a checkpoint saved by multihead_train.py. With `mmap_weights`, a
+        .safetensors conversion next to it (convert_safetensors.py) is memory-mapped instead.
+        """
+        from weights import load_weights, build_with_weights
+        state_dict, metadata = load_weights(path, map_location, mmap_weights)
+        return build_with_weights(lambda: cls(backbone_name=metadata.get('backbone', 'tf_efficientnet_b0')), state_dict)
+
+    def save_checkpoint(self, path, **extra):
+        torch.save({
+            'model_state_dict': self.state_dict(),
+            'backbone': self.backbone_name,
+            'stage2_classes': STAGE2_CLASSES,
+            'stage3_classes': STAGE3_CLASSES,
+            **extra
+        }, path)
+
+
+def _classifier_state(state_dict):
+    return {
+        'weight': state_dict['classifier.weight'],
+        'bias': state_dict['classifier.bias'],
+    }
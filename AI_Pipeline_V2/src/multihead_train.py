@@ -0,0 +1,265 @@
+import os
+import sys
+import argparse
+import torch
+import torch.nn as nn
+import torch.optim as optim
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from tqdm.auto import tqdm
+from sklearn.metrics import accuracy_score, f1_score
+from torch.utils.data import DataLoader, Dataset
+from PIL import Image
+import albumentations as A
+from albumentations.pytorch import ToTensorV2
+
+from multihead_model import SharedBackboneMultiHead, STAGE2_CLASSES, STAGE3_CLASSES
+
+# Config
+CONFIG = {
+    "seed": 42,
+    "img_size": 224,
+    "batch_size": 32,
+    "num_workers": 0, # Windows compatibility
+    "epochs": 5,
+    "lr": 1e-3,
+    "binary_val_fold": 0,
+}
+
+# Resolve Paths
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+LOADERS_DIR = PROJECT_ROOT / "data" / "loaders"
+CONFIG["stage1_path"] = PROJECT_ROOT / "models" / "stage1_binary" / "best_model_fold_0.pth"
+CONFIG["stage2_path"] = PROJECT_ROOT / "models" / "stage2_type" / "best_model.pth"
+CONFIG["stage3_path"] = PROJECT_ROOT / "models" / "stage3_severity" / "best_model.pth"
+CONFIG["binary_csv"] = LOADERS_DIR / "train_folds.csv"
+CONFIG["type_train_csv"] = LOADERS_DIR / "wound_type_train.csv"
+CONFIG["type_val_csv"] = LOADERS_DIR / "wound_type_val.csv"
+CONFIG["severity_train_csv"] = LOADERS_DIR / "dfu_severity_train.csv"
+CONFIG["severity_val_csv"] = LOADERS_DIR / "dfu_severity_val.csv"
+CONFIG["model_dir"] = PROJECT_ROOT / "models" / "multihead"
+
+TASKS = ['wound', 'type', 'severity']
+
+
+def seed_everything(seed):
+    os.environ['PYTHONHASHSEED'] = str(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+    torch.cuda.manual_seed(seed)
+    torch.backends.cudnn.deterministic = True
+
+
+class TaskDataset(Dataset):
+    """Images + integer labels for one head. `label_fn` maps a CSV row to a label."""
+    def __init__(self, df, label_fn, transform=None):
+        self.df = df.reset_index(drop=True)
+        self.label_fn = label_fn
+        self.transform = transform
+
+    def __len__(self):
+        return len(self.df)
+
+    def __getitem__(self, idx):
+        row = self.df.iloc[idx]
+        rel_path = str(row['path']).replace('\\', os.sep).replace('/', os.sep)
+        # CSV paths look like ..\data\raw\..., resolve from the 'data' part onwards
+        if "data" in rel_path:
+            img_path = PROJECT_ROOT / rel_path[rel_path.find("data"):]
+        else:
+            img_path = PROJECT_ROOT / rel_path.lstrip(".\\/")
+
+        try:
+            image = np.array(Image.open(img_path).convert("RGB"))
+            if self.transform:
+                image = self.transform(image=image)['image']
+        except Exception as e:
+            print(f"Warning: Could not open {img_path} ({e}), using black image.")
+            image = torch.zeros((3, CONFIG['img_size'], CONFIG['img_size']))
+
+        return image, torch.tensor(self.label_fn(row), dtype=torch.long)
+
+
+def build_datasets(train_transform, val_transform):
+    """Returns {task: (train_ds, val_ds)} from the existing loader CSVs."""
+    binary_df = pd.read_csv(CONFIG['binary_csv'])
+    binary_label = lambda row: 0 if str(row['label']).lower() == 'healthy' else 1
+    fold = CONFIG['binary_val_fold']
+
+    def filtered(csv_path, classes):
+        df = pd.read_csv(csv_path)
+        return df[df['class'].isin(classes)]
+
+    type_idx = {name: i for i, name in enumerate(STAGE2_CLASSES)}
+    severity_idx = {name: i for i, name in enumerate(STAGE3_CLASSES)}
+
+    return {
+        'wound': (
+            TaskDataset(binary_df[binary_df['fold'] != fold], binary_label, train_transform),
+            TaskDataset(binary_df[binary_df['fold'] == fold], binary_label, val_transform),
+        ),
+        'type': (
+            TaskDataset(filtered(CONFIG['type_train_csv'], STAGE2_CLASSES), lambda row: type_idx[row['class']], train_transform),
+            TaskDataset(filtered(CONFIG['type_val_csv'], STAGE2_CLASSES), lambda row: type_idx[row['class']], val_transform),
+        ),
+        'severity': (
+            TaskDataset(filtered(CONFIG['severity_train_csv'], STAGE3_CLASSES), lambda row: severity_idx[row['class']], train_transform),
+            TaskDataset(filtered(CONFIG['severity_val_csv'], STAGE3_CLASSES), lambda row: severity_idx[row['class']], val_transform),
+        ),
+    }
+
+
+def task_logits(model, task, images, train_backbone):
+    if train_backbone:
+        features = model.forward_features(images)
+    else:
+        with torch.no_grad():
+            features = model.forward_features(images)
+    features = model.dropout(features)
+    head = {'wound': model.wound_head, 'type': model.type_head, 'severity': model.severity_head}[task]
+    return head(features)
+
+
+def task_loss(task, logits, labels):
+    if task == 'wound':
+        return nn.functional.binary_cross_entropy_with_logits(logits.squeeze(1), labels.float())
+    return nn.functional.cross_entropy(logits, labels)
+
+
+def train_one_epoch(model, loaders, optimizer, device, tasks, train_backbone):
+    """Round-robin over the task loaders so every head sees every epoch."""
+    model.train()
+    if not train_backbone:
+        model.backbone.eval()  # keep BatchNorm statistics from Stage 1
+
+    iterators = {task: iter(loaders[task]) for task in tasks}
+    running = {task: 0.0 for task in tasks}
+    steps = {task: 0 for task in tasks}
+    active = list(tasks)
+
+    pbar = tqdm(total=sum(len(loaders[t]) for t in tasks), desc="Training", leave=False, dynamic_ncols=True)
+    while active:
+        for task in list(active):
+            try:
+                images, labels = next(iterators[task])
+            except StopIteration:
+                active.remove(task)
+                continue
+            images, labels = images.to(device), labels.to(device)
+
+            optimizer.zero_grad()
+            loss = task_loss(task, task_logits(model, task, images, train_backbone), labels)
+            loss.backward()
+            optimizer.step()
+
+            running[task] += loss.item()
+            steps[task] += 1
+            pbar.update(1)
+            pbar.set_postfix(task=task, loss=loss.item())
+    pbar.close()
+
+    return {task: running[task] / max(steps[task], 1) for task in tasks}
+
+
+def validate(model, loaders, device, tasks):
+    model.eval()
+    metrics = {}
+    with torch.no_grad():
+        for task in tasks:
+            preds_all, targets_all = [], []
+            for images, labels in tqdm(loaders[task], desc=f"Validating {task}", leave=False, dynamic_ncols=True):
+                logits = task_logits(model, task, images.to(device), train_backbone=False)
+                if task == 'wound':
+                    preds = (torch.sigmoid(logits.squeeze(1)) > 0.5).long()
+                else:
+                    preds = torch.argmax(logits, dim=1)
+                preds_all.extend(preds.cpu().numpy())
+                targets_all.extend(labels.numpy())
+            metrics[task] = {
+                'acc': accuracy_score(targets_all, preds_all),
+                'f1': f1_score(targets_all, preds_all, average='binary' if task == 'wound' else 'macro'),
+            }
+    return metrics
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the shared-backbone multi-head model (Stages 1-3)")
+    parser.add_argument("--from-scratch", action="store_true", help="Start from ImageNet weights instead of the stage checkpoints")
+    parser.add_argument("--joint", action="store_true", help="Fine-tune the backbone jointly instead of training heads only")
+    parser.add_argument("--epochs", type=int, default=CONFIG['epochs'])
+    parser.add_argument("--lr", type=float, default=CONFIG['lr'])
+    args = parser.parse_args()
+
+    seed_everything(CONFIG['seed'])
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    print(f"Using Device: {device}")
+
+    # Model
+    if args.from_scratch:
+        print("Creating multi-head model from ImageNet weights (joint training)")
+        model = SharedBackboneMultiHead(pretrained=True)
+        args.joint = True
+    else:
+        if not CONFIG['stage1_path'].exists():
+            print(f"Error: Stage 1 checkpoint not found at {CONFIG['stage1_path']}")
+            sys.exit(1)
+        print("Building multi-head model from stage checkpoints...")
+        model = SharedBackboneMultiHead.from_stage_checkpoints(
+            CONFIG['stage1_path'], CONFIG['stage2_path'], CONFIG['stage3_path']
+        )
+    model.to(device)
+
+    # When only the heads are trained, Stage 1 is already exact (same backbone + classifier)
+    tasks = TASKS if args.joint else ['type', 'severity']
+
+    # Transforms
+    train_transforms = A.Compose([
+        A.Resize(CONFIG['img_size'], CONFIG['img_size']),
+        A.HorizontalFlip(p=0.5),
+        A.Rotate(limit=30, p=0.5),
+        A.RandomBrightnessContrast(p=0.2),
+        A.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+        ToTensorV2(),
+    ])
+    val_transforms = A.Compose([
+        A.Resize(CONFIG['img_size'], CONFIG['img_size']),
+        A.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+        ToTensorV2(),
+    ])
+
+    datasets = build_datasets(train_transforms, val_transforms)
+    train_loaders = {t: DataLoader(datasets[t][0], batch_size=CONFIG['batch_size'], shuffle=True, num_workers=CONFIG['num_workers']) for t in TASKS}
+    val_loaders = {t: DataLoader(datasets[t][1], batch_size=CONFIG['batch_size'], shuffle=False, num_workers=CONFIG['num_workers']) for t in TASKS}
+    for t in TASKS:
+        print(f"{t:<9} Train: {len(datasets[t][0])} | Val: {len(datasets[t][1])}")
+
+    if args.joint:
+        params = model.parameters()
+    else:
+        for p in model.backbone.parameters():
+            p.requires_grad = False
+        params = list(model.type_head.parameters()) + list(model.severity_head.parameters())
+    optimizer = optim.AdamW(params, lr=args.lr)
+
+    os.makedirs(CONFIG['model_dir'], exist_ok=True)
+    save_path = CONFIG['model_dir'] / "best_model.pth"
+    best_score = -1.0
+
+    for epoch in range(args.epochs):
+        print(f"\nEpoch {epoch+1}/{args.epochs}")
+        losses = train_one_epoch(model, train_loaders, optimizer, device, tasks, train_backbone=args.joint)
+        metrics = validate(model, val_loaders, device, TASKS)
+
+        for t in TASKS:
+            loss_str = f"Loss: {losses[t]:.4f} | " if t in losses else ""
+            print(f"{t:<9} {loss_str}Val Acc: {metrics[t]['acc']:.4f} | F1: {metrics[t]['f1']:.4f}")
+
+        score = np.mean([metrics[t]['f1'] for t in TASKS])
+        if score > best_score:
+            print(f"🔥 Mean F1 Improved ({best_score:.4f} -> {score:.4f}). Saving Model...")
+            best_score = score
+            model.save_checkpoint(save_path, metrics=metrics)
+
+    print("Training Complete!")
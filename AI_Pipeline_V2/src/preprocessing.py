@@ -0,0 +1,111 @@
+import io
+import cv2
+import torch
+import numpy as np
+from PIL import Image
+from pathlib import Path
+
+# Input sizes of the pipeline stages
+STAGE0_IMG_SIZE = 224  # YOLOv11-cls imgsz (models/stage0_yolo_v11/args.yaml)
+EFFNET_IMG_SIZE = 224  # Stages 1-3
+
+# JPEGs are decoded with DCT scaling (PIL draft) at the smallest 1/2, 1/4 or 1/8 scale
+# that still covers the largest stage input. A 12MP phone photo decodes at 500x375.
+DECODE_MIN_SIZE = max(STAGE0_IMG_SIZE, EFFNET_IMG_SIZE)
+DRAFT_FORMATS = {"JPEG", "MPO"}
+
+# ImageNet normalization, pre-scaled to 0-255 so it applies directly to uint8 pixels
+_MEAN_255 = torch.tensor([0.485, 0.456, 0.406]).view(3, 1, 1) * 255.0
+_STD_255 = torch.tensor([0.229, 0.224, 0.225]).view(3, 1, 1) * 255.0
+
+
+class DecodedImage:
+    """
+    An input image decoded exactly once into a contiguous uint8 RGB buffer (H, W, 3).
+
+    Both model inputs are derived from this one buffer:
+        yolo_input() -> BGR uint8 array, shorter side resized to the Stage 0 size
+        tensor()     -> normalized float tensor (3, 224, 224) for Stages 1-3
+    so no stage re-reads the file or round-trips through PIL.
+    """
+
+    __slots__ = ('rgb',)
+
+    def __init__(self, rgb):
+        self.rgb = np.ascontiguousarray(rgb, dtype=np.uint8)
+
+    @classmethod
+    def load(cls, source, min_size=DECODE_MIN_SIZE):
+        """Accepts a path, raw bytes, a PIL image, an RGB numpy array or a DecodedImage."""
+        if isinstance(source, cls):
+            return source
+        if isinstance(source, (str, Path)):
+            with open_reduced(source, min_size) as image:
+                return cls.from_pil(image)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return cls.from_bytes(source, min_size)
+        if isinstance(source, Image.Image):
+            return cls.from_pil(source)
+        return cls.from_array(source)
+
+    @classmethod
+    def from_bytes(cls, data, min_size=DECODE_MIN_SIZE):
+        with open_reduced(io.BytesIO(data), min_size) as image:
+            return cls.from_pil(image)
+
+    @classmethod
+    def from_pil(cls, image):
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return cls(np.asarray(image))
+
+    @classmethod
+    def from_array(cls, array):
+        array = np.asarray(array)
+        if array.ndim == 2:
+            array = cv2.cvtColor(array, cv2.COLOR_GRAY2RGB)
+        elif array.shape[2] == 4:
+            array = cv2.cvtColor(array, cv2.COLOR_RGBA2RGB)
+        return cls(array)
+
+    @property
+    def size(self):
+        """(width, height), like PIL."""
+        return self.rgb.shape[1], self.rgb.shape[0]
+
+    def yolo_input(self):
+        """
+        BGR array for Ultralytics (numpy sources are treated as BGR, like cv2.imread).
+        Downscaled so the shorter side equals the Stage 0 size, which is what the
+        YOLO classify transform would resize to anyway, so YOLO never touches the full image.
+        """
+        h, w = self.rgb.shape[:2]
+        scale = STAGE0_IMG_SIZE / min(h, w)
+        small = self.rgb
+        if scale < 1:
+            small = cv2.resize(self.rgb, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_RGB2BGR)
+
+    def tensor(self):
+        """Normalized (3, 224, 224) float tensor, same resize as the training transforms (A.Resize)."""
+        small = cv2.resize(self.rgb, (EFFNET_IMG_SIZE, EFFNET_IMG_SIZE), interpolation=cv2.INTER_LINEAR)
+        tensor = torch.from_numpy(small).permute(2, 0, 1).float()
+        return tensor.sub_(_MEAN_255).div_(_STD_255)
+
+
+def open_reduced(fp, min_size=DECODE_MIN_SIZE):
+    """
+    Open an image for decoding at reduced size. For JPEG the decoder is switched to
+    DCT-scaled mode so the result is the smallest scale with both sides >= min_size
+    (or the full size if the image is already small). PNG/WEBP decode at full size.
+    Pass min_size=None to always decode at full resolution.
+    """
+    image = Image.open(fp)
+    if min_size and image.format in DRAFT_FORMATS:
+        image.draft('RGB', (min_size, min_size))
+    return image
+
+
+def batch_tensor(decoded_images):
+    """Stack the Stage 1-3 tensors of several DecodedImages into one (N, 3, 224, 224) batch."""
+    return torch.stack([d.tensor() for d in decoded_images])
@@ -0,0 +1,201 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score, roc_auc_score, classification_report, confusion_matrix
+from torch.utils.data import DataLoader
+import albumentations as A
+from albumentations.pytorch import ToTensorV2
+
+from backends import OnnxModel, exported_path
+from inference_pipeline import STAGE1_MODEL_PATH, STAGE2_MODEL_PATH, STAGE3_MODEL_PATH, STAGE2_CLASSES, STAGE3_CLASSES
+from multihead_train import TaskDataset
+
+# Config
+CONFIG = {
+    "img_size": 224,
+    "batch_size": 32,
+    "calibration_size": 256,  # images drawn from test.csv
+    "seed": 42,
+}
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+LOADERS_DIR = PROJECT_ROOT / "data" / "loaders"
+CONFIG["calibration_csv"] = LOADERS_DIR / "test.csv"
+CONFIG["type_eval_csv"] = LOADERS_DIR / "wound_type_val.csv"
+CONFIG["severity_eval_csv"] = LOADERS_DIR / "dfu_severity_val.csv"
+
+STAGES = {
+    'stage1': STAGE1_MODEL_PATH,
+    'stage2': STAGE2_MODEL_PATH,
+    'stage3': STAGE3_MODEL_PATH,
+}
+
+# Same preprocessing as stage1_binary_test.py / stage3_dfu_test.py
+EVAL_TRANSFORM = A.Compose([
+    A.Resize(CONFIG['img_size'], CONFIG['img_size']),
+    A.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+    ToTensorV2(),
+])
+
+
+def split_test_csv():
+    """Calibration rows and the remaining held-out rows of test.csv (disjoint)."""
+    df = pd.read_csv(CONFIG['calibration_csv'])
+    calib = df.sample(n=min(CONFIG['calibration_size'], len(df)), random_state=CONFIG['seed'])
+    return calib, df.drop(calib.index)
+
+
+class TestCsvCalibrationReader:
+    """onnxruntime CalibrationDataReader feeding preprocessed test.csv images."""
+
+    def __init__(self, calib_df, input_name):
+        ds = TaskDataset(calib_df, lambda row: 0, EVAL_TRANSFORM)
+        self.loader = DataLoader(ds, batch_size=CONFIG['batch_size'], shuffle=False, num_workers=0)
+        self.input_name = input_name
+        self._iter = None
+
+    def get_next(self):
+        if self._iter is None:
+            self._iter = iter(self.loader)
+        try:
+            images, _ = next(self._iter)
+        except StopIteration:
+            return None
+        return {self.input_name: images.numpy()}
+
+    def rewind(self):
+        self._iter = None
+
+
+def quantize_stage(name, checkpoint, calib_df):
+    from onnxruntime.quantization import quantize_static, QuantFormat, QuantType, CalibrationMethod
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    fp32_path = exported_path(checkpoint, 'onnx')
+    int8_path = exported_path(checkpoint, 'onnx', 'int8')
+    if not fp32_path.exists():
+        print(f"⚠️ {name}: FP32 ONNX not found at {fp32_path}. Run export_onnx.py first. Skipping.")
+        return None
+
+    # Shape inference + graph cleanup recommended before static quantization
+    prep_path = fp32_path.with_suffix('.prep.onnx')
+    quant_pre_process(str(fp32_path), str(prep_path))
+
+    input_name = OnnxModel(prep_path).input_name
+    quantize_static(
+        str(prep_path), str(int8_path),
+        calibration_data_reader=TestCsvCalibrationReader(calib_df, input_name),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        calibrate_method=CalibrationMethod.MinMax,
+    )
+    prep_path.unlink(missing_ok=True)
+    print(f"✅ {name}: INT8 model written to {int8_path}")
+    return int8_path
+
+
+def run_model(model, loader):
+    """Returns (logits, labels, ms per image)."""
+    logits_all, labels_all = [], []
+    elapsed = 0.0
+    for images, labels in loader:
+        start = time.perf_counter()
+        logits_all.append(model(images).numpy())
+        elapsed += time.perf_counter() - start
+        labels_all.append(labels.numpy())
+    n = sum(len(l) for l in labels_all)
+    return np.concatenate(logits_all), np.concatenate(labels_all), elapsed / max(n, 1) * 1000
+
+
+def report_binary(fp32_model, int8_model, eval_df):
+    """Stage 1: same metrics as stage1_binary_test.py."""
+    ds = TaskDataset(eval_df, lambda row: 0 if str(row['label']).lower() == 'healthy' else 1, EVAL_TRANSFORM)
+    loader = DataLoader(ds, batch_size=CONFIG['batch_size'], shuffle=False, num_workers=0)
+
+    rows = {}
+    for precision, model in (('FP32', fp32_model), ('INT8', int8_model)):
+        logits, targets, ms = run_model(model, loader)
+        preds = 1 / (1 + np.exp(-logits.reshape(-1)))
+        preds_binary = (preds > 0.5).astype(int)
+        try:
+            roc = roc_auc_score(targets, preds)
+        except ValueError:
+            roc = 0.5
+        rows[precision] = (accuracy_score(targets, preds_binary), f1_score(targets, preds_binary), roc, ms)
+        print(f"\n[{precision}] Confusion Matrix:")
+        print(confusion_matrix(targets, preds_binary))
+        print(classification_report(targets, preds_binary, target_names=['Healthy', 'Wound']))
+
+    print(f"{'':6}{'Accuracy':>10}{'F1':>10}{'ROC AUC':>10}{'ms/img':>10}")
+    for precision, (acc, f1, roc, ms) in rows.items():
+        print(f"{precision:6}{acc:>10.4f}{f1:>10.4f}{roc:>10.4f}{ms:>10.2f}")
+    (a32, f32, r32, ms32), (a8, f8, r8, ms8) = rows['FP32'], rows['INT8']
+    print(f"{'Δ':6}{a8 - a32:>+10.4f}{f8 - f32:>+10.4f}{r8 - r32:>+10.4f}{'x%.2f' % (ms32 / ms8):>10}")
+
+
+def report_multiclass(fp32_model, int8_model, eval_csv, classes):
+    """Stages 2/3: same metrics as stage3_dfu_test.py."""
+    df = pd.read_csv(eval_csv)
+    df = df[df['class'].isin(classes)]
+    class_to_idx = {name: i for i, name in enumerate(classes)}
+    ds = TaskDataset(df, lambda row: class_to_idx[row['class']], EVAL_TRANSFORM)
+    loader = DataLoader(ds, batch_size=CONFIG['batch_size'], shuffle=False, num_workers=0)
+
+    rows = {}
+    for precision, model in (('FP32', fp32_model), ('INT8', int8_model)):
+        logits, targets, ms = run_model(model, loader)
+        preds = np.argmax(logits, axis=1)
+        rows[precision] = (accuracy_score(targets, preds), f1_score(targets, preds, average='macro'), ms)
+        print(f"\n[{precision}] Classification Report:")
+        print(classification_report(targets, preds, labels=list(range(len(classes))), target_names=classes, zero_division=0))
+        print(f"[{precision}] Confusion Matrix:")
+        print(confusion_matrix(targets, preds, labels=list(range(len(classes)))))
+
+    print(f"{'':6}{'Accuracy':>10}{'Macro F1':>10}{'ms/img':>10}")
+    for precision, (acc, f1, ms) in rows.items():
+        print(f"{precision:6}{acc:>10.4f}{f1:>10.4f}{ms:>10.2f}")
+    (a32, f32, ms32), (a8, f8, ms8) = rows['FP32'], rows['INT8']
+    print(f"{'Δ':6}{a8 - a32:>+10.4f}{f8 - f32:>+10.4f}{'x%.2f' % (ms32 / ms8):>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Static INT8 PTQ of the EfficientNet stages + accuracy report vs FP32")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--report-only", action="store_true", help="Skip quantization, only compare existing models")
+    args = parser.parse_args()
+
+    if not CONFIG['calibration_csv'].exists():
+        print(f"Error: Calibration CSV not found at {CONFIG['calibration_csv']}")
+        sys.exit(1)
+    calib_df, heldout_df = split_test_csv()
+    print(f"Calibration images: {len(calib_df)} | Held-out test images: {len(heldout_df)}")
+
+    for name in args.stages:
+        checkpoint = STAGES[name]
+        print("\n" + "=" * 40)
+        print(f"{name.upper()} ({checkpoint.parent.name})")
+        print("=" * 40)
+
+        if not args.report_only and quantize_stage(name, checkpoint, calib_df) is None:
+            continue
+
+        fp32_path = exported_path(checkpoint, 'onnx')
+        int8_path = exported_path(checkpoint, 'onnx', 'int8')
+        if not (fp32_path.exists() and int8_path.exists()):
+            print(f"⚠️ Missing {fp32_path.name} or {int8_path.name}. Skipping report.")
+            continue
+        fp32_model, int8_model = OnnxModel(fp32_path), OnnxModel(int8_path)
+
+        if name == 'stage1':
+            # Calibration rows are excluded so INT8 is not scored on the data it was calibrated on
+            report_binary(fp32_model, int8_model, heldout_df)
+        elif name == 'stage2':
+            report_multiclass(fp32_model, int8_model, CONFIG['type_eval_csv'], STAGE2_CLASSES)
+        else:
+            report_multiclass(fp32_model, int8_model, CONFIG['severity_eval_csv'], STAGE3_CLASSES)
@@ -0,0 +1,77 @@
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from tqdm.auto import tqdm
+from inference_pipeline import InferencePipeline
+
+# Configuration
+CONFIG = {
+    "batch_size": 32,
+    "extensions": ['.jpg', '.jpeg', '.png', '.webp'],
+}
+
+
+def collect_images(input_path):
+    """Collect image paths from a folder (recursive) or a CSV with a 'path' column."""
+    input_path = Path(input_path)
+    if input_path.suffix.lower() == ".csv":
+        import pandas as pd
+        df = pd.read_csv(input_path)
+        return [Path(p) for p in df['path']]
+    return sorted(p for p in input_path.rglob("*") if p.suffix.lower() in CONFIG['extensions'])
+
+
+def rescore(pipeline, image_paths, output_path, batch_size):
+    """Run the archive through predict_batch and write one JSON line per image."""
+    done = 0
+    failed = 0
+    start = time.time()
+
+    with open(output_path, "w", encoding="utf-8") as out:
+        for offset in tqdm(range(0, len(image_paths), batch_size), desc="Rescoring"):
+            chunk = image_paths[offset:offset + batch_size]
+            try:
+                results = pipeline.predict_batch(chunk)
+            except Exception as e:
+                # Fall back to one-by-one so a single bad file does not drop the whole batch
+                print(f"⚠️ Batch at {offset} failed ({e}), retrying images individually")
+                results = []
+                for path in chunk:
+                    try:
+                        results.append(pipeline.predict(path))
+                    except Exception as img_e:
+                        results.append({'error': str(img_e)})
+
+            for path, result in zip(chunk, results):
+                if 'error' in result:
+                    failed += 1
+                result['path'] = str(path)
+                out.write(json.dumps(result) + "\n")
+                done += 1
+
+    elapsed = time.time() - start
+    print(f"✅ Rescored {done} images ({failed} failed) in {elapsed:.1f}s ({done / max(elapsed, 1e-9):.1f} img/s)")
+    print(f"Results written to {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline re-scoring of archived patient photos")
+    parser.add_argument("--input", type=str, required=True, help="Folder of images or CSV with a 'path' column")
+    parser.add_argument("--output", type=str, default="rescored_results.jsonl", help="Output JSONL file")
+    parser.add_argument("--batch-size", type=int, default=CONFIG['batch_size'])
+    args = parser.parse_args()
+
+    image_paths = collect_images(args.input)
+    if not image_paths:
+        print(f"Error: No images found in {args.input}")
+        sys.exit(1)
+    print(f"Found {len(image_paths)} images")
+
+    pipeline = InferencePipeline()
+    rescore(pipeline, image_paths, args.output, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
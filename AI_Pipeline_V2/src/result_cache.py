@@ -0,0 +1,180 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Content-addressed cache of pipeline results.
+
+    Keys are sha256(model_version + uploaded bytes), so a re-submitted photo is
+    served without running the pipeline, and a model change invalidates everything.
+
+    Tiers:
+        memory - LRU bounded to `max_entries`, entries expire after `ttl_s`
+        disk   - optional sqlite file (`disk_path`) that survives restarts;
+                 memory misses fall through to it and hits are promoted back.
+                 Bounded to about `max_disk_entries` rows, pruned as it is written.
+
+    `get` / `put` cover both tiers. Async callers use `get_memory` / `put_memory`
+    on the event loop and run `get_disk` / `put_disk` in a thread.
+    """
+
+    def __init__(self, max_entries=1024, ttl_s=3600, disk_path=None, model_version="", max_disk_entries=100_000):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.model_version = model_version
+        self.max_disk_entries = max_disk_entries
+        # Rows written past max_disk_entries before a prune, so deletes run in batches
+        self.prune_slack = max(1, max_disk_entries // 10)
+        self._memory = OrderedDict()  # key -> (expires_at, result)
+        self._lock = threading.Lock()
+        # Separate lock: a slow sqlite call never holds up memory-tier lookups
+        self._db_lock = threading.Lock()
+        self._db = None
+        self._disk_rows = 0
+        if disk_path:
+            self._db = sqlite3.connect(str(disk_path), check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_results_expires ON results (expires_at)")
+            self._db.commit()
+            self._disk_rows = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+        # Stats
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def has_disk(self):
+        return self._db is not None
+
+    def key(self, data, namespace=""):
+        """`namespace` separates results of the same bytes computed under different request options."""
+        digest = hashlib.sha256()
+        digest.update(self.model_version.encode())
+        digest.update(b"\0")
+        digest.update(namespace.encode())
+        digest.update(b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Returns a copy of the cached result dict, or None. May read sqlite: keep off the event loop."""
+        result = self.get_memory(key)
+        return result if result is not None else self.get_disk(key)
+
+    def get_memory(self, key):
+        """Memory tier only (no I/O, safe on the event loop). A miss is counted here only without a disk tier."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(result)
+                del self._memory[key]
+            if self._db is None:
+                self.misses += 1
+            return None
+
+    def get_disk(self, key):
+        """sqlite tier lookup; a hit is promoted to the memory tier."""
+        if self._db is None:
+            return None
+        now = time.time()
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM results WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self._put_memory(key, row[0], row[1])
+            self.hits += 1
+            self.disk_hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        """Both tiers. May write sqlite: keep off the event loop."""
+        self.put_disk(key, self.put_memory(key, result))
+
+    def put_memory(self, key, result):
+        """Returns the serialized value, for `put_disk` (the caller may go on modifying `result`)."""
+        # Stored serialized: the value is immutable and its size is what it will cost on disk
+        value = json.dumps(result)
+        with self._lock:
+            self._put_memory(key, value, time.time() + self.ttl_s)
+        return value
+
+    def put_disk(self, key, value):
+        """
+        sqlite tier write of a value returned by `put_memory`; prunes once the
+        table is `prune_slack` rows over `max_disk_entries`.
+        """
+        if self._db is None:
+            return
+        expires_at = time.time() + self.ttl_s
+        with self._db_lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)", (key, value, expires_at)
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Result cache write failed: {e}")
+                return
+            self._disk_rows += 1  # over-counts replaced keys; _prune_disk recounts
+            if self._disk_rows > self.max_disk_entries + self.prune_slack:
+                self._prune_disk()
+
+    def prune_disk(self):
+        """Drop expired rows and keep at most `max_disk_entries` (soonest-expiring removed first)."""
+        if self._db is None:
+            return
+        with self._db_lock:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        self._db.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+        self._db.execute(
+            "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
+        self._db.commit()
+        self._disk_rows = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _put_memory(self, key, value, expires_at):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "disk": self._db is not None,
+            "disk_entries": self._disk_rows,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    def close(self):
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+                self._db = None
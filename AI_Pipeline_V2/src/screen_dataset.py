@@ -0,0 +1,70 @@
+import os
+import csv
+import sys
+import time
+import argparse
+from collections import Counter
+from pathlib import Path
+
+from tqdm import tqdm
+
+BASE_PATH = Path(__file__).parent.parent
+# ImageValidator lives with the backend AI service
+sys.path.append(os.environ.get("IMAGE_VALIDATOR_DIR", str(BASE_PATH.parent / "Backend" / "ai_service")))
+from image_validator import ImageValidator
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+
+def find_images(root_dir):
+    paths = []
+    for subdir, _, files in os.walk(root_dir):
+        for file in files:
+            if file.lower().endswith(IMAGE_EXTENSIONS):
+                paths.append(os.path.join(subdir, file))
+    return sorted(paths)
+
+
+def screen_dataset(root_dir, out_csv, workers=None, files_per_step=2048):
+    """
+    Runs ImageValidator.validate_many over every image under `root_dir` and writes
+    one CSV row per image (path, is_valid, error, brightness, blur_score, width, height),
+    so training data can be pre-filtered on the same checks the upload API applies.
+    """
+    print(f"Screening dataset: {root_dir}")
+    paths = find_images(root_dir)
+    print(f"Found {len(paths)} images")
+
+    validator = ImageValidator()
+    error_counts = Counter()
+    start = time.perf_counter()
+    with open(out_csv, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["path", "is_valid", "error", "brightness", "blur_score", "width", "height"])
+        for step in tqdm(range(0, len(paths), files_per_step), unit="step"):
+            chunk = paths[step:step + files_per_step]
+            result = validator.validate_many(chunk, workers=workers)
+            for path, ok, error, brightness, blur, w, h in zip(
+                chunk, result.is_valid, result.errors(), result.brightness, result.blur_score, result.width, result.height
+            ):
+                error_counts[error.name if error else "VALID"] += 1
+                writer.writerow([
+                    os.path.relpath(path, root_dir), int(ok), error.name if error else "",
+                    f"{brightness:.2f}", f"{blur:.2f}", w, h
+                ])
+    elapsed = time.perf_counter() - start
+
+    print(f"Scan complete in {elapsed:.1f}s ({len(paths) / max(elapsed, 1e-9):.0f} images/s). Report: {out_csv}")
+    for name, count in error_counts.most_common():
+        print(f"  {name:<16}{count:>8}")
+    return error_counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-filter training images with the upload ImageValidator checks")
+    parser.add_argument("--root", type=str, default=str(BASE_PATH / "data" / "raw"))
+    parser.add_argument("--out", type=str, default=str(BASE_PATH / "data" / "screening_report.csv"))
+    parser.add_argument("--workers", type=int, default=None, help="Decode threads (default: CPU count)")
+    args = parser.parse_args()
+
+    screen_dataset(args.root, args.out, workers=args.workers)
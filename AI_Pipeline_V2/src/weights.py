@@ -0,0 +1,94 @@
+import json
+import mmap
+import struct
+import torch
+from pathlib import Path
+
+# safetensors dtype codes -> torch dtypes
+SAFETENSORS_DTYPES = {
+    'F64': torch.float64,
+    'F32': torch.float32,
+    'F16': torch.float16,
+    'BF16': torch.bfloat16,
+    'I64': torch.int64,
+    'I32': torch.int32,
+    'I16': torch.int16,
+    'I8': torch.int8,
+    'U8': torch.uint8,
+    'BOOL': torch.bool,
+}
+
+
+def safetensors_path(checkpoint_path):
+    """Where convert_safetensors.py writes the weights of a .pth checkpoint (best_model.safetensors)."""
+    return Path(checkpoint_path).with_suffix('.safetensors')
+
+
+def load_mmap_state_dict(path):
+    """
+    Memory-map a .safetensors file and return (state_dict, metadata) without copying.
+
+    Every tensor is a view into one private (copy-on-write) mapping of the file, so the
+    weights live in the OS page cache: worker processes loading the same file share the
+    same physical pages, and nothing is unpickled. Tensors must be treated as read-only
+    (eval-mode inference never writes to parameters); a write would only copy that page.
+    """
+    with open(path, 'rb') as f:
+        header_len = struct.unpack('<Q', f.read(8))[0]
+        header = json.loads(f.read(header_len))
+        # ACCESS_COPY = MAP_PRIVATE: shared with other mappings until a page is written
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    metadata = header.pop('__metadata__', None) or {}
+    data_start = 8 + header_len
+    state_dict = {}
+    for name, info in header.items():
+        dtype = SAFETENSORS_DTYPES[info['dtype']]
+        shape = info['shape']
+        begin, end = info['data_offsets']
+        numel = 1
+        for dim in shape:
+            numel *= dim
+        if numel == 0:
+            state_dict[name] = torch.empty(shape, dtype=dtype)
+            continue
+        tensor = torch.frombuffer(buffer, dtype=dtype, count=numel, offset=data_start + begin)
+        assert tensor.numel() * tensor.element_size() == end - begin, f"Corrupt entry '{name}' in {path}"
+        state_dict[name] = tensor.view(shape)
+    return state_dict, metadata
+
+
+def load_weights(checkpoint_path, map_location='cpu', mmap_weights=True):
+    """
+    Load the state dict for a stage checkpoint, returns (state_dict, metadata).
+
+    With `mmap_weights`, a converted `.safetensors` sibling is memory-mapped when it exists;
+    otherwise the `.pth` is read with torch.load (raw state dict or {'model_state_dict': ...}).
+    """
+    st_path = safetensors_path(checkpoint_path)
+    if mmap_weights and st_path.exists():
+        state_dict, metadata = load_mmap_state_dict(st_path)
+        if torch.device(map_location).type != 'cpu':
+            state_dict = {k: v.to(map_location) for k, v in state_dict.items()}
+        return state_dict, metadata
+
+    checkpoint = torch.load(checkpoint_path, map_location=map_location)
+    if isinstance(checkpoint, dict) and 'model_state_dict' in checkpoint:
+        metadata = {k: v for k, v in checkpoint.items() if k != 'model_state_dict' and isinstance(v, str)}
+        return checkpoint['model_state_dict'], metadata
+    return checkpoint, {}
+
+
+def build_with_weights(factory, state_dict):
+    """
+    Instantiate `factory()` on the meta device (no memory for the random init) and
+    adopt the given tensors as its parameters/buffers (load_state_dict(assign=True)),
+    so mmap-backed weights are used in place instead of being copied.
+    """
+    with torch.device('meta'):
+        model = factory()
+    model.load_state_dict(state_dict, assign=True)
+    leftover = [name for name, t in list(model.named_parameters()) + list(model.named_buffers()) if t.is_meta]
+    if leftover:
+        raise RuntimeError(f"Tensors missing from checkpoint: {leftover[:5]}")
+    return model
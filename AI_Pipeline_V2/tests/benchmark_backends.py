@@ -0,0 +1,90 @@
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.append(str(SRC_DIR))
+
+
+def rss_mb():
+    """Current resident set size of this process in MB (Linux /proc, falls back to peak RSS)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_single(backend, batch_size, runs):
+    """Measure one backend in this process and print a JSON line."""
+    from inference_pipeline import InferencePipeline
+    import torch
+
+    base_rss = rss_mb()
+    start = time.perf_counter()
+    pipeline = InferencePipeline(backend=backend)
+    load_s = time.perf_counter() - start
+    loaded_rss = rss_mb()
+
+    x = torch.randn(batch_size, 3, 224, 224)
+    models = [m for m in (pipeline.stage1_model, pipeline.stage2_model, pipeline.stage3_model) if m is not None]
+
+    latencies = []
+    with torch.no_grad():
+        for m in models:
+            m(x)  # warm-up
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            for m in models:
+                m(x)
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    print(json.dumps({
+        "backend": backend,
+        "load_s": load_s,
+        "model_rss_mb": loaded_rss - base_rss,
+        "peak_rss_mb": rss_mb(),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency/RSS of eager PyTorch vs ONNX Runtime (Stages 1-3)")
+    parser.add_argument("--backends", nargs="+", default=['torch', 'onnx'])
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--single", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.single, args.batch_size, args.runs)
+        return
+
+    # Each backend runs in a fresh process so RSS numbers are not polluted by the other one
+    print(f"{'backend':<12}{'load s':>8}{'model RSS MB':>14}{'peak RSS MB':>13}{'p50 ms':>9}{'p99 ms':>9}")
+    for backend in args.backends:
+        out = subprocess.run(
+            [sys.executable, __file__, "--single", backend, "--batch-size", str(args.batch_size), "--runs", str(args.runs)],
+            capture_output=True, text=True, cwd=str(SRC_DIR)
+        )
+        lines = [l for l in out.stdout.splitlines() if l.startswith("{")]
+        if out.returncode != 0 or not lines:
+            print(f"{backend:<12} failed: {out.stderr.strip().splitlines()[-1] if out.stderr else 'no output'}")
+            continue
+        r = json.loads(lines[-1])
+        print(f"{r['backend']:<12}{r['load_s']:>8.2f}{r['model_rss_mb']:>14.1f}{r['peak_rss_mb']:>13.1f}{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
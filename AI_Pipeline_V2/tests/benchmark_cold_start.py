@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import urllib.request
+import urllib.error
+from pathlib import Path
+
+import numpy as np
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+# Add src to path
+sys.path.append(str(SRC_DIR))
+
+# (name, InferencePipeline kwargs)
+MODES = [
+    ("serial", dict(load_workers=1)),
+    ("parallel", dict(load_workers=4)),
+    ("parallel + lazy 2/3", dict(load_workers=4, lazy_stages=True)),
+]
+
+
+def child(kwargs):
+    """Runs in a fresh interpreter: import, load, first prediction. Prints one JSON line."""
+    t0 = time.perf_counter()
+    from inference_pipeline import InferencePipeline
+    t_import = time.perf_counter()
+    pipeline = InferencePipeline(**kwargs)
+    t_loaded = time.perf_counter()
+    image = np.random.default_rng(0).integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+    pipeline.predict(image)
+    t_first = time.perf_counter()
+    print(json.dumps({
+        "import_s": t_import - t0,
+        "load_s": t_loaded - t_import,
+        "first_predict_s": t_first - t_loaded,
+        "stage_load_s": pipeline.load_seconds,
+        "stages": pipeline.stage_status,
+    }))
+
+
+def run_mode(kwargs):
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", json.dumps(kwargs)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def wait_for(url, start, timeout):
+    """Seconds since `start` until `url` returns 200, or None on timeout."""
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resp:
+                if resp.status == 200:
+                    return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.05)
+    return None
+
+
+def bench_api(port, env_overrides, timeout):
+    """Cold start of a full replica: spawn uvicorn, time until /live and /ready answer 200."""
+    env = {**os.environ, **env_overrides}
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=SRC_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        live = wait_for(f"http://127.0.0.1:{port}/live", start, timeout)
+        ready = wait_for(f"http://127.0.0.1:{port}/ready", start, timeout)
+        return live, ready
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start time of a new inference replica")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--api", action="store_true", help="Also time uvicorn api:app until /live and /ready")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--child", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(json.loads(args.child))
+        return
+
+    print(f"{'mode':<22}{'import s':>10}{'load s':>10}{'1st predict s':>15}{'total s':>10}")
+    for name, kwargs in MODES:
+        runs = [run_mode(kwargs) for _ in range(args.runs)]
+        imp = np.median([r["import_s"] for r in runs])
+        load = np.median([r["load_s"] for r in runs])
+        first = np.median([r["first_predict_s"] for r in runs])
+        print(f"{name:<22}{imp:>10.2f}{load:>10.2f}{first:>15.2f}{imp + load + first:>10.2f}")
+        per_stage = ", ".join(f"{stage}={sec:.2f}s" for stage, sec in runs[-1]["stage_load_s"].items())
+        print(f"{'':<22}per stage: {per_stage}  {runs[-1]['stages']}")
+
+    if args.api:
+        print(f"\n{'api replica':<22}{'/live s':>10}{'/ready s':>10}")
+        for name, env in (("serial", {"MODEL_LOAD_WORKERS": "1"}), ("parallel", {}), ("parallel + lazy 2/3", {"LAZY_STAGES": "1"})):
+            live, ready = bench_api(args.port, env, args.timeout)
+            fmt = lambda v: f"{v:.2f}" if v is not None else "timeout"
+            print(f"{name:<22}{fmt(live):>10}{fmt(ready):>10}")
+
+
+if __name__ == "__main__":
+    main()
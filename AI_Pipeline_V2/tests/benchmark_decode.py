@@ -0,0 +1,91 @@
+import io
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+import torchvision.transforms as T
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from preprocessing import DecodedImage
+
+# Old InferencePipeline.common_transform
+OLD_TRANSFORM = T.Compose([
+    T.Resize((224, 224)),
+    T.ToTensor(),
+    T.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
+])
+# What Ultralytics' classify transform does with a numpy (BGR) source
+YOLO_TRANSFORM = T.Compose([T.Resize(224), T.CenterCrop(224), T.ToTensor()])
+
+
+def old_path(data):
+    """api.py decode -> np.array -> Image.fromarray in predict -> T.Compose; YOLO gets the full array."""
+    image = Image.open(io.BytesIO(data)).convert("RGB")
+    img_arr = np.array(image)
+    img_pil = Image.fromarray(img_arr).convert('RGB')
+    tensor = OLD_TRANSFORM(img_pil)
+    yolo = YOLO_TRANSFORM(Image.fromarray(cv2.cvtColor(img_arr, cv2.COLOR_BGR2RGB)))
+    return tensor, yolo
+
+
+def new_path(data):
+    """Single decode into DecodedImage; both inputs derived from the shared buffer."""
+    decoded = DecodedImage.from_bytes(data)
+    tensor = decoded.tensor()
+    yolo = YOLO_TRANSFORM(Image.fromarray(cv2.cvtColor(decoded.yolo_input(), cv2.COLOR_BGR2RGB)))
+    return tensor, yolo
+
+
+def measure(fn, payloads, runs):
+    fn(payloads[0])  # warm-up
+    start = time.perf_counter()
+    for i in range(runs):
+        fn(payloads[i % len(payloads)])
+    ms = (time.perf_counter() - start) / runs * 1000
+
+    tracemalloc.start()
+    fn(payloads[0])
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocs = sum(stat.count for stat in snapshot.statistics('filename'))
+    return ms, peak / 1e6, allocs
+
+
+def synthetic_jpegs(width, height, count):
+    rng = np.random.default_rng(0)
+    payloads = []
+    for _ in range(count):
+        # Smooth gradients + noise compress like a photo rather than pure noise
+        base = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+        img = (base + rng.normal(0, 20, size=(height, width, 3))).clip(0, 255).astype(np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(img).save(buf, format="JPEG", quality=90)
+        payloads.append(buf.getvalue())
+    return payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-request preprocessing cost: old PIL/numpy round-trips vs single decode")
+    parser.add_argument("--width", type=int, default=1600)
+    parser.add_argument("--height", type=int, default=1200)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    payloads = synthetic_jpegs(args.width, args.height, 4)
+    print(f"Synthetic JPEGs: {args.width}x{args.height}, {np.mean([len(p) for p in payloads]) / 1e6:.2f} MB each\n")
+    print(f"{'path':<16}{'ms/request':>12}{'peak traced MB':>16}{'live allocs':>13}")
+    for name, fn in (("old (PIL x2)", old_path), ("single decode", new_path)):
+        ms, peak_mb, allocs = measure(fn, payloads, args.runs)
+        print(f"{name:<16}{ms:>12.2f}{peak_mb:>16.2f}{allocs:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import secrets
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+# Add src to path
+sys.path.append(str(SRC_DIR))
+
+from benchmark_micro_batching import load_images, percentile, run_clients
+from benchmark_worker_memory import memory_kb
+
+
+def http_worker(mode, address, args):
+    """
+    Stand-in for one uvicorn worker. 'independent' builds its own InferencePipeline + MicroBatcher
+    (today's multi-worker setup); 'shared' only holds a RemotePipeline client to the inference server.
+    """
+    from preprocessing import DecodedImage
+    images = [DecodedImage.from_array(img) for img in load_images(args.image_dir, 16)]
+
+    if mode == "independent":
+        from inference_pipeline import InferencePipeline
+        from micro_batcher import MicroBatcher
+        pipeline = InferencePipeline()
+
+        async def run():
+            batcher = MicroBatcher(pipeline.predict_batch, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+            await batcher.start()
+            result = await run_clients(batcher.submit, images, args.concurrency, args.requests)
+            await batcher.stop()
+            return result
+    else:
+        from inference_server import RemotePipeline
+        remote = RemotePipeline(address).connect()
+
+        async def run():
+            return await run_clients(lambda image: asyncio.wrap_future(remote.submit(image)), images, args.concurrency, args.requests)
+
+    print("ready", flush=True)
+    sys.stdin.readline()  # start signal: all workers begin together
+    latencies, elapsed = asyncio.run(run())
+    print(json.dumps({"latencies": latencies, "elapsed": elapsed}), flush=True)
+    sys.stdin.read()  # stay alive until the parent has read our memory
+
+
+def run_mode(mode, args):
+    address = os.path.join(tempfile.mkdtemp(), "inference.sock")
+    # Inherited by the server and the worker processes
+    os.environ.setdefault("INFERENCE_SERVER_AUTHKEY", secrets.token_hex(32))
+    server = None
+    if mode == "shared":
+        server = subprocess.Popen(
+            [sys.executable, str(SRC_DIR / "inference_server.py"), "--address", address,
+             "--max-batch-size", str(args.max_batch_size), "--max-wait-ms", str(args.max_wait_ms)],
+            cwd=SRC_DIR, stdout=subprocess.DEVNULL
+        )
+
+    worker_args = [
+        "--image-dir", args.image_dir or "", "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+        "--max-batch-size", str(args.max_batch_size), "--max-wait-ms", str(args.max_wait_ms),
+    ]
+    workers = [
+        subprocess.Popen(
+            [sys.executable, __file__, "--worker", mode, "--address", address, *worker_args],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(args.workers)
+    ]
+    try:
+        for w in workers:
+            assert w.stdout.readline().strip() == "ready"
+        start = time.perf_counter()
+        for w in workers:
+            w.stdin.write("go\n")
+            w.stdin.flush()
+        results = [json.loads(w.stdout.readline()) for w in workers]
+        wall = time.perf_counter() - start
+
+        pids = [w.pid for w in workers] + ([server.pid] if server else [])
+        memory = [memory_kb(pid) for pid in pids]
+    finally:
+        for w in workers:
+            w.stdin.close()
+            w.wait()
+        if server:
+            server.terminate()
+            server.wait()
+
+    latencies = [lat for r in results for lat in r["latencies"]]
+    return {
+        "throughput": len(latencies) / wall,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "rss_mb": sum(rss for rss, _, _ in memory) / 1024,
+        "pss_mb": sum(pss for _, pss, _ in memory) / 1024,
+        "server_pss_mb": memory[-1][1] / 1024 if server else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="N independent pipelines vs one shared inference server")
+    parser.add_argument("--workers", type=int, default=4, help="HTTP worker processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per worker")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    parser.add_argument("--image-dir", type=str, default=None)
+    parser.add_argument("--worker", type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--address", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        args.image_dir = args.image_dir or None
+        http_worker(args.worker, args.address, args)
+        return
+
+    total = args.workers * args.concurrency * args.requests
+    print(f"{args.workers} workers x {args.concurrency} clients x {args.requests} requests = {total} requests per mode\n")
+    print(f"{'mode':<28}{'img/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'sum RSS MB':>12}{'sum PSS MB':>12}")
+    for mode, name in (("independent", f"{args.workers} independent pipelines"), ("shared", "1 shared inference server")):
+        r = run_mode(mode, args)
+        print(f"{name:<28}{r['throughput']:>8.1f}{r['p50']:>9.1f}{r['p95']:>9.1f}{r['rss_mb']:>12.1f}{r['pss_mb']:>12.1f}")
+        if r["server_pss_mb"] is not None:
+            print(f"{'':<28}(server process PSS {r['server_pss_mb']:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
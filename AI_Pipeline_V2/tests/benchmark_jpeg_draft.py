@@ -0,0 +1,70 @@
+import io
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add src and the backend validator to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.path.append(str(Path(__file__).parent.parent.parent / "Backend" / "ai_service"))
+
+from preprocessing import DecodedImage
+from image_validator import ImageValidator
+
+
+def synthetic_phone_jpegs(count, width=4000, height=3000):
+    """Photo-like 12MP JPEGs (smooth gradients + sensor-like noise)."""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    payloads = []
+    for i in range(count):
+        base = 128 + 60 * np.sin(x / (300 + 50 * i)) * np.cos(y / 400)
+        img = (base[..., None] + rng.normal(0, 12, size=(height, width, 3))).clip(0, 255).astype(np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(img).save(buf, format="JPEG", quality=92)
+        payloads.append(buf.getvalue())
+    return payloads
+
+
+class FullDecodeValidator(ImageValidator):
+    """Validator with draft decoding disabled, i.e. the previous behaviour."""
+    DRAFT_FORMATS = set()
+
+
+def bench(name, fn, payloads, runs):
+    fn(payloads[0])  # warm-up
+    start = time.perf_counter()
+    for i in range(runs):
+        out = fn(payloads[i % len(payloads)])
+    ms = (time.perf_counter() - start) / runs * 1000
+    return name, ms, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full vs DCT-scaled (draft) JPEG decoding on 4000x3000 uploads")
+    parser.add_argument("--count", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=12)
+    args = parser.parse_args()
+
+    print("Generating synthetic 4000x3000 JPEGs...")
+    payloads = synthetic_phone_jpegs(args.count)
+    print(f"Average size: {np.mean([len(p) for p in payloads]) / 1e6:.2f} MB\n")
+
+    rows = [
+        bench("api decode (full)", lambda d: DecodedImage.from_bytes(d, min_size=None), payloads, args.runs),
+        bench("api decode (draft)", lambda d: DecodedImage.from_bytes(d), payloads, args.runs),
+        bench("validate (full)", lambda d: FullDecodeValidator().validate(d), payloads, args.runs),
+        bench("validate (draft)", lambda d: ImageValidator().validate(d), payloads, args.runs),
+    ]
+
+    print(f"{'path':<22}{'ms/image':>10}{'decoded size':>16}{'decode buffer MB':>18}")
+    for name, ms, out in rows:
+        w, h = out.size if isinstance(out, DecodedImage) else (out.image.size if out.image else (0, 0))
+        print(f"{name:<22}{ms:>10.1f}{f'{w}x{h}':>16}{w * h * 3 / 1e6:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
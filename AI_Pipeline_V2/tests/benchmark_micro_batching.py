@@ -0,0 +1,109 @@
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from inference_pipeline import InferencePipeline
+from micro_batcher import MicroBatcher
+
+
+def load_images(image_dir, count):
+    """Load test images from a directory, or generate random ones if none is given."""
+    images = []
+    if image_dir:
+        paths = sorted(p for p in Path(image_dir).rglob("*") if p.suffix.lower() in (".jpg", ".jpeg", ".png"))
+        for path in paths[:count]:
+            images.append(np.array(Image.open(path).convert("RGB")))
+    rng = np.random.default_rng(42)
+    while len(images) < count:
+        images.append(rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8))
+    return images
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(np.ceil(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+async def run_clients(submit, images, concurrency, requests_per_client):
+    latencies = []
+
+    async def client(client_id):
+        for i in range(requests_per_client):
+            image = images[(client_id * requests_per_client + i) % len(images)]
+            start = time.perf_counter()
+            await submit(image)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(c) for c in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+async def bench_current_path(pipeline, images, concurrency, requests_per_client):
+    """Current /predict behaviour: one predict() call per request, batch of one."""
+    loop = asyncio.get_running_loop()
+    lock = asyncio.Lock()
+
+    async def submit(image):
+        async with lock:
+            return await loop.run_in_executor(None, pipeline.predict, image)
+
+    return await run_clients(submit, images, concurrency, requests_per_client)
+
+
+async def bench_batched_path(pipeline, images, concurrency, requests_per_client, max_batch_size, max_wait_ms):
+    batcher = MicroBatcher(pipeline.predict_batch, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    await batcher.start()
+    try:
+        latencies, elapsed = await run_clients(batcher.submit, images, concurrency, requests_per_client)
+    finally:
+        await batcher.stop()
+    return latencies, elapsed, batcher.stats()
+
+
+def report(name, latencies, elapsed):
+    print(f"\n--- {name} ---")
+    print(f"  Requests   : {len(latencies)}")
+    print(f"  Throughput : {len(latencies) / elapsed:.1f} img/s")
+    print(f"  p50        : {percentile(latencies, 50):.1f} ms")
+    print(f"  p99        : {percentile(latencies, 99):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark micro-batched /predict against the batch-of-one path")
+    parser.add_argument("--images", type=str, default=None, help="Directory of test images (random images if omitted)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests-per-client", type=int, default=8)
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    print("Initializing Pipeline...")
+    pipeline = InferencePipeline()
+    images = load_images(args.images, 64)
+
+    # Warm-up
+    pipeline.predict_batch(images[:2])
+
+    latencies, elapsed = asyncio.run(bench_current_path(pipeline, images, args.concurrency, args.requests_per_client))
+    report("Current path (predict, batch of 1)", latencies, elapsed)
+
+    latencies, elapsed, stats = asyncio.run(bench_batched_path(
+        pipeline, images, args.concurrency, args.requests_per_client, args.max_batch_size, args.max_wait_ms
+    ))
+    report(f"Micro-batched (max_batch_size={args.max_batch_size}, max_wait_ms={args.max_wait_ms})", latencies, elapsed)
+    print(f"  Avg batch  : {stats['avg_batch_size']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
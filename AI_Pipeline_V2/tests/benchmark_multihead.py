@@ -0,0 +1,54 @@
+import sys
+import time
+from pathlib import Path
+
+import torch
+import timm
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from multihead_model import SharedBackboneMultiHead, STAGE2_CLASSES, STAGE3_CLASSES
+
+
+def param_mb(*models):
+    return sum(p.numel() * p.element_size() for m in models for p in m.parameters()) / 1e6
+
+
+def time_ms(fn, runs=20):
+    with torch.no_grad():
+        fn()  # warm-up
+        start = time.perf_counter()
+        for _ in range(runs):
+            fn()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    """Latency/memory of a diabetic_foot image (worst case: all 3 stages) with separate vs shared backbones."""
+    torch.set_grad_enabled(False)
+    x = torch.randn(1, 3, 224, 224)
+
+    stage1 = timm.create_model('tf_efficientnet_b0', pretrained=False, num_classes=1).eval()
+    stage2 = timm.create_model('tf_efficientnet_b0', pretrained=False, num_classes=len(STAGE2_CLASSES)).eval()
+    stage3 = timm.create_model('tf_efficientnet_b0', pretrained=False, num_classes=len(STAGE3_CLASSES)).eval()
+    multihead = SharedBackboneMultiHead().eval()
+
+    def separate():
+        stage1(x), stage2(x), stage3(x)
+
+    def shared():
+        f = multihead.forward_features(x)
+        multihead.wound_head(f), multihead.type_head(f), multihead.severity_head(f)
+
+    sep_ms = time_ms(separate)
+    shared_ms = time_ms(shared)
+
+    print("--- Stages 1-3, one wound image ---")
+    print(f"Separate backbones : {sep_ms:7.1f} ms | {param_mb(stage1, stage2, stage3):6.1f} MB params")
+    print(f"Shared backbone    : {shared_ms:7.1f} ms | {param_mb(multihead):6.1f} MB params")
+    print(f"Speedup            : {sep_ms / shared_ms:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
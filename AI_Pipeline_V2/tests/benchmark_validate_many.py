@@ -0,0 +1,67 @@
+import io
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add the backend validator to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "Backend" / "ai_service"))
+
+from image_validator import ImageValidator
+
+
+def synthetic_jpegs(count, width=1600, height=1200):
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    payloads = []
+    for i in range(count):
+        base = 128 + 60 * np.sin(x / (80 + 10 * (i % 7))) * np.cos(y / 120)
+        img = (base[..., None] + rng.normal(0, 8, size=(height, width, 3))).clip(0, 255).astype(np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(img).save(buf, format="JPEG", quality=90)
+        payloads.append(buf.getvalue())
+    return payloads
+
+
+def check_laplacian(validator):
+    """The slice-based batch Laplacian must match the padded reference exactly (up to float32 rounding)."""
+    rng = np.random.default_rng(1)
+    images = rng.integers(0, 256, size=(4, 64, 48)).astype(np.float32)
+    batch = validator._laplacian_variance_batch(images)
+    reference = np.array([validator._laplacian_variance(img.astype(np.float64)) for img in images])
+    rel = float(np.max(np.abs(batch - reference) / reference))
+    print(f"{'✅' if rel < 1e-4 else '❌'} batch vs reference Laplacian variance: max rel diff {rel:.2e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="validate() loop vs validate_many() for bulk screening")
+    parser.add_argument("--count", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    validator = ImageValidator()
+    check_laplacian(validator)
+
+    print(f"Generating {args.count} synthetic 1600x1200 JPEGs...")
+    payloads = synthetic_jpegs(args.count)
+
+    start = time.perf_counter()
+    single = [validator.validate(p) for p in payloads]
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = validator.validate_many(payloads, workers=args.workers)
+    many_s = time.perf_counter() - start
+
+    agree = sum(s.is_valid == b for s, b in zip(single, batch.is_valid))
+    print(f"\n{'path':<28}{'images/s':>10}{'s total':>10}")
+    print(f"{'validate() loop':<28}{args.count / loop_s:>10.1f}{loop_s:>10.2f}")
+    print(f"{'validate_many()':<28}{args.count / many_s:>10.1f}{many_s:>10.2f}")
+    print(f"\nSame verdict for {agree}/{args.count} images")
+
+
+if __name__ == "__main__":
+    main()
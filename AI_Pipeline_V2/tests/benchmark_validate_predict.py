@@ -0,0 +1,79 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add src and the backend validator to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.path.append(str(Path(__file__).parent.parent.parent / "Backend" / "ai_service"))
+
+from preprocessing import DecodedImage
+from image_validator import ImageValidator
+from benchmark_jpeg_draft import synthetic_phone_jpegs
+
+
+class LegacyValidator(ImageValidator):
+    """Previous quality checks: full-size grayscale for brightness, then copy + thumbnail + a second grayscale for blur."""
+
+    def _quality_grayscale(self, image):
+        self._rgb = image
+        return np.array(image.convert("L"))  # brightness is the mean of this
+
+    def _laplacian_variance(self, grayscale):
+        small = self._rgb.copy()
+        small.thumbnail((self.BLUR_CHECK_SIZE, self.BLUR_CHECK_SIZE))
+        return super()._laplacian_variance(np.array(small.convert("L"), dtype=np.float64))
+
+
+def before(validator, pipeline, data):
+    """Validator decodes and checks, then the API decodes the same bytes again."""
+    validator.validate(data)
+    image = DecodedImage.from_bytes(data)
+    return pipeline.predict(image) if pipeline else image
+
+
+def after(validator, pipeline, data):
+    """One decode: the validator's RGB image goes straight to the pipeline."""
+    result = validator.validate(data)
+    image = DecodedImage.from_pil(result.image)
+    return pipeline.predict(image) if pipeline else image
+
+
+def bench(fn, validator, pipeline, payloads, runs):
+    fn(validator, pipeline, payloads[0])  # warm-up
+    times = []
+    for i in range(runs):
+        start = time.perf_counter()
+        fn(validator, pipeline, payloads[i % len(payloads)])
+        times.append((time.perf_counter() - start) * 1000)
+    return np.median(times), np.percentile(times, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end validate + predict latency: separate decodes vs fused")
+    parser.add_argument("--count", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--skip-predict", action="store_true", help="Only time validation + decode")
+    args = parser.parse_args()
+
+    pipeline = None
+    if not args.skip_predict:
+        from inference_pipeline import InferencePipeline
+        pipeline = InferencePipeline()
+
+    print("Generating synthetic 4000x3000 JPEGs...")
+    payloads = synthetic_phone_jpegs(args.count)
+
+    print(f"\n{'path':<40}{'p50 ms':>9}{'p95 ms':>9}")
+    for name, fn, validator in (
+        ("before (2x grayscale, 2 decodes)", before, LegacyValidator()),
+        ("after (shared grayscale, 1 decode)", after, ImageValidator()),
+    ):
+        p50, p95 = bench(fn, validator, pipeline, payloads, args.runs)
+        print(f"{name:<40}{p50:>9.1f}{p95:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
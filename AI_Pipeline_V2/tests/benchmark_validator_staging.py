@@ -0,0 +1,102 @@
+import io
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add the backend validator to path
+sys.path.append(str(Path(__file__).parent.parent.parent / "Backend" / "ai_service"))
+
+from image_validator import ImageValidator, ValidationError, ValidationResult
+
+
+class DecodeFirstValidator(ImageValidator):
+    """Previous ordering: decode the pixels, then check format and dimensions."""
+
+    def validate(self, file_bytes):
+        try:
+            image = Image.open(io.BytesIO(file_bytes))
+            image_format = image.format
+            width, height = image.size
+            if image_format in self.DRAFT_FORMATS:
+                image.draft("RGB", (self.BLUR_CHECK_SIZE, self.BLUR_CHECK_SIZE))
+            image.load()
+        except Exception:
+            return ValidationResult.failure(ValidationError.CORRUPTED)
+        if image_format not in self.ALLOWED_FORMATS:
+            return ValidationResult.failure(ValidationError.INVALID_FORMAT)
+        if width < self.MIN_DIMENSION or height < self.MIN_DIMENSION:
+            return ValidationResult.failure(ValidationError.TOO_SMALL)
+        if width > self.MAX_DIMENSION or height > self.MAX_DIMENSION:
+            return ValidationResult.failure(ValidationError.TOO_LARGE)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        grayscale = self._quality_grayscale(image)
+        brightness = float(np.mean(grayscale))
+        result = self._check_brightness(brightness) or self._check_blur(self._laplacian_variance(grayscale))
+        return result or ValidationResult.success(image, brightness=brightness)
+
+
+def encode(width, height, fmt, seed, **kwargs):
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = 128 + 60 * np.sin(x / 90) * np.cos(y / 110)
+    img = (base[..., None] + rng.normal(0, 10, size=(height, width, 3))).clip(0, 255).astype(np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(img).save(buf, format=fmt, **kwargs)
+    return buf.getvalue()
+
+
+def mixed_corpus():
+    """(category, payload) pairs: valid phone photos plus the usual rejects."""
+    valid = encode(4000, 3000, "JPEG", 0, quality=90)
+    corpus = [
+        ("valid JPEG 4000x3000", valid),
+        ("valid PNG 1200x900", encode(1200, 900, "PNG", 1)),
+        ("too large JPEG 6000x4500", encode(6000, 4500, "JPEG", 2, quality=90)),
+        ("too large PNG 5000x5000", encode(5000, 5000, "PNG", 3)),
+        ("wrong format BMP 3000x2000", encode(3000, 2000, "BMP", 4)),
+        ("wrong format TIFF 3000x2000", encode(3000, 2000, "TIFF", 5)),
+        ("too small JPEG 80x60", encode(80, 60, "JPEG", 6)),
+        ("truncated JPEG", valid[: len(valid) // 2]),
+    ]
+    return corpus
+
+
+def cpu_ms(validator, payload, runs):
+    validator.validate(payload)  # warm-up
+    start = time.process_time()
+    for _ in range(runs):
+        result = validator.validate(payload)
+    return (time.process_time() - start) / runs * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU time per upload: decode-first vs header-first validation")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print("Generating mixed corpus...")
+    corpus = mixed_corpus()
+    old, new = DecodeFirstValidator(), ImageValidator()
+
+    print(f"\n{'upload':<30}{'verdict':<18}{'decode-first ms':>16}{'header-first ms':>17}")
+    total_old = total_new = 0.0
+    for category, payload in corpus:
+        old_ms, old_result = cpu_ms(old, payload, args.runs)
+        new_ms, new_result = cpu_ms(new, payload, args.runs)
+        total_old += old_ms
+        total_new += new_ms
+        verdict = "valid" if new_result.is_valid else new_result.error.name
+        if old_result.is_valid != new_result.is_valid:
+            verdict += " (!)"
+        print(f"{category:<30}{verdict:<18}{old_ms:>16.1f}{new_ms:>17.1f}")
+    saved = (1 - total_new / total_old) * 100 if total_old else 0.0
+    print(f"{'total (one of each)':<48}{total_old:>16.1f}{total_new:>17.1f}   ({saved:.0f}% CPU saved)")
+
+
+if __name__ == "__main__":
+    main()
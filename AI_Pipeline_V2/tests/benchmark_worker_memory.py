@@ -0,0 +1,76 @@
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+
+def worker(mmap_weights):
+    """
+    One replica worker, like a uvicorn worker process: load the pipeline, report the
+    load time, then stay alive (so the parent can read its memory) until stdin closes.
+    """
+    start = time.perf_counter()
+    from inference_pipeline import InferencePipeline
+    InferencePipeline(mmap_weights=mmap_weights, load_workers=4)
+    print(json.dumps({"startup_s": time.perf_counter() - start}), flush=True)
+    sys.stdin.read()
+
+
+def memory_kb(pid):
+    """RSS, PSS (RSS with shared pages divided among their users) and shared pages from /proc."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    shared = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    return fields.get("Rss", 0), fields.get("Pss", 0), shared
+
+
+def run(workers, mmap_weights):
+    procs = [
+        subprocess.Popen(
+            [sys.executable, __file__, "--worker", "1" if mmap_weights else "0"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(workers)
+    ]
+    try:
+        # Workers start together, like `uvicorn --workers N`
+        startups = [json.loads(p.stdout.readline())["startup_s"] for p in procs]
+        memory = [memory_kb(p.pid) for p in procs]
+    finally:
+        for p in procs:
+            p.stdin.close()
+            p.wait()
+    return startups, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker RSS/PSS and startup time: torch.load (.pth) vs mmap (.safetensors)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--worker", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        worker(args.worker == "1")
+        return
+
+    print("Run `python src/convert_safetensors.py` first, otherwise both rows load the .pth files.\n")
+    print(f"{'weights':<20}{'worker':>7}{'startup s':>11}{'RSS MB':>9}{'PSS MB':>9}{'shared MB':>11}")
+    for name, mmap_weights in (("torch.load (.pth)", False), ("mmap (.safetensors)", True)):
+        startups, memory = run(args.workers, mmap_weights)
+        for i, (startup, (rss, pss, shared)) in enumerate(zip(startups, memory)):
+            print(f"{name if i == 0 else '':<20}{i:>7}{startup:>11.2f}{rss / 1024:>9.1f}{pss / 1024:>9.1f}{shared / 1024:>11.1f}")
+        total_pss = sum(pss for _, pss, _ in memory) / 1024
+        print(f"{'':<20}{'total':>7}{max(startups):>11.2f}{'':>9}{total_pss:>9.1f}\n")
+
+
+if __name__ == "__main__":
+    main()
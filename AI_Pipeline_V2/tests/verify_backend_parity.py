@@ -0,0 +1,84 @@
+import sys
+import argparse
+from pathlib import Path
+
+import numpy as np
+import torch
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from inference_pipeline import InferencePipeline
+from preprocessing import DecodedImage, batch_tensor
+
+DATA_DIR = Path(__file__).parent.parent / "data" / "raw"
+ATOL = 1e-3  # max abs difference allowed on probabilities
+
+
+def fixed_image_set(count=16):
+    """First `count` images under data/raw (sorted), topped up with seeded random images."""
+    images = []
+    if DATA_DIR.exists():
+        paths = sorted(p for p in DATA_DIR.rglob("*") if p.suffix.lower() in (".jpg", ".jpeg", ".png"))
+        images.extend(paths[:count])
+    rng = np.random.default_rng(0)
+    while len(images) < count:
+        images.append(rng.integers(0, 256, size=(300, 400, 3), dtype=np.uint8))
+    return images
+
+
+def stage_probs(pipeline, img_tensor):
+    """Raw per-stage probabilities for the whole tensor, bypassing the cascade."""
+    with torch.no_grad():
+        if pipeline.feature_extractor is not None:
+            img_tensor = pipeline.feature_extractor(img_tensor)
+        probs = {'stage1': torch.sigmoid(pipeline.stage1_model(img_tensor)).view(-1).numpy()}
+        if pipeline.stage2_model:
+            probs['stage2'] = torch.softmax(pipeline.stage2_model(img_tensor), dim=1).numpy()
+        if pipeline.stage3_model:
+            probs['stage3'] = torch.softmax(pipeline.stage3_model(img_tensor), dim=1).numpy()
+    return probs
+
+
+def verify_parity(backend, multihead_path=None):
+    print(f"--- Parity: torch vs {backend} ---")
+    reference = InferencePipeline(multihead_path=multihead_path, backend='torch')
+    candidate = InferencePipeline(multihead_path=multihead_path, backend=backend)
+
+    images = fixed_image_set()
+    img_tensor = batch_tensor([DecodedImage.load(img) for img in images])
+
+    ok = True
+    ref_probs = stage_probs(reference, img_tensor)
+    cand_probs = stage_probs(candidate, img_tensor)
+    for stage, ref in ref_probs.items():
+        diff = float(np.max(np.abs(ref - cand_probs[stage])))
+        status = "✅" if diff <= ATOL else "❌"
+        ok &= diff <= ATOL
+        print(f"  {status} {stage}: max |Δp| = {diff:.2e}")
+
+    # End-to-end verdicts (includes Stage 0)
+    ref_results = reference.predict_batch(images)
+    cand_results = candidate.predict_batch(images)
+    mismatches = [
+        (i, r['final_verdict'], c['final_verdict'])
+        for i, (r, c) in enumerate(zip(ref_results, cand_results))
+        if r['final_verdict'] != c['final_verdict']
+    ]
+    s0_diff = max(abs(r['stage0']['confidence'] - c['stage0']['confidence']) for r, c in zip(ref_results, cand_results))
+    ok &= not mismatches and s0_diff <= ATOL
+    print(f"  {'✅' if s0_diff <= ATOL else '❌'} stage0: max |Δconf| = {s0_diff:.2e}")
+    print(f"  {'✅' if not mismatches else '❌'} final verdicts: {len(images) - len(mismatches)}/{len(images)} identical")
+    for i, r, c in mismatches:
+        print(f"     image {i}: torch='{r}' {backend}='{c}'")
+
+    print("PASS" if ok else "FAIL")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check exported backends against eager PyTorch")
+    parser.add_argument("--backend", choices=['onnx', 'torchscript'], default='onnx')
+    parser.add_argument("--multihead", type=str, default=None)
+    args = parser.parse_args()
+    sys.exit(0 if verify_parity(args.backend, args.multihead) else 1)
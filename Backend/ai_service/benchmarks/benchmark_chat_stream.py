@@ -0,0 +1,61 @@
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add the service and the AI-Triage directory to path
+SERVICE_DIR = Path(__file__).parent.parent
+sys.path.append(str(SERVICE_DIR))
+sys.path.append(str(SERVICE_DIR.parent.parent / "AI-Triage"))
+
+import option_b_llm_triage as triage
+from mock_llm_server import MockAsyncChatClient
+
+MESSAGES = {
+    "Emergency": "my father has chest pain and is sweating a lot",
+    "High": "my son has a fever of 39.5 and vomiting since yesterday",
+    "Low": "I feel tired and I have a cold with a mild cough",
+}
+
+
+def new_chatbot(client):
+    chatbot = triage.TriageChatbot(provider="openai")
+    chatbot.triage.client_available = True
+    triage.get_llm_client = lambda provider, api_key, asynchronous=False: client
+    return chatbot
+
+
+async def time_achat(client, message):
+    start = time.perf_counter()
+    reply = await new_chatbot(client).achat(message)
+    return (time.perf_counter() - start) * 1000, reply["urgency"]
+
+
+async def time_stream(client, message):
+    """Milliseconds to the first urgency event, first token and final reply."""
+    first = {}
+    start = time.perf_counter()
+    async for event, data in new_chatbot(client).astream(message):
+        first.setdefault(event, (time.perf_counter() - start) * 1000)
+        if event == "reply":
+            urgency = data["urgency"]
+    return first.get("urgency", float("nan")), first.get("token", float("nan")), first["reply"], urgency
+
+
+async def main(args):
+    client = MockAsyncChatClient(first_token_ms=args.first_token_ms, token_ms=args.token_ms)
+    triage.CLASSIFICATION_CACHE.max_size = 0  # every call goes to the provider
+    print(f"Mock provider: first token {args.first_token_ms:.0f} ms, {args.token_ms:.0f} ms per token\n")
+    print(f"{'message':<22}{'/chat ms':>10}{'stream: urgency':>17}{'first token':>13}{'final':>8}  urgency")
+    for name, message in MESSAGES.items():
+        chat_ms, _ = await time_achat(client, message)
+        urgency_ms, token_ms, final_ms, urgency = await time_stream(client, message)
+        print(f"{name:<22}{chat_ms:>10.0f}{urgency_ms:>17.0f}{token_ms:>13.0f}{final_ms:>8.0f}  {urgency}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time to urgency: /chat vs /chat/stream")
+    parser.add_argument("--first-token-ms", type=float, default=400)
+    parser.add_argument("--token-ms", type=float, default=15)
+    asyncio.run(main(parser.parse_args()))
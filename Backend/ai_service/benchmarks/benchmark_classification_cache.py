@@ -0,0 +1,56 @@
+import csv
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add the service and the AI-Triage directory to path
+SERVICE_DIR = Path(__file__).parent.parent
+AI_TRIAGE_DIR = SERVICE_DIR.parent.parent / "AI-Triage"
+sys.path.append(str(SERVICE_DIR))
+sys.path.append(str(AI_TRIAGE_DIR))
+
+import option_b_llm_triage as triage
+import classification_cache
+from mock_llm_server import MockChatClient
+
+
+def replay(messages, client):
+    """Every message is the first turn of a new session, as in production."""
+    triage.CLASSIFICATION_CACHE.clear()
+    calls_before = len(client.prompt_chars)
+    start = time.perf_counter()
+    for message in messages:
+        llm = triage.TriageLLM(provider="openai")
+        llm.client, llm.client_available = client, True
+        llm.classify(message)
+    elapsed = time.perf_counter() - start
+    return triage.CLASSIFICATION_CACHE.stats()["hit_ratio"], len(client.prompt_chars) - calls_before, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="First-message cache hit ratio: exact vs normalized keys")
+    parser.add_argument("--csv", type=str, default=str(AI_TRIAGE_DIR / "triage_dataset_egypt.csv"))
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=5, help="Mock provider latency per call")
+    args = parser.parse_args()
+
+    try:
+        with open(args.csv, newline="", encoding="utf-8") as f:
+            messages = [row["text"] for _, row in zip(range(args.messages), csv.DictReader(f))]
+    except FileNotFoundError:
+        sys.exit(f"{args.csv} not found - run AI-Triage/generate_egypt_dataset.py first")
+
+    client = MockChatClient(latency_ms=args.latency_ms)
+    normalize = classification_cache.normalize_message
+    print(f"{len(messages):,} first messages, mock provider latency {args.latency_ms:.0f} ms\n")
+    print(f"{'cache key':<22}{'hit ratio':>10}{'LLM calls':>11}{'s total':>9}")
+    for name, key_fn in (("exact text", lambda text: text), ("normalized (after)", normalize)):
+        classification_cache.normalize_message = key_fn
+        hit_ratio, calls, elapsed = replay(messages, client)
+        print(f"{name:<22}{hit_ratio:>10.1%}{calls:>11,}{elapsed:>9.2f}")
+    classification_cache.normalize_message = normalize
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add the service and the AI-Triage directory to path
+SERVICE_DIR = Path(__file__).parent.parent
+sys.path.append(str(SERVICE_DIR))
+sys.path.append(str(SERVICE_DIR.parent.parent / "AI-Triage"))
+
+import option_b_llm_triage as triage
+from mock_llm_server import MockChatClient
+
+TURNS = [
+    "my mother is 70 and has had a fever of 38.5 since yesterday",
+    "she also has a dry cough and feels very tired",
+    "now the fever went up to 39 this morning",
+    "she is diabetic and takes insulin twice a day",
+    "she has not been eating much and seems a bit confused",
+    "her lips look dry and she has not passed urine since the morning",
+]
+
+
+class StoredNotSentLLM(triage.TriageLLM):
+    """Previous behaviour: full replies stored forever, but each call sent only the current message."""
+
+    def _remember(self, role, content):
+        self.conversation_history.append({"role": role, "content": content})
+
+    def _openai_messages(self, user_message):
+        return [{"role": "system", "content": self.system_prompt}, {"role": "user", "content": user_message}]
+
+    def _accept_response(self, response_text):
+        result = self._parse_response(response_text)
+        result['source'] = 'LLM'
+        self.conversation_history.append({"role": "assistant", "content": json.dumps(result)})
+        return result
+
+
+class FullHistoryLLM(StoredNotSentLLM):
+    """Naive multi-turn context: the whole stored history goes out with every call."""
+
+    def _openai_messages(self, user_message):
+        return [{"role": "system", "content": self.system_prompt}] + self.conversation_history
+
+
+def run(llm_class, conversations, turns, client):
+    latencies, state_bytes = [], []
+    start_calls = len(client.prompt_chars)
+    for _ in range(conversations):
+        llm = llm_class(provider="openai")
+        llm.client, llm.client_available = client, True
+        for turn in range(turns):
+            start = time.perf_counter()
+            llm.classify(TURNS[turn % len(TURNS)])
+            latencies.append((time.perf_counter() - start) * 1000)
+        state_bytes.append(len(json.dumps([llm.conversation_history, llm.current_symptoms])))
+    prompts = client.prompt_chars[start_calls:]
+    last_turn = prompts[turns - 1::turns]
+    return {
+        "avg_tokens": sum(prompts) / len(prompts) / 4,
+        "last_turn_tokens": sum(last_turn) / len(last_turn) / 4,
+        "avg_ms": sum(latencies) / len(latencies),
+        "state_kb": sum(state_bytes) / len(state_bytes) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt size and latency for multi-turn triage conversations")
+    parser.add_argument("--conversations", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mock provider base latency")
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=100, help="Mock provider prompt processing cost")
+    args = parser.parse_args()
+
+    client = MockChatClient(latency_ms=args.latency_ms, ms_per_1k_prompt_tokens=args.ms_per_1k_tokens)
+    print(f"{args.conversations} conversations x {args.turns} turns "
+          f"(budget {triage.CONTEXT_TOKEN_BUDGET} tokens, window {triage.CONTEXT_MAX_MESSAGES} messages)\n")
+    print(f"{'context':<34}{'avg prompt tok':>15}{'turn-N tok':>12}{'avg ms':>9}{'state KB':>10}")
+    for name, llm_class in (
+        ("stored, not sent (before)", StoredNotSentLLM),
+        ("full history sent", FullHistoryLLM),
+        ("windowed + symptom summary (after)", triage.TriageLLM),
+    ):
+        r = run(llm_class, args.conversations, args.turns, client)
+        print(f"{name:<34}{r['avg_tokens']:>15.0f}{r['last_turn_tokens']:>12.0f}{r['avg_ms']:>9.1f}{r['state_kb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
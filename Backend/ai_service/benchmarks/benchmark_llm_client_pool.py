@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import argparse
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the service and the AI-Triage directory to path
+SERVICE_DIR = Path(__file__).parent.parent
+sys.path.append(str(SERVICE_DIR))
+sys.path.append(str(SERVICE_DIR.parent.parent / "AI-Triage"))
+
+from mock_llm_server import start_in_thread
+
+FIRST_MESSAGE = "my father has chest pain and sweating since an hour"
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+def run_sessions(make_chatbot, sessions):
+    """Every session is created and sends its first message at the same moment."""
+    barrier = threading.Barrier(sessions)
+
+    def one_session(_):
+        barrier.wait()
+        start = time.perf_counter()
+        result = make_chatbot().chat(FIRST_MESSAGE)
+        return (time.perf_counter() - start) * 1000, result["full_classification"].get("source")
+
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        return list(pool.map(one_session, range(sessions)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-session LLM clients vs one pooled client")
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--max-connections", type=int, default=None, help="LLM_MAX_CONNECTIONS for the pooled client")
+    args = parser.parse_args()
+
+    server, base_url = start_in_thread(latency_ms=args.latency_ms)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "mock")
+    if args.max_connections:
+        os.environ["LLM_MAX_CONNECTIONS"] = str(args.max_connections)
+
+    import option_b_llm_triage as triage
+    from openai import OpenAI
+
+    class PerSessionClientLLM(triage.TriageLLM):
+        """Previous behaviour: every session builds its own client and connection pool."""
+
+        def _init_client(self):
+            self.client = OpenAI(api_key=self.api_key)
+            self.client_available = True
+
+    def per_session_chatbot():
+        chatbot = triage.TriageChatbot(provider="openai")
+        chatbot.triage = PerSessionClientLLM(provider="openai")
+        return chatbot
+
+    print(f"{args.sessions} concurrent sessions, mock LLM latency {args.latency_ms:.0f} ms, "
+          f"pool limit {triage.LLM_MAX_CONNECTIONS}\n")
+    print(f"{'client':<22}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'sockets':>9}{'LLM ok':>8}")
+    for name, factory in (
+        ("per-session (before)", per_session_chatbot),
+        ("shared pool (after)", lambda: triage.TriageChatbot(provider="openai")),
+    ):
+        server.reset()
+        results = run_sessions(factory, args.sessions)
+        latencies = [ms for ms, _ in results]
+        llm_ok = sum(source == "LLM" for _, source in results)
+        print(f"{name:<22}{percentile(latencies, 50):>9.0f}{percentile(latencies, 95):>9.0f}"
+              f"{max(latencies):>9.0f}{server.stats['connections']:>9}{llm_ok:>8}")
+
+
+if __name__ == "__main__":
+    main()
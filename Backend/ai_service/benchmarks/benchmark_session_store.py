@@ -0,0 +1,84 @@
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# Add the service and the AI-Triage directory to path
+SERVICE_DIR = Path(__file__).parent.parent
+sys.path.append(str(SERVICE_DIR))
+sys.path.append(str(SERVICE_DIR.parent.parent / "AI-Triage"))
+
+from option_b_llm_triage import TriageChatbot
+from session_store import InMemorySessionStore, RedisSessionStore, LocalRedis
+
+TURN = {"role": "user", "content": "my baby has had a high fever of 39 since yesterday and is not eating"}
+
+
+class OfflineChatbot(TriageChatbot):
+    """TriageChatbot without an LLM client, so only session bookkeeping is measured."""
+
+    def __init__(self, api_key=None, provider="offline"):
+        super().__init__(api_key=api_key, provider=provider)
+
+
+def simulate(store, sessions, turns):
+    for i in range(sessions):
+        chatbot = store.get_or_create(f"user-{i}")
+        for _ in range(turns):
+            chatbot.triage.conversation_history.append(dict(TURN))
+        store.save(f"user-{i}", chatbot)
+
+
+def peak_mb(fn):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def check_eviction():
+    """LRU and TTL eviction for both backends on a tiny store."""
+    for name, store in (
+        ("memory", InMemorySessionStore(OfflineChatbot, max_sessions=3, ttl_s=0.2)),
+        ("redis (LocalRedis)", RedisSessionStore(LocalRedis(), OfflineChatbot, OfflineChatbot.from_state,
+                                                 max_sessions=3, ttl_s=1)),
+    ):
+        simulate(store, 4, 1)
+        lru_ok = len(store) == 3 and store.evictions["lru"] == 1
+        store.get_or_create("user-3").triage.conversation_history.append(dict(TURN))
+        kept = len(store.get_or_create("user-3").triage.conversation_history) if name == "memory" else None
+        time.sleep(store.ttl_s + 0.1)
+        ttl_ok = len(store) == 0 and store.evictions["ttl"] >= 3
+        print(f"{'✅' if lru_ok and ttl_ok else '❌'} {name}: {store.stats()}" + (f" history kept={kept}" if kept else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unbounded session dict vs bounded session store")
+    parser.add_argument("--sessions", type=int, default=50000)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--max-sessions", type=int, default=5000)
+    args = parser.parse_args()
+
+    check_eviction()
+
+    unbounded = {}
+
+    def run_unbounded():
+        for i in range(args.sessions):
+            chatbot = unbounded.setdefault(f"user-{i}", OfflineChatbot())
+            for _ in range(args.turns):
+                chatbot.triage.conversation_history.append(dict(TURN))
+
+    store = InMemorySessionStore(OfflineChatbot, max_sessions=args.max_sessions)
+    print(f"\n{args.sessions} sessions x {args.turns} turns")
+    print(f"{'store':<32}{'live':>8}{'peak MB':>10}")
+    print(f"{'dict (previous)':<32}{args.sessions:>8}{peak_mb(run_unbounded):>10.1f}")
+    unbounded.clear()
+    bounded_mb = peak_mb(lambda: simulate(store, args.sessions, args.turns))
+    print(f"{f'InMemorySessionStore({args.max_sessions})':<32}{len(store):>8}{bounded_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
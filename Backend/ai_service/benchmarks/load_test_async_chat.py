@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add the service and the AI-Triage directory to path
+SERVICE_DIR = Path(__file__).parent.parent
+sys.path.append(str(SERVICE_DIR))
+sys.path.append(str(SERVICE_DIR.parent.parent / "AI-Triage"))
+
+from mock_llm_server import start_in_thread
+from benchmark_llm_client_pool import percentile
+
+MESSAGES = [
+    "my father has chest pain and sweating since an hour",
+    "my son has a fever of 39.5 and vomiting since yesterday",
+    "I feel tired and I have a cold with a mild cough",
+    "my stomach has been hurting for two days",
+]
+
+
+async def conversation(chatbot, i, use_async, latencies):
+    """One triage conversation as the /chat endpoint would serve it on the event loop."""
+    message = MESSAGES[i % len(MESSAGES)]
+    start = time.perf_counter()
+    result = await chatbot.achat(message) if use_async else chatbot.chat(message)
+    latencies.append((time.perf_counter() - start) * 1000)
+    return result["full_classification"].get("source")
+
+
+async def lag_probe(loop_lag, stop):
+    """How late a 10 ms timer fires: the time the loop spent blocked."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        loop_lag.append((time.perf_counter() - start - 0.01) * 1000)
+
+
+async def run(triage, conversations, use_async):
+    latencies, loop_lag = [], []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(lag_probe(loop_lag, stop))
+    chatbots = [triage.TriageChatbot(provider="openai") for _ in range(conversations)]
+    start = time.perf_counter()
+    sources = await asyncio.gather(*[
+        conversation(chatbot, i, use_async, latencies) for i, chatbot in enumerate(chatbots)
+    ])
+    wall = time.perf_counter() - start
+    stop.set()
+    await probe
+    return latencies, wall, max(loop_lag, default=0.0), sum(s == "LLM" for s in sources)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blocking chat() vs async achat() on one event loop")
+    parser.add_argument("--conversations", type=int, default=300, help="Concurrent in-flight conversations")
+    parser.add_argument("--latency-ms", type=float, default=1000, help="Injected fake provider latency")
+    parser.add_argument("--timeout-s", type=float, default=None, help="LLM_TIMEOUT_S for each call")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="LLM_MAX_CONCURRENCY")
+    args = parser.parse_args()
+
+    server, base_url = start_in_thread(latency_ms=args.latency_ms)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "mock")
+    os.environ.setdefault("LLM_MAX_CONNECTIONS", str(args.conversations))
+    if args.timeout_s:
+        os.environ["LLM_TIMEOUT_S"] = str(args.timeout_s)
+    if args.max_concurrency:
+        os.environ["LLM_MAX_CONCURRENCY"] = str(args.max_concurrency)
+    import option_b_llm_triage as triage
+    triage.CLASSIFICATION_CACHE.max_size = 0  # every call goes to the provider
+
+    print(f"{args.conversations} concurrent conversations, fake provider latency {args.latency_ms:.0f} ms\n")
+    print(f"{'path':<18}{'conv/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'max loop lag ms':>17}{'LLM ok':>8}")
+    for name, use_async in (("chat() blocking", False), ("achat() async", True)):
+        latencies, wall, lag, llm_ok = asyncio.run(run(triage, args.conversations, use_async))
+        print(f"{name:<18}{args.conversations / wall:>8.1f}{percentile(latencies, 50):>9.0f}"
+              f"{percentile(latencies, 95):>9.0f}{lag:>17.0f}{llm_ok:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Local OpenAI-compatible mock LLM server for triage benchmarks.
+
+Serves POST /v1/chat/completions with a canned triage JSON answer after an
+injected latency, and GET /stats with the number of TCP connections accepted
+(sockets opened by clients), requests served and prompt characters received.
+MockChatClient / MockAsyncChatClient offer the same answers in-process, without HTTP.
+
+Point the triage service at it with:
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=mock
+"""
+
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+URGENCY_RULES = (
+    ("Emergency", ("chest pain", "can't breathe", "unconscious", "seizure", "stroke")),
+    ("High", ("high fever", "39", "40", "deep cut", "fracture", "blood in")),
+    ("Low", ("cold", "runny nose", "sneez", "tired")),
+)
+
+
+def triage_answer(message):
+    text = message.lower()
+    urgency = next((level for level, words in URGENCY_RULES if any(w in text for w in words)), "Medium")
+    return {
+        "urgency": urgency,
+        "confidence": 0.85,
+        "reasoning": f"Mock assessment of: {message[:80]}",
+        "key_symptoms": [w for _, words in URGENCY_RULES for w in words if w in text][:3],
+        "recommended_services": [] if urgency == "Emergency" else ["Vital Signs"],
+        "immediate_advice": "Call emergency services now." if urgency == "Emergency" else "Monitor your symptoms.",
+        "follow_up": "Consult a doctor if symptoms persist."
+    }
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=0.0):
+        super().__init__(address, MockLLMHandler)
+        self.latency_s = latency_ms / 1000
+        self.lock = threading.Lock()
+        self.stats = {"connections": 0, "requests": 0, "prompt_chars": 0}
+
+    def get_request(self):
+        request = super().get_request()
+        with self.lock:
+            self.stats["connections"] += 1
+        return request
+
+    def record(self, prompt_chars):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["prompt_chars"] += prompt_chars
+
+    def reset(self):
+        with self.lock:
+            self.stats = {key: 0 for key in self.stats}
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is visible in /stats
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            with self.server.lock:
+                self._send_json(dict(self.server.stats))
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path.rstrip("/") == "/stats/reset":
+            self.server.reset()
+            return self._send_json({"ok": True})
+        if not self.path.endswith("/chat/completions"):
+            return self._send_json({"error": "not found"}, status=404)
+
+        messages = body.get("messages", [])
+        prompt_chars = sum(len(m.get("content") or "") for m in messages)
+        self.server.record(prompt_chars)
+        time.sleep(self.server.latency_s)
+        user_message = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        content = json.dumps(triage_answer(user_message))
+        self._send_json({
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (prompt_chars + len(content)) // 4},
+        })
+
+
+class MockChatClient:
+    """
+    In-process stand-in for an OpenAI client (`client.chat.completions.create`),
+    for benchmarks that only need the provider's cost model, not HTTP. Latency is
+    `latency_ms` plus `ms_per_1k_prompt_tokens` for every 1000 prompt tokens.
+    """
+
+    def __init__(self, latency_ms=300.0, ms_per_1k_prompt_tokens=0.0):
+        self.latency_s = latency_ms / 1000
+        self.s_per_prompt_token = ms_per_1k_prompt_tokens / 1000 / 1000
+        self.prompt_chars = []
+        self.chat = self
+        self.completions = self
+
+    def create(self, model, messages, **kwargs):
+        from types import SimpleNamespace
+        prompt_chars = sum(len(m.get("content") or "") for m in messages)
+        self.prompt_chars.append(prompt_chars)
+        time.sleep(self.latency_s + prompt_chars / 4 * self.s_per_prompt_token)
+        user_message = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        message = SimpleNamespace(role="assistant", content=json.dumps(triage_answer(user_message)))
+        return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")])
+
+
+class MockAsyncChatClient:
+    """
+    In-process stand-in for AsyncOpenAI. With stream=True the canned answer is
+    streamed in ~4-character tokens: `first_token_ms` before the first one, then
+    `token_ms` per token; without streaming the whole answer arrives at once
+    after the same total time.
+    """
+
+    def __init__(self, first_token_ms=300.0, token_ms=15.0):
+        self.first_token_s = first_token_ms / 1000
+        self.token_s = token_ms / 1000
+        self.chat = self
+        self.completions = self
+
+    async def create(self, model, messages, stream=False, **kwargs):
+        import asyncio
+        from types import SimpleNamespace
+        user_message = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        content = json.dumps(triage_answer(user_message))
+        tokens = [content[i:i + 4] for i in range(0, len(content), 4)]
+        if not stream:
+            await asyncio.sleep(self.first_token_s + self.token_s * (len(tokens) - 1))
+            message = SimpleNamespace(role="assistant", content=content)
+            return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")])
+
+        async def chunks():
+            await asyncio.sleep(self.first_token_s)
+            for i, token in enumerate(tokens):
+                if i:
+                    await asyncio.sleep(self.token_s)
+                delta = SimpleNamespace(content=token)
+                yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=delta, finish_reason=None)])
+        return chunks()
+
+
+def start_in_thread(port=0, latency_ms=0.0):
+    """Start a MockLLMServer on a background thread; returns (server, base_url)."""
+    server = MockLLMServer(("127.0.0.1", port), latency_ms=latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI-compatible mock LLM server")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    args = parser.parse_args()
+
+    server = MockLLMServer(("127.0.0.1", args.port), latency_ms=args.latency_ms)
+    print(f"Mock LLM listening on http://127.0.0.1:{args.port}/v1 ({args.latency_ms:.0f} ms latency)")
+    server.serve_forever()
@@ -8,12 +8,18 @@ Checks:
 2. Image dimensions (min/max)
 3. Image quality (blur detection, brightness)
 4. Basic sanity checks
+
+For bulk screening (e.g. a whole dataset directory) use
+ImageValidator.validate_many, which returns a columnar BatchValidationResult.
 """
 
 import io
-from dataclasses import dataclass
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Tuple, Optional
+from pathlib import Path
+from typing import List, Tuple, Optional, Sequence, Union
 
 import numpy as np
 from PIL import Image
@@ -38,10 +44,29 @@ class ValidationResult:
     error_message_ar: Optional[str] = None
     error_message_en: Optional[str] = None
     image: Optional[Image.Image] = None
+    brightness: Optional[float] = None
+    blur_score: Optional[float] = None
+    original_size: Optional[Tuple[int, int]] = None
+    source: Optional[bytes] = field(default=None, repr=False)
     
     @classmethod
-    def success(cls, image: Image.Image) -> "ValidationResult":
-        return cls(is_valid=True, image=image)
+    def success(cls, image: Image.Image, brightness: Optional[float] = None, blur_score: Optional[float] = None,
+                original_size: Optional[Tuple[int, int]] = None, source: Optional[bytes] = None) -> "ValidationResult":
+        return cls(is_valid=True, image=image, brightness=brightness, blur_score=blur_score,
+                   original_size=original_size, source=source)
+    
+    def full_image(self) -> Optional[Image.Image]:
+        """
+        The accepted image at full resolution, decoded on first call.
+        `image` may be a reduced (draft) JPEG decode; only accepted uploads that
+        actually need every pixel pay for the full decode.
+        """
+        if self.image is None or self.source is None or self.image.size == self.original_size:
+            return self.image
+        full = Image.open(io.BytesIO(self.source))
+        full.load()
+        self.image = full if full.mode == "RGB" else full.convert("RGB")
+        return self.image
     
     @classmethod
     def failure(cls, error: ValidationError) -> "ValidationResult":
@@ -53,6 +78,30 @@ class ValidationResult:
         )
 
 
+# Index of each error in BatchValidationResult.error_codes
+ERROR_TYPES = list(ValidationError)
+
+
+@dataclass
+class BatchValidationResult:
+    """
+    Columnar result of ImageValidator.validate_many, one row per input (in input order).
+    Scores are NaN for rows rejected before the quality checks.
+    """
+    is_valid: np.ndarray      # bool
+    error_codes: np.ndarray   # int8 index into ERROR_TYPES, -1 when valid
+    brightness: np.ndarray    # float32 mean gray level, 0-255
+    blur_score: np.ndarray    # float32 Laplacian variance
+    width: np.ndarray         # int32 original size, 0 if unreadable
+    height: np.ndarray        # int32
+    
+    def __len__(self) -> int:
+        return len(self.is_valid)
+    
+    def errors(self) -> List[Optional[ValidationError]]:
+        return [ERROR_TYPES[code] if code >= 0 else None for code in self.error_codes]
+
+
 class ImageValidator:
     """
     Validates images for wound classification.
@@ -73,6 +122,9 @@ class ImageValidator:
     BLUR_THRESHOLD = 100  # Laplacian variance threshold
     MIN_BRIGHTNESS = 30  # 0-255
     MAX_BRIGHTNESS = 225  # 0-255
+    BLUR_CHECK_SIZE = 500  # quality checks run on a thumbnail of this size
+    DRAFT_FORMATS = {"JPEG", "MPO"}  # formats that support DCT-scaled (draft) decoding
+    BATCH_CHUNK_SIZE = 32  # validate_many: images per stacked float32 batch
     
     def validate(self, file_bytes: bytes) -> ValidationResult:
         """
@@ -82,50 +134,77 @@ class ImageValidator:
             file_bytes: Raw image bytes
             
         Returns:
-            ValidationResult with success/failure info
+            ValidationResult with success/failure info. For JPEG uploads the
+            returned image is the reduced (draft) decode, at least
+            BLUR_CHECK_SIZE on its shorter side unless the original is smaller.
+            It is the RGB image the AI pipeline should run on, so a valid
+            upload is decoded exactly once (result.full_image() decodes the
+            full resolution on demand).
+        
+        Checks run cheapest first: format and dimensions come from the header
+        alone, so wrong-format or oversized uploads are rejected without
+        decoding any pixels.
         """
-        # Step 1: Try to open the image
+        # Step 1: Read the header (Image.open does not decode pixel data)
         try:
             image = Image.open(io.BytesIO(file_bytes))
-            image.load()  # Force load to catch corrupted images
+            image_format = image.format
+            width, height = image.size  # original size, before any reduced decoding
         except Exception:
             return ValidationResult.failure(ValidationError.CORRUPTED)
         
         # Step 2: Check format
-        if image.format not in self.ALLOWED_FORMATS:
+        if image_format not in self.ALLOWED_FORMATS:
             return ValidationResult.failure(ValidationError.INVALID_FORMAT)
         
         # Step 3: Check dimensions
-        width, height = image.size
         if width < self.MIN_DIMENSION or height < self.MIN_DIMENSION:
             return ValidationResult.failure(ValidationError.TOO_SMALL)
         if width > self.MAX_DIMENSION or height > self.MAX_DIMENSION:
             return ValidationResult.failure(ValidationError.TOO_LARGE)
         
-        # Step 4: Convert to RGB for further checks
+        # Step 4: Decode. JPEG: directly at the smallest DCT scale >= BLUR_CHECK_SIZE
+        try:
+            if image_format in self.DRAFT_FORMATS:
+                image.draft("RGB", (self.BLUR_CHECK_SIZE, self.BLUR_CHECK_SIZE))
+            image.load()  # Force load to catch corrupted images
+        except Exception:
+            return ValidationResult.failure(ValidationError.CORRUPTED)
+        
+        # Convert to RGB for further checks
         if image.mode != "RGB":
             image = image.convert("RGB")
         
-        # Step 5: Check brightness
-        brightness_result = self._check_brightness(image)
+        # Step 5: Brightness and blur, both from one shared low-res grayscale buffer
+        grayscale = self._quality_grayscale(image)
+        
+        brightness = float(np.mean(grayscale))
+        brightness_result = self._check_brightness(brightness)
         if brightness_result is not None:
             return brightness_result
         
-        # Step 6: Check blur (optional - can be slow)
-        blur_result = self._check_blur(image)
+        # Step 6: Check blur
+        blur_score = self._laplacian_variance(grayscale)
+        blur_result = self._check_blur(blur_score)
         if blur_result is not None:
             return blur_result
         
         # All checks passed!
-        return ValidationResult.success(image)
+        return ValidationResult.success(image, brightness=brightness, blur_score=blur_score,
+                                        original_size=(width, height), source=file_bytes)
     
-    def _check_brightness(self, image: Image.Image) -> Optional[ValidationResult]:
+    def _quality_grayscale(self, image: Image.Image) -> np.ndarray:
+        """
+        Grayscale copy of the image, at most BLUR_CHECK_SIZE on its longer side,
+        as float64. Converted once (before resizing, so the resize only touches
+        one channel) and shared by the brightness and blur checks.
+        """
+        grayscale = image.convert("L")  # new image, the RGB one is left untouched
+        grayscale.thumbnail((self.BLUR_CHECK_SIZE, self.BLUR_CHECK_SIZE))
+        return np.asarray(grayscale, dtype=np.float64)
+    
+    def _check_brightness(self, mean_brightness: float) -> Optional[ValidationResult]:
         """Check if image is too dark or too bright."""
-        # Convert to grayscale and calculate mean brightness
-        grayscale = image.convert("L")
-        np_image = np.array(grayscale)
-        mean_brightness = np.mean(np_image)
-        
         if mean_brightness < self.MIN_BRIGHTNESS:
             return ValidationResult.failure(ValidationError.TOO_DARK)
         if mean_brightness > self.MAX_BRIGHTNESS:
@@ -133,23 +212,11 @@ class ImageValidator:
         
         return None
     
-    def _check_blur(self, image: Image.Image) -> Optional[ValidationResult]:
+    def _check_blur(self, laplacian_var: float) -> Optional[ValidationResult]:
         """
         Check if image is too blurry using Laplacian variance.
         Lower variance = more blur.
         """
-        # Resize for faster processing
-        small = image.copy()
-        small.thumbnail((500, 500))
-        
-        # Convert to grayscale numpy array
-        grayscale = small.convert("L")
-        np_image = np.array(grayscale, dtype=np.float64)
-        
-        # Calculate Laplacian (simple edge detection)
-        # Using a simple kernel: [[0,1,0],[1,-4,1],[0,1,0]]
-        laplacian_var = self._laplacian_variance(np_image)
-        
         if laplacian_var < self.BLUR_THRESHOLD:
             return ValidationResult.failure(ValidationError.TOO_BLURRY)
         
@@ -177,6 +244,116 @@ class ImageValidator:
         )
         
         return float(np.var(laplacian))
+    
+    def validate_many(self, sources: Sequence[Union[bytes, str, Path]], workers: Optional[int] = None,
+                      chunk_size: Optional[int] = None) -> BatchValidationResult:
+        """
+        Validate many images (raw bytes or file paths) at once.
+        
+        Decoding runs on a thread pool (PIL releases the GIL while decoding);
+        each image is decoded straight to grayscale (JPEG: luma only, DCT-scaled)
+        and resized to BLUR_CHECK_SIZE x BLUR_CHECK_SIZE, so a chunk stacks into
+        one (N, S, S) array. Brightness and Laplacian variance are then computed
+        for the whole chunk in float32.
+        
+        Same checks and thresholds as validate(). Since every image is resized to
+        the same square instead of a thumbnail keeping its aspect ratio, blur
+        scores of non-square images differ slightly from validate().
+        """
+        n = len(sources)
+        size = self.BLUR_CHECK_SIZE
+        chunk_size = chunk_size or self.BATCH_CHUNK_SIZE
+        
+        error_codes = np.full(n, -1, dtype=np.int8)
+        brightness = np.full(n, np.nan, dtype=np.float32)
+        blur_score = np.full(n, np.nan, dtype=np.float32)
+        width = np.zeros(n, dtype=np.int32)
+        height = np.zeros(n, dtype=np.int32)
+        
+        stacked = np.empty((min(chunk_size, n), size, size), dtype=np.uint8)
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            for start in range(0, n, chunk_size):
+                stop = min(start + chunk_size, n)
+                # Step 1-3 + grayscale/resize per image, written into its slot of the stacked batch
+                outcomes = list(pool.map(
+                    lambda i: self._load_grayscale(sources[i], stacked[i - start]),
+                    range(start, stop)
+                ))
+                decoded = []
+                for i, (error, w, h) in zip(range(start, stop), outcomes):
+                    width[i], height[i] = w, h
+                    if error is not None:
+                        error_codes[i] = ERROR_TYPES.index(error)
+                    else:
+                        decoded.append(i)
+                if not decoded:
+                    continue
+                
+                # Step 5-6 for the whole chunk
+                rows = np.asarray(decoded)
+                batch = stacked[:stop - start] if len(rows) == stop - start else stacked[rows - start]
+                batch = batch.astype(np.float32)
+                chunk_brightness = batch.mean(axis=(1, 2))
+                chunk_blur = self._laplacian_variance_batch(batch)
+                brightness[rows] = chunk_brightness
+                blur_score[rows] = chunk_blur
+                
+                too_dark = chunk_brightness < self.MIN_BRIGHTNESS
+                too_bright = chunk_brightness > self.MAX_BRIGHTNESS
+                too_blurry = ~too_dark & ~too_bright & (chunk_blur < self.BLUR_THRESHOLD)
+                error_codes[rows[too_dark]] = ERROR_TYPES.index(ValidationError.TOO_DARK)
+                error_codes[rows[too_bright]] = ERROR_TYPES.index(ValidationError.TOO_BRIGHT)
+                error_codes[rows[too_blurry]] = ERROR_TYPES.index(ValidationError.TOO_BLURRY)
+        
+        return BatchValidationResult(
+            is_valid=error_codes < 0,
+            error_codes=error_codes,
+            brightness=brightness,
+            blur_score=blur_score,
+            width=width,
+            height=height,
+        )
+    
+    def _load_grayscale(self, source: Union[bytes, str, Path], out: np.ndarray) -> Tuple[Optional[ValidationError], int, int]:
+        """Format/dimension checks, then decode into `out` as a BLUR_CHECK_SIZE square uint8 grayscale image."""
+        size = self.BLUR_CHECK_SIZE
+        try:
+            fp = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+            with Image.open(fp) as image:
+                image_format = image.format
+                width, height = image.size
+                if image_format not in self.ALLOWED_FORMATS:
+                    return ValidationError.INVALID_FORMAT, width, height
+                if width < self.MIN_DIMENSION or height < self.MIN_DIMENSION:
+                    return ValidationError.TOO_SMALL, width, height
+                if width > self.MAX_DIMENSION or height > self.MAX_DIMENSION:
+                    return ValidationError.TOO_LARGE, width, height
+                if image_format in self.DRAFT_FORMATS:
+                    # Luma channel only, at the smallest DCT scale >= the check size
+                    image.draft("L", (size, size))
+                gray = image.convert("L").resize((size, size), Image.BILINEAR, reducing_gap=2.0)
+                out[...] = np.asarray(gray)
+        except Exception:
+            return ValidationError.CORRUPTED, 0, 0
+        return None, width, height
+    
+    @staticmethod
+    def _laplacian_variance_batch(images: np.ndarray) -> np.ndarray:
+        """
+        Laplacian variance of each image in an (N, H, W) float32 stack.
+        Same kernel and edge-replicated border as _laplacian_variance, but the
+        neighbours are added as shifted slices, so no padded copy is made.
+        """
+        laplacian = images * np.float32(-4)
+        laplacian[:, 1:, :] += images[:, :-1, :]   # top
+        laplacian[:, 0, :] += images[:, 0, :]
+        laplacian[:, :-1, :] += images[:, 1:, :]   # bottom
+        laplacian[:, -1, :] += images[:, -1, :]
+        laplacian[:, :, 1:] += images[:, :, :-1]   # left
+        laplacian[:, :, 0] += images[:, :, 0]
+        laplacian[:, :, :-1] += images[:, :, 1:]   # right
+        laplacian[:, :, -1] += images[:, :, -1]
+        return laplacian.reshape(len(images), -1).var(axis=1)
 
 
 # Quick test function
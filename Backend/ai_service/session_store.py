@@ -0,0 +1,247 @@
+"""
+Session Store for Triage Chatbots
+=================================
+Bounded storage for per-user TriageChatbot sessions.
+
+Every store enforces:
+1. A maximum number of live sessions (least recently used is evicted first)
+2. An idle TTL (sessions untouched for `ttl_s` seconds expire)
+
+Backends:
+- InMemorySessionStore: chatbots live in this process (single uvicorn worker)
+- RedisSessionStore: chatbot state is serialized to Redis and shared between
+  workers; LocalRedis is an in-process stand-in with the same commands for tests
+"""
+
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+
+class SessionStore(ABC):
+    """Interface shared by the session backends."""
+
+    def __init__(self, factory: Callable, max_sessions: int = 10000, ttl_s: float = 1800.0):
+        """
+        Args:
+            factory: Zero-argument callable building a fresh chatbot
+            max_sessions: Live sessions kept before the LRU one is evicted
+            ttl_s: Idle seconds after which a session expires
+        """
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.ttl_s = ttl_s
+        self.created = 0
+        self.evictions = {"lru": 0, "ttl": 0}
+
+    @abstractmethod
+    def get_or_create(self, session_id: str):
+        """The session's chatbot, created with `factory` if it does not exist (or expired)."""
+
+    def save(self, session_id: str, chatbot) -> None:
+        """Persist the chatbot after a turn (no-op when chatbots are held in-process)."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Drop a session; False if there was none."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of live (unexpired) sessions."""
+
+    def stats(self) -> Dict:
+        return {
+            "backend": self.backend,
+            "live_sessions": len(self),
+            "max_sessions": self.max_sessions,
+            "ttl_s": self.ttl_s,
+            "created_total": self.created,
+            "evictions_total": dict(self.evictions),
+        }
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Chatbots kept in an OrderedDict ordered by last use.
+    Expired sessions are swept lazily on access, so no background task is needed.
+    """
+
+    backend = "memory"
+
+    def __init__(self, factory: Callable, max_sessions: int = 10000, ttl_s: float = 1800.0):
+        super().__init__(factory, max_sessions, ttl_s)
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()  # session_id -> (chatbot, last_used)
+        self._lock = threading.Lock()
+
+    def _sweep(self, now: float):
+        # Oldest first: stop at the first session still inside its TTL
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used < self.ttl_s:
+                break
+            del self._sessions[session_id]
+            self.evictions["ttl"] += 1
+
+    def get_or_create(self, session_id: str):
+        now = time.monotonic()
+        with self._lock:
+            self._sweep(now)
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                while len(self._sessions) >= self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evictions["lru"] += 1
+                chatbot = self.factory()
+                self.created += 1
+            else:
+                chatbot = entry[0]
+            self._sessions[session_id] = (chatbot, now)
+            return chatbot
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sweep(time.monotonic())
+            return len(self._sessions)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Chatbot state serialized to Redis (`to_state` / `from_state`).
+
+    Each session is a string key with a native EXPIRE of `ttl_s`; a sorted set
+    scored by last use tracks recency so the LRU session can be evicted once
+    `max_sessions` is reached. Works with redis-py or LocalRedis.
+    """
+
+    backend = "redis"
+
+    def __init__(self, client, factory: Callable, restore: Callable, max_sessions: int = 10000,
+                 ttl_s: float = 1800.0, prefix: str = "triage:session:"):
+        """
+        Args:
+            client: redis.Redis (or LocalRedis) instance
+            factory: Zero-argument callable building a fresh chatbot
+            restore: Callable building a chatbot from a saved state dict
+        """
+        super().__init__(factory, max_sessions, ttl_s)
+        self.client = client
+        self.restore = restore
+        self.prefix = prefix
+        self.index_key = prefix + "index"
+
+    def _key(self, session_id: str) -> str:
+        return self.prefix + session_id
+
+    def _reap_expired(self, now: float):
+        # Redis already dropped the values; drop their index entries and count them
+        expired = self.client.zrangebyscore(self.index_key, "-inf", now - self.ttl_s)
+        if expired:
+            self.client.zrem(self.index_key, *expired)
+            self.evictions["ttl"] += len(expired)
+
+    def get_or_create(self, session_id: str):
+        now = time.time()
+        self._reap_expired(now)
+        raw = self.client.get(self._key(session_id))
+        if raw is not None:
+            chatbot = self.restore(json.loads(raw))
+        else:
+            overflow = self.client.zcard(self.index_key) - self.max_sessions + 1
+            if overflow > 0:
+                oldest = self.client.zrange(self.index_key, 0, overflow - 1)
+                self.client.delete(*[self._key(_decode(s)) for s in oldest])
+                self.client.zrem(self.index_key, *oldest)
+                self.evictions["lru"] += len(oldest)
+            chatbot = self.factory()
+            self.created += 1
+        self.client.zadd(self.index_key, {session_id: now})
+        return chatbot
+
+    def save(self, session_id: str, chatbot) -> None:
+        self.client.set(self._key(session_id), json.dumps(chatbot.to_state()), ex=max(1, int(self.ttl_s)))
+        self.client.zadd(self.index_key, {session_id: time.time()})
+
+    def delete(self, session_id: str) -> bool:
+        self.client.zrem(self.index_key, session_id)
+        return bool(self.client.delete(self._key(session_id)))
+
+    def __len__(self) -> int:
+        self._reap_expired(time.time())
+        return int(self.client.zcard(self.index_key))
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class LocalRedis:
+    """
+    In-process stand-in implementing the handful of Redis commands the
+    RedisSessionStore uses (GET/SET EX/DELETE and a sorted set), with
+    redis-py call signatures. For tests and local development only.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._values: Dict[str, tuple] = {}  # key -> (value, expires_at or None)
+        self._zsets: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> Optional[tuple]:
+        entry = self._values.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= self.clock():
+            del self._values[key]
+            return None
+        return entry
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._live(key)
+            return entry[0] if entry else None
+
+    def set(self, key: str, value, ex: Optional[int] = None):
+        with self._lock:
+            if isinstance(value, str):
+                value = value.encode()
+            self._values[key] = (value, self.clock() + ex if ex else None)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._live(k) is not None and self._values.pop(k) is not None for k in keys)
+
+    def zadd(self, key: str, mapping: Dict[str, float]) -> int:
+        with self._lock:
+            zset = self._zsets.setdefault(key, {})
+            added = sum(_decode(m) not in zset for m in mapping)
+            zset.update({_decode(m): float(s) for m, s in mapping.items()})
+            return added
+
+    def zrem(self, key: str, *members) -> int:
+        with self._lock:
+            zset = self._zsets.get(key, {})
+            return sum(zset.pop(_decode(m), None) is not None for m in members)
+
+    def zcard(self, key: str) -> int:
+        with self._lock:
+            return len(self._zsets.get(key, {}))
+
+    def _sorted(self, key: str):
+        return sorted(self._zsets.get(key, {}).items(), key=lambda item: (item[1], item[0]))
+
+    def zrange(self, key: str, start: int, end: int):
+        with self._lock:
+            members = [m.encode() for m, _ in self._sorted(key)]
+            return members[start:] if end == -1 else members[start:end + 1]
+
+    def zrangebyscore(self, key: str, min_score, max_score):
+        low, high = float(min_score), float(max_score)
+        with self._lock:
+            return [m.encode() for m, s in self._sorted(key) if low <= s <= high]
@@ -6,6 +6,7 @@ This service exposes the LLM-based triage system via REST API.
 
 import os
 import sys
+import json
 from pathlib import Path
 
 # Add the AI-Triage directory to path
@@ -13,13 +14,16 @@ ai_triage_path = Path(__file__).parent.parent.parent / "AI-Triage"
 sys.path.insert(0, str(ai_triage_path))
 
 from fastapi import FastAPI, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List
 import uvicorn
 
 # Import the triage system
-from option_b_llm_triage import TriageChatbot, SERVICES
+from option_b_llm_triage import TriageChatbot, SERVICES, CLASSIFICATION_CACHE
+from session_store import InMemorySessionStore, RedisSessionStore, LocalRedis
 
 app = FastAPI(
     title="Housepital AI Triage API",
@@ -40,8 +44,35 @@ app.add_middleware(
 API_KEY = os.environ.get("GEMINI_API_KEY") or os.environ.get("OPENAI_API_KEY")
 PROVIDER = "gemini" if os.environ.get("GEMINI_API_KEY") else "openai"
 
-# Session storage for chatbots (in production, use Redis)
-chatbot_sessions: Dict[str, TriageChatbot] = {}
+# Session storage for chatbots: bounded by count (LRU) and idle time (TTL).
+# SESSION_BACKEND=redis shares sessions between workers via REDIS_URL
+# ("local://" uses the in-process LocalRedis stand-in).
+SESSION_BACKEND = os.environ.get("SESSION_BACKEND", "memory")
+SESSION_MAX = int(os.environ.get("SESSION_MAX", "10000"))
+SESSION_TTL_S = float(os.environ.get("SESSION_TTL_S", "1800"))
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
+
+def new_chatbot() -> TriageChatbot:
+    return TriageChatbot(api_key=API_KEY, provider=PROVIDER)
+
+
+def restore_chatbot(state: dict) -> TriageChatbot:
+    return TriageChatbot.from_state(state, api_key=API_KEY, provider=PROVIDER)
+
+
+def create_session_store():
+    if SESSION_BACKEND == "redis":
+        if REDIS_URL.startswith("local://"):
+            client = LocalRedis()
+        else:
+            import redis
+            client = redis.Redis.from_url(REDIS_URL)
+        return RedisSessionStore(client, new_chatbot, restore_chatbot, max_sessions=SESSION_MAX, ttl_s=SESSION_TTL_S)
+    return InMemorySessionStore(new_chatbot, max_sessions=SESSION_MAX, ttl_s=SESSION_TTL_S)
+
+
+chatbot_sessions = create_session_store()
 
 
 class ChatRequest(BaseModel):
@@ -152,12 +183,7 @@ SERVICE_ROUTES = {
 
 def get_or_create_chatbot(session_id: str) -> TriageChatbot:
     """Get or create a chatbot for the session."""
-    if session_id not in chatbot_sessions:
-        chatbot_sessions[session_id] = TriageChatbot(
-            api_key=API_KEY,
-            provider=PROVIDER
-        )
-    return chatbot_sessions[session_id]
+    return chatbot_sessions.get_or_create(session_id)
 
 
 @app.get("/")
@@ -170,10 +196,33 @@ async def health():
     return {
         "status": "healthy",
         "api_key_configured": bool(API_KEY),
-        "provider": PROVIDER
+        "provider": PROVIDER,
+        "sessions": chatbot_sessions.stats(),
+        "classification_cache": CLASSIFICATION_CACHE.stats()
     }
 
 
+def build_chat_response(result: dict) -> ChatResponse:
+    """Chatbot reply -> API response, with recommended services mapped to routes."""
+    service_routes = []
+    for service_name in result.get("services", []):
+        if service_name in SERVICE_ROUTES:
+            service_routes.append(SERVICE_ROUTES[service_name])
+    
+    return ChatResponse(
+        response=result.get("response", ""),
+        urgency=result.get("urgency"),
+        show_sos=result.get("show_sos", False),
+        services=result.get("services", []),
+        service_routes=service_routes,
+        full_classification=result.get("full_classification")
+    )
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -181,31 +230,51 @@ async def chat(request: ChatRequest):
     """
     try:
         chatbot = get_or_create_chatbot(request.session_id)
-        result = chatbot.chat(request.message)
-        
-        # Map recommended services to routes
-        service_routes = []
-        for service_name in result.get("services", []):
-            if service_name in SERVICE_ROUTES:
-                service_routes.append(SERVICE_ROUTES[service_name])
-        
-        return ChatResponse(
-            response=result.get("response", ""),
-            urgency=result.get("urgency"),
-            show_sos=result.get("show_sos", False),
-            services=result.get("services", []),
-            service_routes=service_routes,
-            full_classification=result.get("full_classification")
-        )
+        result = await chatbot.achat(request.message)
+        chatbot_sessions.save(request.session_id, chatbot)
+        return build_chat_response(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Same as /chat, streamed as server-sent events:
+    
+    - `urgency`: {"urgency", "show_sos", "provisional"} as soon as it is known;
+      a provisional Emergency is sent before the LLM call when the message has
+      an emergency keyword, so the SOS button can appear immediately
+    - `token`: {"text"} raw LLM output as it streams
+    - `final`: the full /chat response (services, service_routes, ...)
+    - `error`: {"detail"} if the turn failed
+    """
+    chatbot = get_or_create_chatbot(request.session_id)
+    
+    async def events():
+        try:
+            async for event, data in chatbot.astream(request.message):
+                if event == "token":
+                    yield sse_event("token", {"text": data})
+                elif event == "urgency":
+                    yield sse_event("urgency", data)
+                else:
+                    chatbot_sessions.save(request.session_id, chatbot)
+                    yield sse_event("final", jsonable_encoder(build_chat_response(data)))
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/reset/{session_id}")
 async def reset_session(session_id: str):
     """Reset a chat session."""
-    if session_id in chatbot_sessions:
-        del chatbot_sessions[session_id]
+    chatbot_sessions.delete(session_id)
     return {"message": "Session reset", "session_id": session_id}
 
 